@@ -1,7 +1,14 @@
 #!/bin/sh
 set -e
 
-python manage.py migrate --noinput
-python manage.py collectstatic --noinput
+# worker y mailer comparten la base de datos y media de web, que ya los preparó.
+if [ "${SKIP_SETUP:-0}" != "1" ]; then
+    python manage.py migrate --noinput
+    python manage.py createcachetable
+    python manage.py collectstatic --noinput
+    python manage.py optimize_svgs
+    python manage.py build_image_derivatives
+    python manage.py build_cliente_sprite
+fi
 
 exec "$@"
@@ -6,9 +6,28 @@ from adminsortable2.admin import SortableAdminMixin, SortableInlineAdminMixin
 from django.utils.html import format_html
 from .models import (
     Empresa, Servicio, Proyecto, Cliente, Equipo, 
-    Contacto, ConfiguracionSitio
+    Contacto, ConfiguracionSitio, Tarea, NotificacionContacto
 )
 from django.contrib.sites.models import Site
+from .utils.content_version import bump_content_version
+from .utils.jobs import enqueue
+
+
+class ContentSortableAdminMixin(SortableAdminMixin):
+    """adminsortable2 reordena con bulk_update, que no emite signals de guardado."""
+
+    def _update_order(self, updated_items, extra_model_filters):
+        num_updated = super()._update_order(updated_items, extra_model_filters)
+        self.content_reordered()
+        return num_updated
+
+    def _bulk_move(self, request, queryset, method):
+        result = super()._bulk_move(request, queryset, method)
+        self.content_reordered()
+        return result
+
+    def content_reordered(self):
+        bump_content_version()
 
 @admin.register(Empresa)
 class EmpresaAdmin(admin.ModelAdmin):
@@ -52,7 +71,7 @@ class EmpresaAdmin(admin.ModelAdmin):
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 @admin.register(Servicio)
-class ServicioAdmin(SortableAdminMixin, admin.ModelAdmin):
+class ServicioAdmin(ContentSortableAdminMixin, admin.ModelAdmin):
     list_display = ['nombre', 'orden', 'activo', 'fecha_creacion']
     search_fields = ['nombre', 'descripcion']
     list_editable = ['activo']
@@ -60,7 +79,7 @@ class ServicioAdmin(SortableAdminMixin, admin.ModelAdmin):
     sortable = 'orden'
 
 @admin.register(Proyecto)
-class ProyectoAdmin(SortableAdminMixin, admin.ModelAdmin):
+class ProyectoAdmin(ContentSortableAdminMixin, admin.ModelAdmin):
     list_display = ['nombre', 'cliente_display', 'destacado', 'activo', 'orden', 'fecha_creacion']
     search_fields = ['nombre', 'cliente', 'descripcion', 'cliente_rel__nombre']
     list_editable = ['destacado', 'activo']
@@ -104,15 +123,11 @@ class ProyectoAdmin(SortableAdminMixin, admin.ModelAdmin):
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == 'cliente_rel':
-            destacados = Cliente.objects.filter(activo=True, destacado=True).order_by('nombre')
-            if destacados.exists():
-                kwargs['queryset'] = destacados
-            else:
-                kwargs['queryset'] = Cliente.objects.filter(activo=True).order_by('nombre')
+            kwargs['queryset'] = Cliente.objects.published().featured_or_all().order_by('nombre')
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 @admin.register(Cliente)
-class ClienteAdmin(SortableAdminMixin, admin.ModelAdmin):
+class ClienteAdmin(ContentSortableAdminMixin, admin.ModelAdmin):
     list_display = ['logo_preview', 'nombre', 'tipo_cliente', 'destacado', 'activo', 'orden', 'fecha_creacion']
     list_filter = ['tipo_cliente', 'destacado', 'activo', 'fecha_creacion']
     search_fields = ['nombre', 'descripcion']
@@ -135,6 +150,10 @@ class ClienteAdmin(SortableAdminMixin, admin.ModelAdmin):
     )
     readonly_fields = ['fecha_creacion']
 
+    def content_reordered(self):
+        super().content_reordered()
+        enqueue('build_cliente_sprite')
+
     def logo_preview(self, obj):
         if obj.logo:
             return format_html(
@@ -238,4 +257,30 @@ class ConfiguracionSitioAdmin(admin.ModelAdmin):
                 if obj and obj.site_id in used_site_ids:
                     used_site_ids.remove(obj.site_id)
             kwargs['queryset'] = Site.objects.exclude(id__in=used_site_ids)
-        return super().formfield_for_foreignkey(db_field, request, **kwargs)
\ No newline at end of file
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+@admin.register(Tarea)
+class TareaAdmin(admin.ModelAdmin):
+    list_display = ['tipo', 'estado', 'intentos', 'max_intentos', 'ejecutar_despues', 'fecha_creacion', 'fecha_finalizacion']
+    list_filter = ['estado', 'tipo']
+    search_fields = ['tipo']
+    readonly_fields = ['tipo', 'parametros', 'intentos', 'ultimo_error', 'bloqueado_hasta', 'fecha_creacion', 'fecha_finalizacion']
+    ordering = ['-fecha_creacion']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(NotificacionContacto)
+class NotificacionContactoAdmin(admin.ModelAdmin):
+    list_display = ['destinatario', 'asunto', 'estado', 'intentos', 'fecha_creacion', 'fecha_entrega']
+    list_filter = ['estado', 'fecha_creacion']
+    search_fields = ['destinatario', 'asunto', 'contacto__email']
+    readonly_fields = [
+        'contacto', 'destinatario', 'asunto', 'cuerpo', 'intentos', 'ultimo_error',
+        'bloqueado_hasta', 'fecha_creacion', 'fecha_entrega',
+    ]
+    ordering = ['-fecha_creacion']
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,214 @@
+"""
+Views that serve static and media files when no web server aliases them.
+
+In production nginx should serve ``STATIC_ROOT`` and ``MEDIA_ROOT`` itself (see
+``tekon_redline.conf``). ``serve_static`` and ``serve_media`` cover deployments that
+expose gunicorn directly (``EMPRESA_SERVE_STATIC`` / ``EMPRESA_SERVE_MEDIA``) with the
+same cache headers; media transfers can still be handed back to the web server with
+``X-Accel-Redirect`` or ``X-Sendfile``.
+"""
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .utils.static_storage import ENCODINGS
+
+# Nombres con el hash de ManifestStaticFilesStorage: nombre.0123456789ab.ext
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+
+
+def accepted_encodings(request) -> set:
+    """Content codings the client accepts (``q=0`` excluded)."""
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q=') and quality[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _negotiate(request, fullpath: str):
+    accepted = accepted_encodings(request)
+    for encoding, suffix in ENCODINGS:
+        if (encoding in accepted or '*' in accepted) and os.path.isfile(fullpath + suffix):
+            return encoding, fullpath + suffix
+    return None, fullpath
+
+
+def serve_static(request, path):
+    """
+    Serve ``path`` from ``STATIC_ROOT``, preferring a precompressed sibling the client accepts.
+
+    Hashed names never change content, so they are cached for a year as immutable;
+    everything else must be revalidated (``If-Modified-Since``).
+    """
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except ValueError:
+        raise Http404('Ruta inválida')
+    if not os.path.isfile(fullpath):
+        raise Http404('Archivo no encontrado')
+
+    encoding, served_path = _negotiate(request, fullpath)
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type, _ = mimetypes.guess_type(fullpath)
+        response = FileResponse(
+            open(served_path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+            filename=os.path.basename(fullpath),
+        )
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if HASHED_NAME.search(path) else REVALIDATE_CACHE_CONTROL
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+# Media generada con la firma del contenido en el nombre (sprites: clientes-0123456789ab.webp).
+MEDIA_HASHED_NAME = re.compile(r'[.-][0-9a-f]{12}\.[^./]+$')
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _FileRange:
+    """Read-only view of ``length`` bytes of ``file`` starting at ``start``."""
+
+    def __init__(self, file, start: int, length: int):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header: str, size: int):
+    """
+    Return ``(start, end)`` (inclusive) for a single-range ``Range`` header.
+
+    ``None`` means "serve the whole file" (no header, several ranges or a malformed
+    one); ``ValueError`` means the range cannot be satisfied.
+    """
+    match = RANGE_HEADER.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or (last and int(last) < start):
+            raise ValueError(header)
+    else:
+        # bytes=-N: los últimos N bytes.
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError(header)
+        start, end = max(size - suffix, 0), size - 1
+    return start, end
+
+
+def _media_path(path: str) -> str:
+    if any(part.startswith('.') for part in path.split('/')):
+        # Manifiestos y temporales (.manifest.json, .nombre.tmp) no son públicos.
+        raise Http404('Archivo no encontrado')
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except ValueError:
+        raise Http404('Ruta inválida')
+    media_root = os.path.realpath(settings.MEDIA_ROOT)
+    if os.path.commonpath([media_root, os.path.realpath(fullpath)]) != media_root or not os.path.isfile(fullpath):
+        raise Http404('Archivo no encontrado')
+    return fullpath
+
+
+def _media_cache_control(path: str) -> str:
+    if MEDIA_HASHED_NAME.search(path):
+        return IMMUTABLE_CACHE_CONTROL
+    return f"public, max-age={getattr(settings, 'EMPRESA_MEDIA_MAX_AGE', 7 * 24 * 3600)}"
+
+
+def serve_media(request, path):
+    """
+    Serve ``path`` from ``MEDIA_ROOT`` once it is known to be a regular, public file.
+
+    With ``EMPRESA_MEDIA_ACCEL`` set to ``'x-accel-redirect'`` (nginx) or ``'x-sendfile'``
+    (Apache, lighttpd) the web server streams the file; otherwise a ``FileResponse``
+    does, honouring ``If-None-Match``/``If-Modified-Since`` and single byte ranges.
+    """
+    fullpath = _media_path(path)
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+    accel = getattr(settings, 'EMPRESA_MEDIA_ACCEL', None)
+
+    if accel == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        prefix = getattr(settings, 'EMPRESA_MEDIA_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(path)
+        response['Cache-Control'] = _media_cache_control(path)
+        return response
+    if accel == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = fullpath
+        response['Cache-Control'] = _media_cache_control(path)
+        return response
+
+    stat = os.stat(fullpath)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        byte_range = None
+        if request.method == 'GET' and request.headers.get('If-Range', etag) == etag:
+            try:
+                byte_range = parse_range(request.headers.get('Range', ''), stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{stat.st_size}'
+                return response
+
+        if byte_range is None:
+            # Archivo completo: el servidor WSGI puede usar sendfile (wsgi.file_wrapper).
+            response = FileResponse(open(fullpath, 'rb'), content_type=content_type)
+        else:
+            start, end = byte_range
+            response = FileResponse(
+                _FileRange(open(fullpath, 'rb'), start, end - start + 1),
+                status=206,
+                content_type=content_type,
+            )
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = _media_cache_control(path)
+    return response
@@ -0,0 +1,319 @@
+import asyncio
+import http.client
+import json
+import math
+import platform
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import django
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+
+from empresa.management.commands.export_static_site import public_route_names
+
+SERVERS = ('wsgi', 'asgi')
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # pct * n / 100 y no pct / 100 * n: 7 / 100 * 100 da 7.000000000000001.
+    rank = max(1, math.ceil(pct * len(sorted_values) / 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(timings, statuses, sizes, wall_time: float) -> dict:
+    latencies = sorted(timings)
+    return {
+        'requests': len(timings),
+        'errors': sum(1 for status in statuses if status is None or status >= 400),
+        'throughput_rps': round(len(timings) / wall_time, 2) if wall_time else 0.0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'p50': round(percentile(latencies, 50), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'max': round(latencies[-1], 3) if latencies else 0.0,
+        },
+        'bytes': max(sizes) if sizes else 0,
+        'status_codes': sorted({status for status in statuses if status is not None}),
+    }
+
+
+class WSGIRunner:
+    """Serves ``tekon_website.wsgi`` on a local port and requests it over real sockets."""
+
+    def __enter__(self):
+        from tekon_website.wsgi import application
+
+        self.server = make_server(
+            '127.0.0.1', 0, application,
+            server_class=_ThreadingWSGIServer, handler_class=_QuietWSGIRequestHandler,
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch(self, host: str, path: str):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=60)
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path, headers={'Host': host})
+            response = connection.getresponse()
+            body = response.read()
+            status = response.status
+        except OSError:
+            return (time.perf_counter() - start) * 1000, None, 0
+        finally:
+            connection.close()
+        return (time.perf_counter() - start) * 1000, status, len(body)
+
+    def run(self, host: str, path: str, requests: int, concurrency: int):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: self.fetch(host, path), range(requests)))
+        return results, time.perf_counter() - start
+
+
+class ASGIRunner:
+    """
+    Drives ``tekon_website.asgi`` in-process through the ASGI HTTP protocol.
+
+    No ASGI server is installed in this project, so requests skip the socket
+    layer; the Django ASGI handler, middleware and sync view dispatch are the same.
+    """
+
+    def __enter__(self):
+        from tekon_website.asgi import application
+
+        self.application = application
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    async def fetch(self, host: str, path: str):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0', 'spec_version': '2.3'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode('ascii'),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(b'host', host.encode('idna'))],
+            'client': ('127.0.0.1', 50000),
+            'server': ('127.0.0.1', 80),
+        }
+        request_sent = False
+        disconnected = asyncio.Event()
+        response = {'status': None, 'size': 0}
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Django escucha una posible desconexión mientras genera la respuesta.
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                response['size'] += len(message.get('body', b''))
+
+        start = time.perf_counter()
+        try:
+            await self.application(scope, receive, send)
+        finally:
+            disconnected.set()
+        return (time.perf_counter() - start) * 1000, response['status'], response['size']
+
+    def run(self, host: str, path: str, requests: int, concurrency: int):
+        async def run_all():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def limited():
+                async with semaphore:
+                    return await self.fetch(host, path)
+
+            return await asyncio.gather(*(limited() for _ in range(requests)))
+
+        start = time.perf_counter()
+        results = asyncio.run(run_all())
+        return results, time.perf_counter() - start
+
+
+RUNNERS = {'wsgi': WSGIRunner, 'asgi': ASGIRunner}
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every empresa route through the local WSGI and ASGI applications and "
+        "report throughput and p50/p95/p99 latency as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--server',
+            action='append',
+            choices=SERVERS,
+            help="Application to benchmark; repeat for both (default: wsgi and asgi).",
+        )
+        parser.add_argument(
+            '--host',
+            action='append',
+            help="Host header to send; repeat for several (default: the domain of every Site).",
+        )
+        parser.add_argument(
+            '--route',
+            action='append',
+            help="empresa URL name to benchmark; repeat for several (default: every route without arguments).",
+        )
+        parser.add_argument('--requests', type=int, default=200, help="Measured requests per route (default: 200).")
+        parser.add_argument('--concurrency', type=int, default=8, help="Concurrent requests (default: 8).")
+        parser.add_argument('--warmup', type=int, default=5, help="Unmeasured requests per route (default: 5).")
+        parser.add_argument(
+            '--output',
+            help="JSON file for the results (default: benchmarks/<timestamp>.json).",
+        )
+        parser.add_argument(
+            '--compare',
+            help="Previous results file to compare p50/p95 and throughput against.",
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] <= 0 or options['concurrency'] <= 0:
+            raise CommandError("--requests y --concurrency deben ser mayores que cero.")
+
+        servers = options['server'] or list(SERVERS)
+        hosts = options['host'] or list(Site.objects.order_by('pk').values_list('domain', flat=True))
+        route_names = options['route'] or public_route_names()
+        unknown = set(route_names) - set(public_route_names())
+        if unknown:
+            raise CommandError(f"Rutas desconocidas o con argumentos: {', '.join(sorted(unknown))}")
+        if settings.DEBUG:
+            self.stderr.write("Aviso: DEBUG está activo; los tiempos no representan producción.")
+
+        # Los hilos y el loop del benchmark abren sus propias conexiones.
+        connections.close_all()
+
+        results = []
+        for server in servers:
+            with RUNNERS[server]() as runner:
+                for host in hosts:
+                    for route_name in route_names:
+                        path = reverse(f'empresa:{route_name}')
+                        if options['warmup']:
+                            runner.run(host, path, options['warmup'], min(options['concurrency'], options['warmup']))
+                        measured, wall_time = runner.run(host, path, options['requests'], options['concurrency'])
+                        timings, statuses, sizes = zip(*measured)
+                        summary = {
+                            'server': server,
+                            'host': host,
+                            'route': route_name,
+                            'path': path,
+                            **summarize(timings, statuses, sizes, wall_time),
+                        }
+                        results.append(summary)
+                        self.write_row(summary)
+
+        report = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'debug': settings.DEBUG,
+                'database': settings.DATABASES['default']['ENGINE'],
+                'page_cache_timeout': getattr(settings, 'EMPRESA_PAGE_CACHE_TIMEOUT', 0),
+            },
+            'options': {
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'warmup': options['warmup'],
+            },
+            'results': results,
+        }
+
+        output = Path(options['output'] or Path(settings.BASE_DIR) / 'benchmarks' / f"{datetime.now():%Y%m%d-%H%M%S}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {output}"))
+
+        if options['compare']:
+            self.compare(report, Path(options['compare']))
+
+    def write_row(self, summary):
+        latency = summary['latency_ms']
+        errors = f" errores={summary['errors']}" if summary['errors'] else ''
+        self.stdout.write(
+            f"{summary['server']:4} {summary['host']:24} {summary['route']:15} "
+            f"{summary['throughput_rps']:8.1f} req/s  p50={latency['p50']:7.1f}ms  "
+            f"p95={latency['p95']:7.1f}ms  p99={latency['p99']:7.1f}ms{errors}"
+        )
+
+    def compare(self, report, previous_path: Path):
+        try:
+            previous = json.loads(previous_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError) as error:
+            raise CommandError(f"No se pudo leer {previous_path}: {error}")
+
+        def key(result):
+            return result['server'], result['host'], result['route']
+
+        baseline = {key(result): result for result in previous.get('results', [])}
+        self.stdout.write(f"Comparación con {previous_path} ({previous.get('revision') or 'sin revisión'}):")
+        for result in report['results']:
+            old = baseline.get(key(result))
+            if not old:
+                continue
+
+            def change(new, before):
+                return f"{(new - before) / before * 100:+6.1f}%" if before else '   n/a'
+
+            self.stdout.write(
+                f"{result['server']:4} {result['host']:24} {result['route']:15} "
+                f"req/s {change(result['throughput_rps'], old['throughput_rps'])}  "
+                f"p50 {change(result['latency_ms']['p50'], old['latency_ms']['p50'])}  "
+                f"p95 {change(result['latency_ms']['p95'], old['latency_ms']['p95'])}"
+            )
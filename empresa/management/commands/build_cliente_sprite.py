@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from empresa.utils.sprites import build_cliente_sprite
+
+
+class Command(BaseCommand):
+    help = "Build the client logo sprite used by the cliente_logo template tag."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Rebuild the sprite even if the client logos did not change.",
+        )
+
+    def handle(self, *args, **options):
+        sprite_map = build_cliente_sprite(force=options['force'])
+        if sprite_map is None:
+            self.stdout.write("No hay clientes activos con logo.")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Sprite {sprite_map['image']} ({sprite_map['width']}x{sprite_map['height']}, "
+            f"{len(sprite_map['logos'])} logos)."
+        ))
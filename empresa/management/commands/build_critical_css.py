@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from empresa.management.commands.export_static_site import public_route_names
+from empresa.utils.critical_css import critical_css, critical_css_dir, critical_css_path
+from empresa.utils.files import atomic_write
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every public empresa page and store the Tailwind rules its first screen needs "
+        "(inlined by the page_styles tag). Run it after rebuilding the stylesheet or editing templates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sections',
+            type=int,
+            default=getattr(settings, 'EMPRESA_CRITICAL_CSS_SECTIONS', 2),
+            help="Number of <section> elements considered above the fold.",
+        )
+
+    def handle(self, *args, **options):
+        stylesheet = finders.find(settings.TAILWIND_CSS_PATH)
+        if not stylesheet:
+            raise CommandError(f"No se encontró {settings.TAILWIND_CSS_PATH}; compile Tailwind primero.")
+        with open(stylesheet, encoding='utf-8') as css_file:
+            css = css_file.read()
+
+        sites = list(Site.objects.order_by('pk'))
+        if not sites:
+            raise CommandError("No hay ningún Site configurado.")
+
+        # Las URL relativas de la hoja se resuelven desde su nombre sin hash, que
+        # collectstatic también conserva.
+        base_url = settings.STATIC_URL + settings.TAILWIND_CSS_PATH
+        clients = [Client(HTTP_HOST=site.domain) for site in sites]
+        pages = public_route_names()
+        written = 0
+        for name in pages:
+            # Un mismo archivo sirve a todos los sitios: cubre lo que cada uno muestra arriba.
+            documents = []
+            for site, client in zip(sites, clients):
+                response = client.get(reverse(f'empresa:{name}'))
+                if response.status_code == 200:
+                    documents.append(response.content.decode('utf-8'))
+                else:
+                    self.stderr.write(f"{name} ({site.domain}): HTTP {response.status_code}, se omite.")
+            if not documents:
+                continue
+            page_css = critical_css(css, documents, options['sections'], base_url)
+            atomic_write(critical_css_path(name), page_css.encode('utf-8'))
+            written += 1
+            self.stdout.write(f"{name}: {len(page_css) // 1024} KB de {len(css) // 1024} KB.")
+
+        # Páginas que ya no existen: su CSS nunca volvería a usarse.
+        for stale in critical_css_dir().glob('*.css'):
+            if stale.stem not in pages:
+                stale.unlink()
+        self.stdout.write(self.style.SUCCESS(
+            f"CSS crítico de {written} páginas ({len(sites)} sitios) en {critical_css_dir()}."
+        ))
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from empresa.utils.fonts import build_fonts, find_text_fonts, fontawesome_dir
+
+SCANNED_APPS = ('empresa', 'theme')
+
+
+def scanned_files():
+    """Templates of the ``empresa`` and ``theme`` apps plus the project's own scripts."""
+    for label in SCANNED_APPS:
+        yield from sorted((Path(apps.get_app_config(label).path) / 'templates').rglob('*.html'))
+    for static_dir in settings.STATICFILES_DIRS:
+        yield from sorted(Path(static_dir).rglob('*.js'))
+
+
+class Command(BaseCommand):
+    help = (
+        "Subset Font Awesome to the fa-* icons used in the templates and scripts, and Inter "
+        "to Latin, into static/fonts and static/css/fonts.css (run collectstatic afterwards)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fontawesome-dir',
+            help="Font Awesome 6 Free directory with css/ and webfonts/ (default: the fontawesomefree package).",
+        )
+        parser.add_argument(
+            '--fonts-dir',
+            default=getattr(settings, 'EMPRESA_FONT_SOURCES_DIR', None),
+            help="Directory with the Inter source files (Inter*.ttf/otf/woff2; a variable font or one per weight).",
+        )
+        parser.add_argument(
+            '--output',
+            default=str(settings.STATICFILES_DIRS[0]),
+            help="Static directory that receives fonts/ and css/fonts.css.",
+        )
+
+    def handle(self, *args, **options):
+        source = Path(options['fontawesome_dir']) if options['fontawesome_dir'] else fontawesome_dir()
+        if source is None or not (source / 'webfonts').is_dir():
+            raise CommandError(
+                "No se encontró Font Awesome: instale fontawesomefree o indique --fontawesome-dir."
+            )
+
+        text_fonts = find_text_fonts(options['fonts_dir']) if options['fonts_dir'] else []
+        if not text_fonts:
+            self.stderr.write(self.style.WARNING(
+                f"No hay archivos Inter en {options['fonts_dir']}; fonts.css solo llevará los iconos "
+                "e Inter seguirá cargándose desde Google Fonts."
+            ))
+
+        texts = (path.read_text(encoding='utf-8') for path in scanned_files())
+        try:
+            result = build_fonts(texts, options['output'], source, text_fonts)
+        except ImportError as exc:
+            raise CommandError(f"{exc} (pip install fonttools brotli)")
+
+        for name in result.unknown:
+            self.stderr.write(self.style.WARNING(f"Clase {name} sin icono en Font Awesome; se omite."))
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.css_name}: {len(result.icons)} iconos, fuentes {', '.join(result.fonts)}."
+        ))
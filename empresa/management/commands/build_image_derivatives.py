@@ -0,0 +1,36 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from empresa.utils.images import RESPONSIVE_IMAGE_FIELDS, derivative_formats, generate_derivatives
+
+
+class Command(BaseCommand):
+    help = "Build the resized AVIF/WebP versions used by the responsive_image template tag."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Rebuild derivatives even if they match the current source file.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Formatos: {', '.join(derivative_formats()) or 'ninguno'}")
+
+        built = 0
+        seen = set()
+        for model_name, field_names in RESPONSIVE_IMAGE_FIELDS.items():
+            model = apps.get_model('empresa', model_name)
+            for instance in model.objects.all():
+                for field_name in field_names:
+                    file_field = getattr(instance, field_name)
+                    if not file_field or file_field.name in seen:
+                        continue
+                    seen.add(file_field.name)
+                    manifest, _ = generate_derivatives(file_field, force=options['force'])
+                    if manifest:
+                        built += 1
+                    else:
+                        self.stderr.write(f"No se pudo procesar {file_field.name}.")
+
+        self.stdout.write(self.style.SUCCESS(f"{built} imágenes con derivados al día."))
@@ -0,0 +1,189 @@
+"""
+Pre-render the public empresa pages of every Site into a static directory tree.
+
+Layout of the output directory:
+
+    <output>/sites/<domain>/index.html, servicios/index.html, ...
+    <output>/static/...   (result of collectstatic: hashed names plus .gz/.br copies)
+    <output>/media/...    (only files referenced by the exported pages)
+
+Nginx can serve each domain from ``sites/<domain>`` and alias ``/static/`` and
+``/media/``, proxying only ``/admin/``, the "load more" fragments of the paginated
+listings and the pages that could not be exported (those that embed a CSRF
+token, such as the contact form) to Django.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import URLPattern, reverse
+
+from empresa import urls as empresa_urls
+from empresa.utils.content_version import get_content_version
+from empresa.utils.files import atomic_copy, atomic_write
+from empresa.utils.site_resolver import normalize_host
+
+MANIFEST_NAME = '.export-manifest.json'
+
+
+def public_route_names():
+    """Names of the empresa pages that take no URL arguments (HTML fragments excluded)."""
+    return [
+        pattern.name
+        for pattern in empresa_urls.urlpatterns
+        if isinstance(pattern, URLPattern)
+        and pattern.name
+        and not pattern.pattern.converters
+        and pattern not in empresa_urls.fragment_urlpatterns
+    ]
+
+
+def static_assets_version() -> str:
+    """Digest of the static manifest: changes whenever a hashed asset name changes."""
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    return hashlib.sha256(json.dumps(hashed_files, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def page_output_path(site_dir: Path, url_path: str) -> Path:
+    relative = url_path.strip('/')
+    return site_dir / relative / 'index.html' if relative else site_dir / 'index.html'
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every public empresa route for each Site into a static directory tree. "
+        "Pages whose site content version did not change since the last export are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=str(Path(settings.BASE_DIR) / 'static_export'),
+            help="Destination directory (default: <BASE_DIR>/static_export).",
+        )
+        parser.add_argument(
+            '--site',
+            action='append',
+            dest='domains',
+            default=[],
+            help="Export only this domain. Can be given several times.",
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Re-render every page even if its content version did not change.",
+        )
+        parser.add_argument(
+            '--skip-static',
+            action='store_true',
+            help="Do not run collectstatic nor copy static files.",
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options['output']).resolve()
+        output.mkdir(parents=True, exist_ok=True)
+
+        sites = list(Site.objects.order_by('pk'))
+        if options['domains']:
+            wanted = {normalize_host(domain) for domain in options['domains']}
+            sites = [site for site in sites if normalize_host(site.domain) in wanted]
+            if not sites:
+                raise CommandError("Ningún Site coincide con los dominios indicados.")
+
+        if not options['skip_static']:
+            # Antes de renderizar: las páginas enlazan los nombres con hash recién generados.
+            call_command('collectstatic', interactive=False, verbosity=0)
+
+        media_files = set()
+        for site in sites:
+            media_files |= self.export_site(site, output, force=options['force'])
+
+        copied_media = self.copy_media(media_files, output / 'media')
+        copied_static = 0 if options['skip_static'] else self.copy_static(output / 'static')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exportación lista en {output} ({copied_media} media y {copied_static} estáticos copiados)."
+        ))
+
+    def export_site(self, site, output: Path, force: bool = False) -> set:
+        domain = normalize_host(site.domain)
+        site_dir = output / 'sites' / domain
+        manifest_path = site_dir / MANIFEST_NAME
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except (FileNotFoundError, ValueError):
+            manifest = {}
+        pages = manifest.setdefault('pages', {})
+
+        version = get_content_version(site.pk)
+        assets = static_assets_version()
+        client = Client(HTTP_HOST=site.domain)
+        media_pattern = re.compile(r'%s([^"\'()\s?#<>]+)' % re.escape(settings.MEDIA_URL))
+        media_files = set()
+
+        for name in public_route_names():
+            url_path = reverse(f'empresa:{name}')
+            target = page_output_path(site_dir, url_path)
+            entry = pages.get(url_path)
+
+            if (
+                not force
+                and entry
+                and entry.get('version') == version
+                and entry.get('assets') == assets
+                and target.exists()
+            ):
+                media_files.update(entry.get('media', []))
+                continue
+
+            response = client.get(url_path)
+            if response.status_code != 200:
+                self.stderr.write(f"{domain}{url_path}: HTTP {response.status_code}, se omite.")
+                continue
+            if settings.CSRF_COOKIE_NAME in response.cookies:
+                # Un token CSRF embebido en HTML estático no coincidiría con la cookie del visitante.
+                self.stdout.write(f"{domain}{url_path}: usa CSRF, se deja dinámica.")
+                pages.pop(url_path, None)
+                continue
+
+            content = response.content
+            digest = hashlib.sha256(content).hexdigest()
+            referenced = sorted({unquote(match) for match in media_pattern.findall(content.decode('utf-8'))})
+            media_files.update(referenced)
+
+            if not (entry and entry.get('sha256') == digest and target.exists()):
+                atomic_write(target, content)
+                self.stdout.write(f"{domain}{url_path}: escrita.")
+            pages[url_path] = {'version': version, 'assets': assets, 'sha256': digest, 'media': referenced}
+
+        manifest['version'] = version
+        atomic_write(manifest_path, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+        return media_files
+
+    def copy_media(self, media_files, media_dir: Path) -> int:
+        media_root = Path(settings.MEDIA_ROOT).resolve()
+        copied = 0
+        for name in sorted(media_files):
+            source = (media_root / name).resolve()
+            if media_root not in source.parents or not source.is_file():
+                continue
+            if atomic_copy(source, media_dir / source.relative_to(media_root)):
+                copied += 1
+        return copied
+
+    def copy_static(self, static_dir: Path) -> int:
+        static_root = Path(settings.STATIC_ROOT)
+        copied = 0
+        for source in static_root.rglob('*'):
+            if source.is_file() and atomic_copy(source, static_dir / source.relative_to(static_root)):
+                copied += 1
+        return copied
@@ -0,0 +1,276 @@
+import random
+from datetime import date, timedelta
+from io import BytesIO
+
+from django.contrib.sites.models import Site
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from PIL import Image, ImageDraw
+
+from empresa.models import Cliente, ConfiguracionSitio, Contacto, Empresa, Equipo, Proyecto, Servicio
+from empresa.utils.content_version import bump_content_version
+from empresa.utils.images import CLIENTE_LOGO_HEIGHT
+
+# Todo lo generado se reconoce por estos marcadores, lo que permite borrarlo con --clear.
+MEDIA_DIR = 'synthetic'
+CONTACT_DOMAIN = 'synthetic.example'
+SITE_SUFFIX = '.synthetic.test'
+
+PREFIJOS = ['Minera', 'Constructora', 'Energía', 'Transportes', 'Ingeniería', 'Servicios', 'Grupo', 'Inversiones', 'Telecom', 'Agroindustrial']
+NUCLEOS = ['Andina', 'del Pacífico', 'Altiplano', 'Austral', 'Cordillera', 'Atacama', 'Illimani', 'Tunari', 'Pampa', 'Valle Central', 'Chaco', 'Amazonía']
+SUFIJOS = ['S.A.', 'SRL', 'SpA', 'Ltda.', 'S.A.C.', '']
+TIPOS_OBRA = ['Supervisión de', 'Construcción de', 'Fiscalización de', 'Montaje de', 'Diseño de', 'Mantenimiento de']
+OBRAS = ['torres de telecomunicaciones', 'planta fotovoltaica', 'subestación eléctrica', 'gasoducto', 'puente vehicular', 'parque eólico', 'red de fibra óptica', 'edificio corporativo', 'planta de tratamiento', 'línea de transmisión']
+LUGARES = ['La Paz', 'Santa Cruz', 'Cochabamba', 'Tarija', 'Oruro', 'Antofagasta', 'Santiago', 'Calama', 'Potosí', 'Sucre']
+SERVICIOS = ['Ingeniería de detalle', 'Supervisión de obras', 'Fiscalización técnica', 'Capacitación de personal', 'Gestión de proyectos', 'Topografía', 'Estudios de suelos', 'Seguridad industrial', 'Consultoría ambiental', 'Inspección de calidad']
+NOMBRES = ['Ana', 'Carlos', 'María', 'Jorge', 'Lucía', 'Diego', 'Valeria', 'Andrés', 'Camila', 'Rodrigo', 'Paola', 'Marco']
+APELLIDOS = ['Mamani', 'Quispe', 'Rojas', 'Fernández', 'Gutiérrez', 'Vargas', 'Soto', 'Muñoz', 'Flores', 'Pérez', 'Castro', 'Torres']
+CARGOS = ['Ingeniero de Proyectos', 'Jefe de Obra', 'Supervisor HSE', 'Gerente Técnico', 'Topógrafo', 'Administradora', 'Ingeniera Eléctrica', 'Coordinador de Calidad']
+PALABRAS = (
+    'proyecto ingeniería obra supervisión calidad seguridad plazo cliente diseño montaje estructura '
+    'energía red planta equipo control informe avance presupuesto normativa instalación mantenimiento'
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate realistic synthetic Cliente, Proyecto, Servicio, Equipo and Contacto rows "
+        "(plus extra Sites and placeholder media) for load and benchmark runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument('--clientes', type=int, default=5000)
+        parser.add_argument('--proyectos', type=int, default=10000)
+        parser.add_argument('--servicios', type=int, default=60)
+        parser.add_argument('--equipo', type=int, default=200)
+        parser.add_argument('--contactos', type=int, default=2000)
+        parser.add_argument(
+            '--sites',
+            type=int,
+            default=3,
+            help=f"Extra Sites (sitio-N{SITE_SUFFIX}) with their own Empresa and ConfiguracionSitio.",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows per bulk_create (default: 1000).")
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help="Delete previously generated data before generating.",
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError("--batch-size debe ser mayor que cero.")
+
+        self.random = random.Random(options['seed'])
+        # Generador aparte para la media: los archivos que ya existen no deben cambiar
+        # la secuencia con la que se generan las filas.
+        self.media_random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        if options['clear']:
+            self.clear()
+
+        media = self.create_media()
+        with transaction.atomic():
+            self.create_sites(options['sites'])
+            clientes = self.create_clientes(options['clientes'], media['logos'])
+            self.create_proyectos(options['proyectos'], clientes, media['proyectos'])
+            self.create_servicios(options['servicios'], media['iconos'])
+            self.create_equipo(options['equipo'], media['fotos'])
+            self.create_contactos(options['contactos'])
+
+        # bulk_create no emite signals: se invalidan las páginas cacheadas a mano.
+        bump_content_version()
+        self.stdout.write(self.style.SUCCESS(
+            "Datos sintéticos generados. Ejecuta `manage.py build_cliente_sprite` para actualizar el sprite de logos."
+        ))
+
+    # Datos
+
+    def clear(self):
+        prefix = f'{MEDIA_DIR}/'
+        querysets = {
+            'clientes': Cliente.objects.filter(logo__startswith=prefix),
+            'proyectos': Proyecto.objects.filter(imagen__startswith=prefix),
+            'servicios': Servicio.objects.filter(icono__startswith=prefix),
+            'equipo': Equipo.objects.filter(foto__startswith=prefix),
+            'contactos': Contacto.objects.filter(email__endswith=f'@{CONTACT_DOMAIN}'),
+            'sitios': Site.objects.filter(domain__endswith=SITE_SUFFIX),
+        }
+        deleted = {}
+        with transaction.atomic():
+            for name, queryset in querysets.items():
+                deleted[name] = queryset.delete()[1].get(queryset.model._meta.label, 0)
+        self.stdout.write("Eliminados: " + ', '.join(f'{count} {name}' for name, count in deleted.items()))
+
+    def bulk_create(self, model, objects):
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.stdout.write(f"{len(created)} {model._meta.verbose_name_plural.lower()} creados.")
+        return created
+
+    def company_name(self, index):
+        name = f'{self.random.choice(PREFIJOS)} {self.random.choice(NUCLEOS)} {self.random.choice(SUFIJOS)}'.strip()
+        return f'{name} {index}'
+
+    def paragraph(self, words):
+        text = ' '.join(self.random.choice(PALABRAS) for _ in range(words))
+        return text.capitalize() + '.'
+
+    def person_name(self):
+        return f'{self.random.choice(NOMBRES)} {self.random.choice(APELLIDOS)} {self.random.choice(APELLIDOS)}'
+
+    def create_sites(self, count):
+        existing = Site.objects.filter(domain__endswith=SITE_SUFFIX).count()
+        for index in range(existing + 1, existing + count + 1):
+            site = Site.objects.create(domain=f'sitio-{index}{SITE_SUFFIX}', name=f'Sitio sintético {index}')
+            Empresa.objects.create(
+                site=site,
+                nombre=self.company_name(index),
+                descripcion=self.paragraph(30),
+                mision=self.paragraph(20),
+                vision=self.paragraph(20),
+                valores=self.paragraph(15),
+            )
+            ConfiguracionSitio.objects.create(
+                site=site,
+                titulo_sitio=f'Sitio sintético {index}',
+                descripcion_sitio=self.paragraph(20),
+                email_footer=f'contacto@sitio-{index}.{CONTACT_DOMAIN}',
+            )
+        self.stdout.write(f"{count} sitios creados.")
+
+    def create_clientes(self, count, logos):
+        clientes = []
+        for index in range(count):
+            cliente = Cliente(
+                nombre=self.company_name(index),
+                logo=logos[index % len(logos)],
+                descripcion=self.paragraph(self.random.randint(8, 30)),
+                tipo_cliente=self.random.choice(['directo', 'final']),
+                activo=self.random.random() < 0.95,
+                destacado=self.random.random() < 0.02,
+                orden=self.random.randint(0, 100),
+            )
+            puntos = [self.paragraph(6) for _ in range(self.random.randint(0, 4))]
+            cliente.puntos_importantes = '\n'.join(puntos)
+            # bulk_create no llama a save(), que es donde se separan los puntos.
+            cliente.lista_puntos_importantes = puntos
+            clientes.append(cliente)
+        return self.bulk_create(Cliente, clientes)
+
+    def create_proyectos(self, count, clientes, imagenes):
+        proyectos = []
+        for index in range(count):
+            cliente = self.random.choice(clientes) if clientes and self.random.random() < 0.8 else None
+            inicio = date(2010, 1, 1) + timedelta(days=self.random.randint(0, 5000))
+            proyectos.append(Proyecto(
+                nombre=f'{self.random.choice(TIPOS_OBRA)} {self.random.choice(OBRAS)} {self.random.choice(LUGARES)} {index}',
+                descripcion=self.paragraph(self.random.randint(20, 60)),
+                cliente=cliente.nombre if cliente else self.company_name(index),
+                cliente_rel=cliente,
+                alcance=self.paragraph(self.random.randint(10, 40)),
+                imagen=imagenes[index % len(imagenes)],
+                fecha_inicio=inicio,
+                fecha_fin=inicio + timedelta(days=self.random.randint(30, 900)) if self.random.random() < 0.7 else None,
+                activo=self.random.random() < 0.95,
+                destacado=self.random.random() < 0.01,
+                orden=self.random.randint(0, 100),
+            ))
+        self.bulk_create(Proyecto, proyectos)
+
+    def create_servicios(self, count, iconos):
+        servicios = [
+            Servicio(
+                nombre=f'{self.random.choice(SERVICIOS)} {index}',
+                descripcion=self.paragraph(self.random.randint(15, 40)),
+                icono=iconos[index % len(iconos)],
+                orden=index,
+                activo=self.random.random() < 0.9,
+            )
+            for index in range(count)
+        ]
+        self.bulk_create(Servicio, servicios)
+
+    def create_equipo(self, count, fotos):
+        miembros = []
+        for index in range(count):
+            nombre = self.person_name()
+            miembros.append(Equipo(
+                nombre=nombre,
+                cargo=self.random.choice(CARGOS),
+                email=f'persona{index}@{CONTACT_DOMAIN}',
+                telefono=f'+591 7{self.random.randint(1000000, 9999999)}',
+                foto=fotos[index % len(fotos)],
+                descripcion=self.paragraph(self.random.randint(10, 30)),
+                socio=self.random.random() < 0.05,
+                activo=self.random.random() < 0.95,
+                orden=index,
+            ))
+        self.bulk_create(Equipo, miembros)
+
+    def create_contactos(self, count):
+        contactos = [
+            Contacto(
+                nombre=self.person_name(),
+                email=f'contacto{index}@{CONTACT_DOMAIN}',
+                telefono=f'+591 6{self.random.randint(1000000, 9999999)}',
+                empresa=self.company_name(index),
+                asunto=f'Consulta sobre {self.random.choice(SERVICIOS).lower()}',
+                mensaje=self.paragraph(self.random.randint(15, 80)),
+                leido=self.random.random() < 0.6,
+                respondido=self.random.random() < 0.3,
+            )
+            for index in range(count)
+        ]
+        self.bulk_create(Contacto, contactos)
+
+    # Media de relleno: un conjunto pequeño de archivos que se reparte entre las filas.
+
+    def create_media(self):
+        return {
+            'logos': [
+                self.save_image(f'{MEDIA_DIR}/clientes/logo-{index}.webp', (self.media_random.randint(160, 420), CLIENTE_LOGO_HEIGHT), 'WEBP')
+                for index in range(24)
+            ],
+            'proyectos': [
+                self.save_image(f'{MEDIA_DIR}/proyectos/proyecto-{index}.jpg', (1600, 1000), 'JPEG')
+                for index in range(16)
+            ],
+            'fotos': [
+                self.save_image(f'{MEDIA_DIR}/equipo/persona-{index}.jpg', (600, 600), 'JPEG')
+                for index in range(8)
+            ],
+            'iconos': [self.save_svg(f'{MEDIA_DIR}/servicios/icono-{index}.svg', index) for index in range(6)],
+        }
+
+    def save_image(self, name, size, fmt):
+        # Los valores se sortean aunque el archivo exista, para que cada imagen sea
+        # siempre la misma para una semilla dada.
+        color = tuple(self.media_random.randint(40, 220) for _ in range(3))
+        rectangles = []
+        for _ in range(6):
+            x0, y0 = self.media_random.randint(0, size[0] - 1), self.media_random.randint(0, size[1] - 1)
+            x1, y1 = self.media_random.randint(x0, size[0]), self.media_random.randint(y0, size[1])
+            rectangles.append(((x0, y0, x1, y1), tuple(self.media_random.randint(0, 255) for _ in range(3))))
+        if not default_storage.exists(name):
+            image = Image.new('RGB', size, color)
+            draw = ImageDraw.Draw(image)
+            for box, fill in rectangles:
+                draw.rectangle(box, fill=fill)
+            buffer = BytesIO()
+            image.save(buffer, format=fmt, quality=80)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+        return name
+
+    def save_svg(self, name, index):
+        if not default_storage.exists(name):
+            radius = 6 + index * 2
+            svg = (
+                '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 48 48" fill="none" stroke="currentColor" stroke-width="3">'
+                f'<circle cx="24" cy="24" r="{radius}"/><path d="M8 40L40 8"/></svg>'
+            )
+            default_storage.save(name, ContentFile(svg.encode('utf-8')))
+        return name
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image, UnidentifiedImageError
+
+from empresa.utils.files import atomic_write
+from empresa.utils.images import CLIENTE_LOGO_HEIGHT, CLIENTE_LOGO_WEBP_OPTIONS, normalize_to_height
+
+SUPPORTED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.bmp'}
+MANIFEST_NAME = '.manifest.json'
+
+
+def _init_process():
+    # Con 'spawn' el proceso hijo arranca sin Django configurado; con 'fork' ya lo hereda
+    # y setup() no vuelve a hacer nada. Los hijos no usan la base de datos.
+    django.setup()
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open('rb') as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _normalize_logo(source: str, output: str, height: int):
+    """Convierte un logo a WEBP de exactamente ``height`` px de alto. Se ejecuta en el pool."""
+    with Image.open(source) as original:
+        image = normalize_to_height(original, height)
+    buffer = BytesIO()
+    image.save(buffer, format='WEBP', **CLIENTE_LOGO_WEBP_OPTIONS)
+    atomic_write(output, buffer.getvalue())
+    return image.width, image.height
+
+
+class Command(BaseCommand):
+    help = (
+        "Normalize client logos to WEBP with an exact height, in parallel. "
+        "Unchanged inputs are skipped using a content-hash manifest."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--input',
+            default=str(Path(settings.BASE_DIR) / 'source' / 'clientes'),
+            help="Directory with the original logos (default: source/clientes).",
+        )
+        parser.add_argument(
+            '--output',
+            default=str(Path(settings.BASE_DIR) / 'source' / 'clientes_webp'),
+            help="Directory for the normalized WEBP logos (default: source/clientes_webp).",
+        )
+        parser.add_argument(
+            '--height',
+            type=int,
+            default=CLIENTE_LOGO_HEIGHT,
+            help=f"Exact output height in pixels (default: {CLIENTE_LOGO_HEIGHT}).",
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=max(1, multiprocessing.cpu_count() or 1),
+            help="Number of worker processes (default: CPUs).",
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Process every logo even if it did not change.",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Show the logos that would be processed without writing output.",
+        )
+
+    def handle(self, *args, **options):
+        input_dir = Path(options['input'])
+        output_dir = Path(options['output'])
+        height = options['height']
+        if not input_dir.is_dir():
+            raise CommandError(f"No se encontró el directorio de logos: {input_dir}")
+        if height <= 0:
+            raise CommandError("--height debe ser mayor que cero.")
+
+        manifest_path = output_dir / MANIFEST_NAME
+        manifest = self._read_manifest(manifest_path)
+        # Cambiar los parámetros de salida invalida todo el manifiesto.
+        params = {'height': height, **CLIENTE_LOGO_WEBP_OPTIONS}
+        entries = manifest.get('files', {}) if manifest.get('params') == params else {}
+
+        sources = sorted(
+            path for path in input_dir.iterdir()
+            if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+        )
+        new_entries = {}
+        pending = []
+        for path in sources:
+            key = path.name
+            output_path = output_dir / path.with_suffix('.webp').name
+            stat = path.stat()
+            entry = entries.get(key)
+            up_to_date = (
+                not options['force']
+                and entry is not None
+                and output_path.exists()
+                and entry.get('output') == output_path.name
+            )
+            if up_to_date and entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime_ns:
+                # Tamaño y mtime iguales: no hace falta ni leer el archivo.
+                new_entries[key] = entry
+                continue
+
+            digest = _file_hash(path)
+            if up_to_date and entry.get('sha256') == digest:
+                new_entries[key] = {**entry, 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+                continue
+
+            new_entries[key] = {
+                'sha256': digest,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'output': output_path.name,
+            }
+            pending.append((path, output_path))
+
+        # Salidas de logos que ya no existen en el directorio de entrada.
+        current_outputs = {entry['output'] for entry in new_entries.values()}
+        stale = [
+            output_dir / entry['output'] for key, entry in entries.items()
+            if key not in new_entries and entry.get('output') and entry['output'] not in current_outputs
+        ]
+
+        if options['dry_run']:
+            for path, output_path in pending:
+                self.stdout.write(f"[DRY-RUN] {path.name} -> {output_path.name}")
+            for output_path in stale:
+                self.stdout.write(f"[DRY-RUN] eliminar {output_path.name}")
+            self.stdout.write(f"{len(pending)} de {len(sources)} logos por procesar.")
+            return
+
+        failed = 0
+        if pending:
+            with ProcessPoolExecutor(
+                max_workers=max(1, min(options['workers'], len(pending))),
+                initializer=_init_process,
+            ) as pool:
+                futures = {
+                    pool.submit(_normalize_logo, str(path), str(output_path), height): path
+                    for path, output_path in pending
+                }
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        width, _ = future.result()
+                    except (OSError, UnidentifiedImageError) as error:
+                        failed += 1
+                        new_entries.pop(path.name, None)
+                        self.stderr.write(f"No se pudo procesar {path.name}: {error}")
+                        continue
+                    new_entries[path.name]['width'] = width
+                    self.stdout.write(f"{path.name} -> {width}x{height}")
+
+        for output_path in stale:
+            output_path.unlink(missing_ok=True)
+
+        atomic_write(
+            manifest_path,
+            json.dumps({'params': params, 'files': new_entries}, indent=2, sort_keys=True).encode('utf-8'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(pending) - failed} logos procesados, {len(sources) - len(pending)} sin cambios"
+            f"{f', {failed} con error' if failed else ''}."
+        ))
+
+    def _read_manifest(self, path: Path) -> dict:
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
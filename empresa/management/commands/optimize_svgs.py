@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from empresa.models import ConfiguracionSitio, Servicio
+from empresa.utils.svg import ensure_minified_svg
+
+
+class Command(BaseCommand):
+    help = (
+        "Store optimized copies (.min.svg) of every service icon and site logo. "
+        "Running servers keep inlining the cached original until they restart."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Regenerate copies even if they are newer than the original.",
+        )
+
+    def handle(self, *args, **options):
+        fields = [servicio.icono for servicio in Servicio.objects.exclude(icono='').exclude(icono__isnull=True)]
+        fields += [
+            configuracion.logo_svg
+            for configuracion in ConfiguracionSitio.objects.exclude(logo_svg='').exclude(logo_svg__isnull=True)
+        ]
+
+        optimized = 0
+        for field in fields:
+            target, _ = ensure_minified_svg(field, force=options['force'])
+            if target:
+                optimized += 1
+            else:
+                self.stderr.write(f"No se pudo optimizar {field.name}.")
+
+        self.stdout.write(self.style.SUCCESS(f"{optimized} SVG optimizados."))
@@ -0,0 +1,82 @@
+import multiprocessing
+import signal
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from empresa.utils.jobs import claim_jobs, mark_completed, mark_failed, run_task, saturated_types
+
+
+def _init_process():
+    # Con 'spawn' el proceso hijo arranca sin Django configurado. Con 'fork' hereda además
+    # las conexiones que el padre tenía abiertas al crear el proceso (claim_jobs las abre
+    # antes del primer submit): se cierran para que cada hijo abra la suya.
+    django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs (image derivatives, SVG optimization, ...) in a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=max(1, (multiprocessing.cpu_count() or 2) - 1),
+            help="Maximum number of jobs running at the same time (default: CPUs - 1).",
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help="Seconds to wait between queue checks when idle.",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Exit as soon as the queue is empty instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        poll_interval = options['poll_interval']
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        running = {}
+        with ProcessPoolExecutor(max_workers=concurrency, initializer=_init_process) as pool:
+            while True:
+                while not self._stopping and len(running) < concurrency:
+                    # Se reclama de a una para respetar el límite de concurrencia de cada tipo.
+                    full = saturated_types(Counter(job.tipo for job in running.values()))
+                    claimed = claim_jobs(1, exclude_types=full)
+                    if not claimed:
+                        break
+                    job = claimed[0]
+                    running[pool.submit(run_task, job.tipo, job.parametros)] = job
+                    self.stdout.write(f"[{job.pk}] {job.tipo} {job.parametros} (intento {job.intentos})")
+
+                if not running:
+                    if self._stopping or options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        mark_completed(job)
+                        self.stdout.write(self.style.SUCCESS(f"[{job.pk}] completada"))
+                    else:
+                        mark_failed(job, error)
+                        self.stderr.write(f"[{job.pk}] error: {error}")
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
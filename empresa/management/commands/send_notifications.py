@@ -0,0 +1,55 @@
+import signal
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from empresa.utils.outbox import claim_notifications, deliver
+
+
+class Command(BaseCommand):
+    help = "Deliver queued contact notifications, reusing one SMTP connection per burst."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help="Notifications claimed per round (default: 20).",
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help="Seconds to wait between outbox checks when idle.",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Exit as soon as the outbox is empty instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        connection = get_connection(fail_silently=False)
+        try:
+            while not self._stopping:
+                notificaciones = claim_notifications(max(1, options['batch_size']))
+                if not notificaciones:
+                    # La conexión SMTP solo se mantiene abierta mientras hay trabajo.
+                    connection.close()
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                sent = deliver(notificaciones, connection)
+                self.stdout.write(f"{sent} de {len(notificaciones)} notificaciones enviadas.")
+        finally:
+            connection.close()
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
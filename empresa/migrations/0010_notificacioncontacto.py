@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresa', '0009_tarea'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificacionContacto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destinatario', models.EmailField(max_length=254)),
+                ('asunto', models.CharField(max_length=400)),
+                ('cuerpo', models.TextField()),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('enviando', 'Enviando'), ('enviada', 'Enviada'), ('fallida', 'Fallida')], default='pendiente', max_length=20)),
+                ('intentos', models.PositiveIntegerField(default=0)),
+                ('max_intentos', models.PositiveIntegerField(default=5)),
+                ('ultimo_error', models.TextField(blank=True)),
+                ('ejecutar_despues', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bloqueado_hasta', models.DateTimeField(blank=True, null=True)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_entrega', models.DateTimeField(blank=True, null=True)),
+                ('contacto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notificaciones', to='empresa.contacto')),
+            ],
+            options={
+                'verbose_name': 'Notificación de contacto',
+                'verbose_name_plural': 'Notificaciones de contacto',
+                'ordering': ['ejecutar_despues', 'id'],
+                'indexes': [models.Index(fields=['estado', 'ejecutar_despues'], name='notificacion_estado_idx')],
+            },
+        ),
+    ]
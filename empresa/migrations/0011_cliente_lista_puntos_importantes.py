@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:37
+
+from django.db import migrations, models
+
+
+def parse_puntos_importantes(apps, schema_editor):
+    Cliente = apps.get_model('empresa', 'Cliente')
+    clientes = list(Cliente.objects.exclude(puntos_importantes=''))
+    for cliente in clientes:
+        cliente.lista_puntos_importantes = [
+            punto.strip() for punto in cliente.puntos_importantes.splitlines() if punto.strip()
+        ]
+    Cliente.objects.bulk_update(clientes, ['lista_puntos_importantes'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresa', '0010_notificacioncontacto'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='lista_puntos_importantes',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(parse_puntos_importantes, migrations.RunPython.noop),
+    ]
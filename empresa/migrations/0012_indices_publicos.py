@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresa', '0011_cliente_lista_puntos_importantes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['orden', 'nombre', 'id'], name='cliente_publicado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['tipo_cliente', 'orden', 'nombre', 'id'], name='cliente_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(condition=models.Q(('activo', True), ('destacado', True)), fields=['orden', 'nombre', 'id'], name='cliente_destacado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipo',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['orden', 'nombre'], name='equipo_publicado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipo',
+            index=models.Index(condition=models.Q(('activo', True), ('socio', True)), fields=['orden', 'nombre'], name='equipo_socio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proyecto',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['orden', '-fecha_creacion', 'id'], name='proyecto_publicado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proyecto',
+            index=models.Index(condition=models.Q(('activo', True), ('destacado', True)), fields=['orden', '-fecha_creacion', 'id'], name='proyecto_destacado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicio',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['orden', 'nombre'], name='servicio_publicado_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresa', '0012_indices_publicos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionContenido',
+            fields=[
+                ('clave', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Versión de contenido',
+                'verbose_name_plural': 'Versiones de contenido',
+            },
+        ),
+    ]
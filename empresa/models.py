@@ -1,6 +1,8 @@
 from django.core.validators import FileExtensionValidator
 from django.db import models
+from django.db.models import Exists, Q
 from django.contrib.sites.models import Site
+from django.utils import timezone
 from django.utils.text import slugify
 from django.urls import reverse
 
@@ -36,6 +38,11 @@ class Empresa(models.Model):
     def __str__(self):
         return self.nombre
 
+class ServicioQuerySet(models.QuerySet):
+    def published(self):
+        """Servicios visibles en el sitio, en el orden configurado"""
+        return self.filter(activo=True).order_by('orden', 'nombre')
+
 class Servicio(models.Model):
     """Modelo para los servicios de la empresa"""
     nombre = models.CharField(max_length=200)
@@ -52,14 +59,29 @@ class Servicio(models.Model):
     activo = models.BooleanField(default=True)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
 
+    objects = ServicioQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Servicio"
         verbose_name_plural = "Servicios"
         ordering = ['orden', 'nombre']
+        # Índices parciales: SQLite no usa uno sobre `activo` para un filtro booleano
+        # (WHERE "activo"), pero sí uno cuya condición coincide con ese filtro.
+        indexes = [
+            models.Index(fields=['orden', 'nombre'], condition=Q(activo=True), name='servicio_publicado_idx'),
+        ]
 
     def __str__(self):
         return self.nombre
 
+class ProyectoQuerySet(models.QuerySet):
+    def published(self):
+        """Proyectos visibles, con su cliente cargado en la misma consulta"""
+        return self.select_related('cliente_rel').filter(activo=True).order_by('orden', '-fecha_creacion')
+
+    def featured(self):
+        return self.published().filter(destacado=True)
+
 class Proyecto(models.Model):
     """Modelo para los proyectos destacados"""
     nombre = models.CharField(max_length=300)
@@ -82,10 +104,24 @@ class Proyecto(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     orden = models.PositiveIntegerField(default=0)
 
+    objects = ProyectoQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Proyecto"
         verbose_name_plural = "Proyectos"
         ordering = ['orden', '-fecha_creacion']
+        indexes = [
+            models.Index(
+                fields=['orden', '-fecha_creacion', 'id'],
+                condition=Q(activo=True),
+                name='proyecto_publicado_idx',
+            ),
+            models.Index(
+                fields=['orden', '-fecha_creacion', 'id'],
+                condition=Q(activo=True, destacado=True),
+                name='proyecto_destacado_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -96,6 +132,21 @@ class Proyecto(models.Model):
             return self.cliente_rel.nombre
         return self.cliente
 
+class ClienteQuerySet(models.QuerySet):
+    def published(self):
+        """Clientes visibles en el sitio, en el orden configurado"""
+        return self.filter(activo=True).order_by('orden', 'nombre')
+
+    def featured(self):
+        return self.published().filter(destacado=True)
+
+    def with_logo(self):
+        return self.exclude(logo__isnull=True).exclude(logo='')
+
+    def featured_or_all(self):
+        """Solo los destacados si hay alguno; si no, todos. Resuelto en una sola consulta"""
+        return self.filter(Q(destacado=True) | ~Exists(self.filter(destacado=True)))
+
 class Cliente(models.Model):
     """Modelo para los clientes de la empresa"""
     nombre = models.CharField(max_length=200)
@@ -119,21 +170,57 @@ class Cliente(models.Model):
         blank=True,
         help_text="Listado opcional (separado por saltos de línea) de hitos a mostrar en clientes destacados."
     )
+    # Puntos importantes ya separados; se recalcula en save() para no procesar texto al renderizar.
+    lista_puntos_importantes = models.JSONField(default=list, blank=True, editable=False)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
 
+    objects = ClienteQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
         ordering = ['orden', 'nombre']
+        indexes = [
+            models.Index(fields=['orden', 'nombre', 'id'], condition=Q(activo=True), name='cliente_publicado_idx'),
+            models.Index(
+                fields=['tipo_cliente', 'orden', 'nombre', 'id'],
+                condition=Q(activo=True),
+                name='cliente_tipo_idx',
+            ),
+            models.Index(
+                fields=['orden', 'nombre', 'id'],
+                condition=Q(activo=True, destacado=True),
+                name='cliente_destacado_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.nombre
 
+    @staticmethod
+    def parsear_puntos_importantes(texto):
+        """Separa el texto en una lista de puntos, uno por línea no vacía"""
+        return [punto.strip() for punto in (texto or '').splitlines() if punto.strip()]
+
+    def save(self, *args, **kwargs):
+        self.lista_puntos_importantes = self.parsear_puntos_importantes(self.puntos_importantes)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'puntos_importantes' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'lista_puntos_importantes'}
+        super().save(*args, **kwargs)
+
     @property
     def puntos_importantes_list(self):
-        if not self.puntos_importantes:
-            return []
-        return [punto.strip() for punto in self.puntos_importantes.splitlines() if punto.strip()]
+        return self.lista_puntos_importantes
+
+class EquipoQuerySet(models.QuerySet):
+    def published(self):
+        """Miembros visibles del equipo, en el orden configurado"""
+        return self.filter(activo=True).order_by('orden', 'nombre')
+
+    def featured(self):
+        """Socios visibles"""
+        return self.published().filter(socio=True)
 
 class Equipo(models.Model):
     """Modelo para el equipo de la empresa"""
@@ -148,10 +235,16 @@ class Equipo(models.Model):
     orden = models.PositiveIntegerField(default=0)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
 
+    objects = EquipoQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Miembro del Equipo"
         verbose_name_plural = "Equipo"
         ordering = ['orden', 'nombre']
+        indexes = [
+            models.Index(fields=['orden', 'nombre'], condition=Q(activo=True), name='equipo_publicado_idx'),
+            models.Index(fields=['orden', 'nombre'], condition=Q(activo=True, socio=True), name='equipo_socio_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} - {self.cargo}"
@@ -212,4 +305,90 @@ class ConfiguracionSitio(models.Model):
     def save(self, *args, **kwargs):
         if not self.pk and ConfiguracionSitio.objects.filter(site=self.site).exists():
             raise ValueError("Ya existe una configuración para este sitio.")
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class Tarea(models.Model):
+    """Trabajo en segundo plano procesado por `manage.py run_jobs`"""
+    PENDIENTE = 'pendiente'
+    EN_PROCESO = 'en_proceso'
+    COMPLETADA = 'completada'
+    FALLIDA = 'fallida'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_PROCESO, 'En proceso'),
+        (COMPLETADA, 'Completada'),
+        (FALLIDA, 'Fallida'),
+    ]
+
+    tipo = models.CharField(max_length=100)
+    parametros = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    intentos = models.PositiveIntegerField(default=0)
+    max_intentos = models.PositiveIntegerField(default=3)
+    ultimo_error = models.TextField(blank=True)
+    ejecutar_despues = models.DateTimeField(default=timezone.now)
+    bloqueado_hasta = models.DateTimeField(blank=True, null=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_finalizacion = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Tarea en segundo plano"
+        verbose_name_plural = "Tareas en segundo plano"
+        ordering = ['ejecutar_despues', 'id']
+        indexes = [
+            models.Index(fields=['estado', 'ejecutar_despues'], name='tarea_estado_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} ({self.get_estado_display()})"
+
+
+class NotificacionContacto(models.Model):
+    """Email pendiente de un mensaje de contacto, entregado por `manage.py send_notifications`"""
+    PENDIENTE = 'pendiente'
+    ENVIANDO = 'enviando'
+    ENVIADA = 'enviada'
+    FALLIDA = 'fallida'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (ENVIANDO, 'Enviando'),
+        (ENVIADA, 'Enviada'),
+        (FALLIDA, 'Fallida'),
+    ]
+
+    contacto = models.ForeignKey(Contacto, on_delete=models.CASCADE, related_name='notificaciones')
+    destinatario = models.EmailField()
+    asunto = models.CharField(max_length=400)
+    cuerpo = models.TextField()
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    intentos = models.PositiveIntegerField(default=0)
+    max_intentos = models.PositiveIntegerField(default=5)
+    ultimo_error = models.TextField(blank=True)
+    ejecutar_despues = models.DateTimeField(default=timezone.now)
+    bloqueado_hasta = models.DateTimeField(blank=True, null=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_entrega = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Notificación de contacto"
+        verbose_name_plural = "Notificaciones de contacto"
+        ordering = ['ejecutar_despues', 'id']
+        indexes = [
+            models.Index(fields=['estado', 'ejecutar_despues'], name='notificacion_estado_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.destinatario} - {self.asunto} ({self.get_estado_display()})"
+
+
+class VersionContenido(models.Model):
+    """Versión del contenido publicado, compartida por todos los procesos a través de la base de datos"""
+    clave = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Versión de contenido"
+        verbose_name_plural = "Versiones de contenido"
+
+    def __str__(self):
+        return f"{self.clave}: {self.version}"
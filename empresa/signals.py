@@ -0,0 +1,71 @@
+from django.contrib.sites.models import Site
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Cliente, ConfiguracionSitio, Empresa, Equipo, Proyecto, Servicio
+from .utils.content_version import bump_content_version
+from .utils.images import RESPONSIVE_IMAGE_FIELDS
+from .utils.jobs import enqueue
+from .utils.site_resolver import invalidate_site_map
+
+
+@receiver([post_save, post_delete], sender=Empresa)
+@receiver([post_save, post_delete], sender=ConfiguracionSitio)
+def invalidate_site_settings(sender, instance, **kwargs):
+    # La nueva versión invalida el snapshot del sitio en todos los procesos.
+    bump_content_version(instance.site_id)
+
+
+@receiver([post_save, post_delete], sender=Servicio)
+@receiver([post_save, post_delete], sender=Proyecto)
+@receiver([post_save, post_delete], sender=Cliente)
+@receiver([post_save, post_delete], sender=Equipo)
+def bump_shared_content_version(sender, **kwargs):
+    # Servicios, proyectos, clientes y equipo se muestran en todos los sitios.
+    bump_content_version()
+
+
+@receiver([post_save, post_delete], sender=Site)
+def rebuild_site_map(sender, instance, **kwargs):
+    invalidate_site_map()
+    bump_content_version(instance.pk)
+
+
+# El procesamiento de archivos solo se encola; lo ejecuta `manage.py run_jobs`.
+
+@receiver(post_save, sender=Servicio)
+def optimize_servicio_icon(sender, instance, raw=False, **kwargs):
+    if not raw and instance.icono:
+        enqueue('optimize_svg', model='Servicio', pk=instance.pk, field='icono')
+
+
+@receiver(post_save, sender=ConfiguracionSitio)
+def optimize_site_logo(sender, instance, raw=False, **kwargs):
+    if not raw and instance.logo_svg:
+        enqueue('optimize_svg', model='ConfiguracionSitio', pk=instance.pk, field='logo_svg')
+
+
+@receiver(post_save, sender=Empresa)
+@receiver(post_save, sender=Proyecto)
+@receiver(post_save, sender=Equipo)
+@receiver(post_save, sender=ConfiguracionSitio)
+def build_responsive_images(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for field_name in RESPONSIVE_IMAGE_FIELDS[sender.__name__]:
+        if getattr(instance, field_name):
+            enqueue('build_image_derivatives', model=sender.__name__, pk=instance.pk, field=field_name)
+
+
+@receiver(post_save, sender=Cliente)
+def normalize_cliente_logo(sender, instance, raw=False, **kwargs):
+    if not raw and instance.logo:
+        enqueue('normalize_cliente_logo', pk=instance.pk)
+
+
+@receiver(post_save, sender=Cliente)
+@receiver(post_delete, sender=Cliente)
+def rebuild_cliente_sprite(sender, instance, raw=False, **kwargs):
+    # La tarea compara la firma de los logos y no hace nada si no cambiaron.
+    if not raw:
+        enqueue('build_cliente_sprite')
@@ -0,0 +1,71 @@
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.utils.text import slugify
+from PIL import Image, UnidentifiedImageError
+
+from .models import Cliente
+from .utils.content_version import bump_content_version, bump_media_version
+from .utils.images import (
+    CLIENTE_LOGO_HEIGHT, CLIENTE_LOGO_WEBP_OPTIONS, generate_derivatives, normalize_to_height,
+)
+from .utils.jobs import enqueue, task
+from .utils.sprites import build_cliente_sprite as _build_cliente_sprite
+from .utils.svg import ensure_minified_svg
+
+
+def _get_file_field(model, pk, field):
+    instance = apps.get_model('empresa', model).objects.filter(pk=pk).first()
+    return getattr(instance, field) if instance else None
+
+
+@task('build_image_derivatives', max_concurrency=2)
+def build_image_derivatives(model, pk, field):
+    """Versiones AVIF/WebP responsivas de una imagen subida."""
+    _, written = generate_derivatives(_get_file_field(model, pk, field))
+    # Si ya estaban al día, las páginas y ETags en caché siguen siendo válidos.
+    if written:
+        bump_media_version()
+
+
+@task('optimize_svg')
+def optimize_svg(model, pk, field):
+    """Copia minificada (.min.svg) de un icono o logo SVG."""
+    _, written = ensure_minified_svg(_get_file_field(model, pk, field))
+    if written:
+        bump_media_version()
+
+
+@task('normalize_cliente_logo', max_concurrency=2)
+def normalize_cliente_logo(pk):
+    """Convierte el logo de un cliente a WEBP de exactamente CLIENTE_LOGO_HEIGHT px de alto."""
+    cliente = Cliente.objects.filter(pk=pk).first()
+    if not cliente or not cliente.logo:
+        return
+
+    with cliente.logo.open('rb') as logo_file:
+        try:
+            with Image.open(logo_file) as original:
+                if original.format == 'WEBP' and original.height == CLIENTE_LOGO_HEIGHT:
+                    return
+                image = normalize_to_height(original)
+        except UnidentifiedImageError:
+            return
+
+    buffer = BytesIO()
+    image.save(buffer, format='WEBP', **CLIENTE_LOGO_WEBP_OPTIONS)
+    name = cliente.logo.storage.save(
+        f"clientes/{slugify(cliente.nombre) or cliente.pk}.webp",
+        ContentFile(buffer.getvalue()),
+    )
+    # update() evita volver a disparar post_save y encolar la misma tarea.
+    Cliente.objects.filter(pk=pk).update(logo=name)
+    bump_content_version()
+    enqueue('build_cliente_sprite')
+
+
+@task('build_cliente_sprite', max_concurrency=1)
+def build_cliente_sprite():
+    """Sprite WEBP con los logos de los clientes activos."""
+    _build_cliente_sprite()
@@ -0,0 +1,62 @@
+import os
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from ..utils.critical_css import load_critical_css
+from ..utils.fonts import TEXT_FONT_FALLBACK_URL, declares_text_font
+
+register = template.Library()
+
+
+def _stylesheet_version():
+    # En DEBUG {% tailwind_css %} agrega ?v=<hora actual> y el HTML cambiaría en cada
+    # render (export_static_site reescribiría todo); la fecha de la hoja solo cambia
+    # al recompilarla.
+    if not settings.DEBUG:
+        return None
+    path = finders.find(settings.TAILWIND_CSS_PATH)
+    return int(os.stat(path).st_mtime) if path else None
+
+
+@register.inclusion_tag('empresa/partials/estilos.html', takes_context=True)
+def page_styles(context):
+    """
+    Inlines the critical CSS of the current page and loads the full stylesheet without
+    blocking rendering; pages without critical CSS get the usual blocking link.
+    """
+    request = context.get('request')
+    match = getattr(request, 'resolver_match', None)
+    critical = None
+    if match is not None and match.namespace == 'empresa' and match.url_name:
+        critical = load_critical_css(match.url_name)
+    return {
+        # "</" cerraría la etiqueta <style> antes de tiempo.
+        'critical_css': mark_safe(critical.replace('</', '<\\/')) if critical else '',
+        'tailwind_css_path': settings.TAILWIND_CSS_PATH,
+        'stylesheet_version': _stylesheet_version(),
+    }
+
+
+@lru_cache(maxsize=1)
+def _text_font_link():
+    # fonts.css solo cambia con build_fonts + despliegue, que reinicia los procesos.
+    path = finders.find('css/fonts.css')
+    if path:
+        with open(path, encoding='utf-8') as css_file:
+            if declares_text_font(css_file.read()):
+                return ''
+    return format_html('<link href="{}" rel="stylesheet">', TEXT_FONT_FALLBACK_URL)
+
+
+@register.simple_tag
+def text_font_link():
+    """
+    Links Inter from Google Fonts until ``manage.py build_fonts`` writes a local subset
+    into fonts.css; afterwards renders nothing and the page makes no third-party request.
+    """
+    return _text_font_link()
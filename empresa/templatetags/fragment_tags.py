@@ -0,0 +1,58 @@
+from django import template
+from django.conf import settings
+
+from ..utils.content_version import get_cache
+from ..utils.page_cache import fragment_cache_key
+from ..utils.site_resolver import resolve_site
+
+register = template.Library()
+
+
+class SiteFragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = getattr(settings, 'EMPRESA_FRAGMENT_CACHE_TIMEOUT', 0)
+        request = context.get('request')
+        if not timeout or request is None:
+            return self.nodelist.render(context)
+
+        key = fragment_cache_key(
+            request,
+            resolve_site(request),
+            self.name.resolve(context),
+            [value.resolve(context) for value in self.vary_on],
+        )
+        cache = get_cache()
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, timeout)
+        return content
+
+
+@register.tag
+def site_fragment(parser, token):
+    """
+    Caches the enclosed markup per site and content version::
+
+        {% site_fragment 'nav' request.resolver_match.url_name %}...{% endsite_fragment %}
+
+    Extra arguments are added to the key (the active menu item, the year). Saving
+    Empresa or ConfiguracionSitio bumps the site's content version in the database,
+    so every process renders the fragment again; ``EMPRESA_FRAGMENT_CACHE_TIMEOUT = 0``
+    disables the cache.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' necesita al menos un nombre de fragmento.")
+    nodelist = parser.parse((f'end{bits[0]}',))
+    parser.delete_first_token()
+    return SiteFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
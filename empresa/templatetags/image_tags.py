@@ -0,0 +1,104 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from ..utils.images import FORMAT_OPTIONS, derivative_name, get_derivatives
+from ..utils.sprites import get_sprite_map
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(file_field, alt: str = '', css_class: str = '', sizes: str = '100vw', loading: str = '') -> str:
+    """
+    Renders an image FileField as a <picture> with AVIF/WebP srcset sources.
+
+    Falls back to a plain <img> of the original upload while its derivatives have not
+    been built (see ``manage.py build_image_derivatives``).
+    """
+    if not file_field:
+        return ''
+
+    try:
+        src = file_field.url
+    except ValueError:
+        return ''
+
+    img = format_html(
+        '<img src="{}" alt="{}"{}{} decoding="async">',
+        src,
+        alt,
+        format_html(' class="{}"', css_class) if css_class else '',
+        format_html(' loading="{}"', loading) if loading else '',
+    )
+
+    derivatives = get_derivatives(file_field)
+    if not derivatives:
+        return img
+
+    storage = file_field.storage
+    sources = []
+    for fmt, options in FORMAT_OPTIONS.items():
+        widths = derivatives.get(fmt)
+        if not widths:
+            continue
+        srcset = ', '.join(
+            f'{storage.url(derivative_name(file_field.name, width, fmt))} {width}w' for width in widths
+        )
+        sources.append((options['mime_type'], srcset, sizes))
+
+    if not sources:
+        return img
+
+    return format_html(
+        '<picture>{}{}</picture>',
+        format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', sources),
+        img,
+    )
+
+
+def _percent(value: float) -> str:
+    return f'{value:.4f}'.rstrip('0').rstrip('.') + '%'
+
+
+@register.simple_tag
+def cliente_logo(cliente, css_class: str = '', loading: str = '') -> str:
+    """
+    Renders a client logo from the shared sprite sheet (see ``utils.sprites``).
+
+    Uses a plain <img> when the client is not in the current sprite or its logo
+    changed after the sprite was built.
+    """
+    if not cliente.logo:
+        return ''
+
+    sprite_map = get_sprite_map()
+    position = sprite_map.get('logos', {}).get(str(cliente.pk))
+    if not position or position['logo'] != cliente.logo.name:
+        return format_html(
+            '<img src="{}" alt="{}"{}{} decoding="async">',
+            cliente.logo.url,
+            cliente.nombre,
+            format_html(' class="{}"', css_class) if css_class else '',
+            format_html(' loading="{}"', loading) if loading else '',
+        )
+
+    # Porcentajes relativos al tamaño del elemento: el logo escala con la altura que le dé el CSS
+    # y el ancho sale de aspect-ratio. La caja va en línea para no depender de que la hoja
+    # compilada incluya .logo-sprite.
+    width, height = position['width'], position['height']
+    free_x = sprite_map['width'] - width
+    free_y = sprite_map['height'] - height
+    style = (
+        "display:inline-block;vertical-align:middle;background-repeat:no-repeat;"
+        f"background-image:url({cliente.logo.storage.url(sprite_map['image'])});"
+        f"background-size:{_percent(sprite_map['width'] / width * 100)} {_percent(sprite_map['height'] / height * 100)};"
+        f"background-position:{_percent(position['x'] / free_x * 100 if free_x else 0)} "
+        f"{_percent(position['y'] / free_y * 100 if free_y else 0)};"
+        f"aspect-ratio:{width}/{height}"
+    )
+    return format_html(
+        '<span role="img" aria-label="{}" class="logo-sprite{}" style="{}"></span>',
+        cliente.nombre,
+        f' {css_class}' if css_class else '',
+        style,
+    )
@@ -1,27 +1,107 @@
 import re
-from typing import Optional
+from typing import NamedTuple, Optional, Tuple
 
 from django import template
+from django.conf import settings
 from django.utils.safestring import mark_safe
 
+from ..utils.cache import LRUCache
+from ..utils.content_version import MEDIA_KEY, register_local_cache
+from ..utils.svg import MINIFIED_SUFFIX, minified_name
+
 register = template.Library()
 
+_CLASS_RE = re.compile(r'class="([^"]*)"')
+
+# (nombre, firma) -> SplitSvg. La firma incluye la copia .min.svg, que es la que se lee.
+_svg_cache = LRUCache(maxsize=getattr(settings, 'EMPRESA_SVG_CACHE_MAXSIZE', 64))
+# nombre -> firma, para no consultar el disco en cada render. optimize_svg avanza la
+# versión de media al escribir la copia minificada, lo que vacía estas firmas; el
+# timeout cubre archivos cambiados fuera de `run_jobs`.
+_signatures = LRUCache(
+    maxsize=getattr(settings, 'EMPRESA_SVG_CACHE_MAXSIZE', 64),
+    timeout=getattr(settings, 'EMPRESA_SVG_STAT_INTERVAL', 60),
+)
+register_local_cache(MEDIA_KEY, _signatures.clear)
+
+
+class SplitSvg(NamedTuple):
+    """SVG content split at the point where a CSS class is added."""
 
-def _add_class(svg_content: str, css_class: Optional[str]) -> str:
-    if not css_class:
-        return svg_content
+    head: str
+    tail: str
+    # 'append' adds to an existing class attribute, 'insert' adds a new one
+    # after '<svg' and 'none' leaves the content untouched.
+    mode: str
 
-    class_attribute = f'class="{css_class}"'
+    def render(self, css_class: Optional[str]) -> str:
+        if not css_class or self.mode == 'none':
+            return self.head + self.tail
+        if self.mode == 'append':
+            return f'{self.head} {css_class}{self.tail}'
+        return f'{self.head} class="{css_class}"{self.tail}'
 
+
+def _split_svg(svg_content: str) -> SplitSvg:
     if 'class=' in svg_content:
-        return re.sub(
-            r'class="([^"]*)"',
-            lambda match: f'class="{match.group(1)} {css_class}"',
-            svg_content,
-            count=1,
-        )
+        match = _CLASS_RE.search(svg_content)
+        if not match:
+            return SplitSvg(svg_content, '', 'none')
+        return SplitSvg(svg_content[:match.end(1)], svg_content[match.end(1):], 'append')
+
+    index = svg_content.find('<svg')
+    if index == -1:
+        return SplitSvg(svg_content, '', 'none')
+    return SplitSvg(svg_content[:index + 4], svg_content[index + 4:], 'insert')
+
+
+def _stat(storage, name: str) -> Optional[Tuple[float, int]]:
+    try:
+        return storage.get_modified_time(name).timestamp(), storage.size(name)
+    except (FileNotFoundError, NotImplementedError, ValueError, OSError):
+        return None
+
+
+def _signature(storage, name: str):
+    """Stat of ``name`` and of its minified copy, which is the one actually rendered."""
+    original = _stat(storage, name)
+    if original is None:
+        return None
+    minified = None if name.endswith(MINIFIED_SUFFIX) else _stat(storage, minified_name(name))
+    return original, minified
+
+
+def _load_split_svg(file_field) -> Optional[SplitSvg]:
+    storage = file_field.storage
+    name = file_field.name
+    signature = _signatures.get(name)
+    if signature is None:
+        signature = _signature(storage, name)
+        if signature is not None:
+            _signatures.set(name, signature)
 
-    return svg_content.replace('<svg', f'<svg {class_attribute}', 1)
+    key = (name, signature) if signature is not None else None
+    if key is not None:
+        split_svg = _svg_cache.get(key)
+        if split_svg is not None:
+            return split_svg
+
+    # Se prefiere la copia optimizada al subir el archivo (ver utils.svg).
+    source_name = name
+    if signature is not None and signature[1] is not None:
+        source_name = minified_name(name)
+
+    try:
+        with storage.open(source_name, 'rb') as svg_file:
+            raw_content = svg_file.read()
+        content = raw_content.decode('utf-8', errors='ignore')
+    except (FileNotFoundError, ValueError, OSError):
+        return None
+
+    split_svg = _split_svg(content)
+    if key is not None:
+        _svg_cache.set(key, split_svg)
+    return split_svg
 
 
 @register.simple_tag
@@ -32,12 +112,8 @@ def render_svg(file_field, css_class: str = '') -> str:
     if not file_field:
         return ''
 
-    try:
-        with file_field.open('rb') as svg_file:
-            raw_content = svg_file.read()
-        content = raw_content.decode('utf-8', errors='ignore')
-    except (FileNotFoundError, ValueError, OSError):
+    split_svg = _load_split_svg(file_field)
+    if split_svg is None:
         return ''
 
-    return mark_safe(_add_class(content, css_class))
-
+    return mark_safe(split_svg.render(css_class))
@@ -1,3 +1,1220 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import re
+import smtplib
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.contrib.sites.models import Site
+from django.contrib.staticfiles import finders
+from django.core import mail, signing
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import F
+from django.http import Http404, HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.template import Context, Template
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from .asset_views import serve_media, serve_static
+from .templatetags.css_tags import _text_font_link
+from .templatetags.image_tags import cliente_logo, responsive_image
+from .templatetags.svg_tags import render_svg
+from .management.commands.benchmark import percentile
+from .management.commands.build_fonts import scanned_files
+from .management.commands.export_static_site import public_route_names
+from .management.commands.run_jobs import _init_process
+from .models import (
+    Cliente, Contacto, Empresa, Equipo, NotificacionContacto, Proyecto, Servicio, Tarea, VersionContenido,
+)
+from .utils import images
+from .utils.content_version import (
+    SITE_MAP_KEY, bump_content_version, bump_media_version, bump_versions, get_cache, get_content_version,
+    get_request_version, get_shared_cache,
+)
+from .utils.critical_css import critical_css
+from .utils.fonts import UTILITY_CSS, parse_icon_css, scan_icon_usage
+from .utils.jobs import claim_jobs, enqueue, mark_failed, retry_delay, run_task, saturated_types
+from .utils.outbox import claim_notifications, deliver, queue_contact_notification
+from .utils.page_cache import cache_public_page, get_build, page_cache_key
+from .utils.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page, paginate_keyset
+from .utils.site_resolver import clear_site_map, resolve_site
+from .utils.site_settings import get_site_snapshot
+from .utils.static_storage import CompressedManifestStaticFilesStorage
+from .utils.svg import ensure_minified_svg, optimize_svg, round_path_data
+from .utils.throttle import consume_token, mark_submission
+from .views import CLIENTES_ORDERING, CLIENTES_SECCIONES, _clientes_page, _clientes_primeras_paginas, _proyectos_page
+
+DATOS_FIXTURE = str(Path(settings.BASE_DIR) / 'datos.json')
+PERF_BASELINE = Path(__file__).resolve().parent / 'perf_baseline.json'
+
+# Consultas máximas por vista con todas las cachés en frío. 5 de ellas resuelven
+# el sitio: SITE_ID (CurrentSiteMiddleware), mapa de dominios, versiones de contenido,
+# Empresa y ConfiguracionSitio.
+QUERY_BUDGETS = {
+    'home': 8,
+    'servicios': 6,
+    'proyectos': 6,
+    'clientes': 6,
+    'equipo': 6,
+    'contacto': 5,
+    'sobre_nosotros': 6,
+}
+
+# Una vista puede tardar hasta TOLERANCE veces su línea base más SLACK_MS antes de fallar.
+PERF_TOLERANCE = float(os.environ.get('EMPRESA_PERF_TOLERANCE', '3'))
+PERF_SLACK_MS = float(os.environ.get('EMPRESA_PERF_SLACK_MS', '25'))
+PERF_RUNS = 5
+
+# Bytes máximos del CSS crítico de una página (sin comprimir); la hoja completa pesa ~90 KB.
+CRITICAL_CSS_BUDGET = 20 * 1024
+
+# Tablas que solo consulta una página al renderizarse.
+CONTENT_TABLES = re.compile(r'"empresa_(?:servicio|proyecto|cliente|equipo)"')
+
+# Paso de EXPLAIN QUERY PLAN que recorre una tabla entera (sin USING INDEX).
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?"?(\w+)"?(?: AS \w+)?$')
+
+
+def reset_caches():
+    Site.objects.clear_cache()
+    get_cache().clear()
+    get_shared_cache().clear()
+    clear_site_map()
+    # Igual que al guardar Empresa o ConfiguracionSitio: los snapshots en memoria quedan viejos.
+    bump_content_version()
+
+
+class PublicPagesTestCase(TestCase):
+    fixtures = [DATOS_FIXTURE]
+
+    def setUp(self):
+        reset_caches()
+
+    def routes(self):
+        for site in Site.objects.order_by('pk'):
+            for route_name in public_route_names():
+                yield site, route_name, reverse(f'empresa:{route_name}')
+
+    def count_queries(self, site, path):
+        reset_caches()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, HTTP_HOST=site.domain)
+        self.assertEqual(response.status_code, 200, f'{site.domain}{path}')
+        return len(queries)
+
+
+def query_plan(sql, params):
+    """Detalle de cada paso de ``EXPLAIN QUERY PLAN`` (SQLite) para una consulta."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scan_sorts(plan, tables):
+    """Tablas recorridas enteras en un plan que además ordena con un B-tree temporal."""
+    if not any('USE TEMP B-TREE' in step for step in plan):
+        return []
+    scans = (FULL_SCAN.match(step) for step in plan)
+    return [scan.group(1) for scan in scans if scan and scan.group(1) in tables]
+
+
+class QueryBudgetTests(PublicPagesTestCase):
+    def test_every_route_has_a_budget(self):
+        self.assertEqual(set(public_route_names()), set(QUERY_BUDGETS))
+
+    def test_routes_stay_within_query_budget(self):
+        for site, route_name, path in self.routes():
+            with self.subTest(site=site.domain, route=route_name):
+                reset_caches()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(path, HTTP_HOST=site.domain)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    len(queries),
+                    QUERY_BUDGETS[route_name],
+                    '\n'.join(query['sql'] for query in queries.captured_queries),
+                )
+
+    def test_query_count_does_not_grow_with_content(self):
+        """Más filas no deben traducirse en más consultas (N+1)."""
+        before = {(site.pk, path): self.count_queries(site, path) for site, _, path in self.routes()}
+
+        for index in range(4):
+            cliente = Cliente.objects.create(
+                nombre=f'Cliente N+1 {index}',
+                logo=f'clientes/n1-{index}.webp',
+                tipo_cliente='final' if index % 2 else 'directo',
+                destacado=True,
+                puntos_importantes='Uno\nDos',
+            )
+            Proyecto.objects.create(
+                nombre=f'Proyecto N+1 {index}',
+                descripcion='Proyecto de prueba',
+                cliente=cliente.nombre,
+                cliente_rel=cliente,
+                alcance='Alcance de prueba',
+                imagen=f'proyectos/n1-{index}.jpg',
+                destacado=True,
+                orden=0,
+            )
+            Servicio.objects.create(nombre=f'Servicio N+1 {index}', descripcion='Servicio de prueba', orden=0)
+            Equipo.objects.create(nombre=f'Persona N+1 {index}', cargo='Ingeniero', socio=True, orden=0)
+
+        for site, route_name, path in self.routes():
+            with self.subTest(site=site.domain, route=route_name):
+                self.assertEqual(self.count_queries(site, path), before[(site.pk, path)])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN es específico de SQLite')
+@override_settings(EMPRESA_PROYECTOS_PAGE_SIZE=1, EMPRESA_CLIENTES_PAGE_SIZE=1)
+class QueryPlanTests(PublicPagesTestCase):
+    """Las consultas públicas deben usar un índice en vez de recorrer y ordenar la tabla."""
+
+    def paths(self):
+        for _, _, path in self.routes():
+            yield path
+        # Páginas siguientes de los listados, que filtran por el cursor.
+        yield _proyectos_page().next_url
+        for seccion in CLIENTES_SECCIONES:
+            yield _clientes_page(seccion).next_url
+
+    def captured_selects(self, site, path):
+        statements = []
+
+        def capture(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                statements.append((sql, params))
+            return execute(sql, params, many, context)
+
+        reset_caches()
+        with connection.execute_wrapper(capture):
+            response = self.client.get(path, HTTP_HOST=site.domain)
+        self.assertEqual(response.status_code, 200, path)
+        return statements
+
+    def test_public_queries_avoid_full_scan_sorts(self):
+        tables = set(connection.introspection.table_names())
+        site = Site.objects.order_by('pk').first()
+        for path in self.paths():
+            for sql, params in self.captured_selects(site, path):
+                plan = query_plan(sql, params)
+                with self.subTest(path=path, sql=sql[:120]):
+                    self.assertEqual(full_scan_sorts(plan, tables), [], '\n'.join([sql, *plan]))
+
+
+class ConditionalGetTests(PublicPagesTestCase):
+    def test_unchanged_pages_answer_304_with_one_query(self):
+        for site, route_name, path in self.routes():
+            if route_name == 'contacto':
+                continue
+            with self.subTest(site=site.domain, route=route_name):
+                response = self.client.get(path, HTTP_HOST=site.domain)
+                self.assertIn('no-cache', response['Cache-Control'])
+
+                # Solo se lee la versión compartida; la vista no se ejecuta.
+                with self.assertNumQueries(1):
+                    not_modified = self.client.get(path, HTTP_HOST=site.domain, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(not_modified.status_code, 304)
+
+                not_modified = self.client.get(
+                    path, HTTP_HOST=site.domain, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+                )
+                self.assertEqual(not_modified.status_code, 304)
+
+    def test_deploy_invalidates_validators_and_cached_pages(self):
+        site = Site.objects.order_by('pk').first()
+        path = reverse('empresa:servicios')
+        self.addCleanup(get_build.cache_clear)
+        with self.settings(EMPRESA_BUILD_ID='antes', EMPRESA_PAGE_CACHE_TIMEOUT=60):
+            get_build.cache_clear()
+            response = self.client.get(path, HTTP_HOST=site.domain)
+            self.assertIn('antes', response['ETag'])
+            cached_key = page_cache_key(RequestFactory().get(path, HTTP_HOST=site.domain), site)
+            self.assertIsNotNone(get_cache().get(cached_key))
+
+        with self.settings(EMPRESA_BUILD_ID='despues', EMPRESA_PAGE_CACHE_TIMEOUT=60):
+            get_build.cache_clear()
+            response = self.client.get(path, HTTP_HOST=site.domain, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(
+                page_cache_key(RequestFactory().get(path, HTTP_HOST=site.domain), site), cached_key,
+            )
+
+    def test_content_change_invalidates_validators(self):
+        site = Site.objects.order_by('pk').first()
+        path = reverse('empresa:home')
+        etag = self.client.get(path, HTTP_HOST=site.domain)['ETag']
+
+        bump_content_version(site.pk)
+        response = self.client.get(path, HTTP_HOST=site.domain, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_versions_bumped_by_other_processes_are_seen(self):
+        # Un worker o `run_jobs` solo comparte la base de datos: sin signals ni caché local.
+        site = Site.objects.order_by('pk').first()
+        path = reverse('empresa:home')
+        etag = self.client.get(path, HTTP_HOST=site.domain)['ETag']
+
+        VersionContenido.objects.filter(clave=f'site:{site.pk}').update(version=F('version') + 1)
+        response = self.client.get(path, HTTP_HOST=site.domain, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_background_jobs_invalidate_validators(self):
+        site = Site.objects.order_by('pk').first()
+        path = reverse('empresa:home')
+        etag = self.client.get(path, HTTP_HOST=site.domain)['ETag']
+
+        servicio = Servicio.objects.exclude(icono='').first()
+        job = {'model': 'Servicio', 'pk': servicio.pk, 'field': 'icono'}
+        with tempfile.TemporaryDirectory() as media, self.settings(MEDIA_ROOT=media):
+            icon = Path(media, servicio.icono.name)
+            icon.parent.mkdir(parents=True)
+            icon.write_text('<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0L10 10"/></svg>')
+            run_task('optimize_svg', job)
+            response = self.client.get(path, HTTP_HOST=site.domain, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+
+            # Una copia ya al día no escribe nada y no invalida las páginas.
+            etag = response['ETag']
+            run_task('optimize_svg', job)
+            response = self.client.get(path, HTTP_HOST=site.domain, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+    def test_media_version_clears_local_manifests(self):
+        site = Site.objects.order_by('pk').first()
+        self.client.get(reverse('empresa:home'), HTTP_HOST=site.domain)
+        images._manifests.set('empresa/hero.jpg', {'webp': [640]})
+
+        bump_media_version()
+        self.client.get(reverse('empresa:home'), HTTP_HOST=site.domain)
+        self.assertIsNone(images._manifests.get('empresa/hero.jpg'))
+
+    def test_contact_form_has_no_validators(self):
+        site = Site.objects.order_by('pk').first()
+        response = self.client.get(reverse('empresa:contacto'), HTTP_HOST=site.domain)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class ExportStaticSiteTests(PublicPagesTestCase):
+    def export(self, output, **options):
+        stdout = StringIO()
+        call_command('export_static_site', output=output, skip_static=True, stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def test_unchanged_sites_are_not_rewritten_by_a_new_process(self):
+        with tempfile.TemporaryDirectory() as output:
+            self.assertIn('escrita', self.export(output))
+
+            # Otro proceso: sin páginas ni fragmentos en caché, con las mismas versiones en
+            # la base de datos. Solo contacto (usa CSRF, nunca se exporta) vuelve a pedirse.
+            get_cache().clear()
+            clear_site_map()
+            with CaptureQueriesContext(connection) as queries:
+                self.assertNotIn('escrita', self.export(output))
+            contenido = [q['sql'] for q in queries.captured_queries if CONTENT_TABLES.search(q['sql'])]
+            self.assertEqual(contenido, [])
+
+            # Versión nueva pero el mismo HTML (cursores incluidos): se renderiza y no se reescribe.
+            bump_content_version()
+            self.assertNotIn('escrita', self.export(output))
+
+    @override_settings(DEBUG=True)
+    def test_debug_stylesheet_link_is_stable(self):
+        site = Site.objects.order_by('pk').first()
+        mtime = int(os.stat(finders.find(settings.TAILWIND_CSS_PATH)).st_mtime)
+        content = self.client.get(reverse('empresa:home'), HTTP_HOST=site.domain).content.decode()
+        self.assertIn(f'?v={mtime}"', content)
+
+
+@override_settings(EMPRESA_CONTACT_RATE_PER_IP=(2, 3600), EMPRESA_CONTACT_RATE_PER_EMAIL=(5, 3600))
+class ContactThrottleTests(PublicPagesTestCase):
+    def post(self, mensaje, email='cliente@example.com'):
+        site = Site.objects.order_by('pk').first()
+        data = {'nombre': 'Cliente', 'email': email, 'asunto': 'Consulta', 'mensaje': mensaje}
+        return self.client.post(reverse('empresa:contacto'), data, HTTP_HOST=site.domain)
+
+    def test_ip_over_the_limit_gets_429(self):
+        self.assertEqual(self.post('Uno').status_code, 302)
+        self.assertEqual(self.post('Dos', email='otro@example.com').status_code, 302)
+        self.assertEqual(self.post('Tres', email='tercero@example.com').status_code, 429)
+        self.assertEqual(Contacto.objects.count(), 2)
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch('empresa.utils.throttle.time') as clock:
+            clock.time.return_value = 1000.0
+            self.assertTrue(consume_token('prueba', 2, 60))
+            self.assertTrue(consume_token('prueba', 2, 60))
+            self.assertFalse(consume_token('prueba', 2, 60))
+
+            # Un token cada 30 s.
+            clock.time.return_value = 1031.0
+            self.assertTrue(consume_token('prueba', 2, 60))
+            self.assertFalse(consume_token('prueba', 2, 60))
+
+    def test_repeated_message_is_stored_once(self):
+        self.assertEqual(self.post('Hola').status_code, 302)
+        self.assertEqual(self.post('  hola ').status_code, 302)
+        self.assertEqual(Contacto.objects.count(), 1)
+
+    def test_failed_submission_can_be_retried(self):
+        with mock.patch('empresa.views.queue_contact_notification', side_effect=RuntimeError('smtp')):
+            with self.assertRaises(RuntimeError):
+                self.post('Hola')
+        self.assertEqual(Contacto.objects.count(), 0)
+
+        # forget_submission borró la marca: el reintento no se toma por duplicado.
+        self.assertEqual(self.post('Hola').status_code, 302)
+        self.assertEqual(Contacto.objects.count(), 1)
+
+    def test_limits_live_in_the_shared_cache(self):
+        self.assertIsNot(get_shared_cache(), get_cache())
+        self.assertTrue(mark_submission('digest'))
+        self.assertFalse(mark_submission('digest'))
+
+
+class JobQueueTests(TestCase):
+    def test_pending_duplicates_are_not_enqueued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue('build_cliente_sprite')
+            enqueue('build_cliente_sprite')
+        self.assertEqual(Tarea.objects.filter(tipo='build_cliente_sprite').count(), 1)
+
+    def test_a_job_is_claimed_once(self):
+        tarea = Tarea.objects.create(tipo='build_cliente_sprite')
+        self.assertEqual([job.pk for job in claim_jobs(5)], [tarea.pk])
+        self.assertEqual(claim_jobs(5), [])
+
+        tarea.refresh_from_db()
+        self.assertEqual((tarea.estado, tarea.intentos), (Tarea.EN_PROCESO, 1))
+
+    def test_expired_locks_are_claimed_again(self):
+        tarea = Tarea.objects.create(
+            tipo='build_cliente_sprite',
+            estado=Tarea.EN_PROCESO,
+            intentos=1,
+            bloqueado_hasta=timezone.now() - timedelta(seconds=1),
+        )
+        self.assertEqual([job.intentos for job in claim_jobs(1)], [2])
+        self.assertEqual(claim_jobs(1), [])
+        self.assertTrue(Tarea.objects.filter(pk=tarea.pk, estado=Tarea.EN_PROCESO).exists())
+
+    def test_future_and_excluded_jobs_are_not_claimed(self):
+        Tarea.objects.create(tipo='optimize_svg', ejecutar_despues=timezone.now() + timedelta(minutes=1))
+        Tarea.objects.create(tipo='build_cliente_sprite')
+        self.assertEqual(claim_jobs(5, exclude_types=['build_cliente_sprite']), [])
+
+    @override_settings(EMPRESA_JOBS_RETRY_DELAY=30)
+    def test_failures_are_retried_with_backoff(self):
+        self.assertEqual(
+            [retry_delay(attempt).total_seconds() for attempt in (1, 2, 3, 20)],
+            [30, 60, 120, 3600],
+        )
+        Tarea.objects.create(tipo='build_cliente_sprite', max_intentos=3)
+        job = claim_jobs(1)[0]
+        before = timezone.now()
+        mark_failed(job, RuntimeError('sin disco'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.estado, Tarea.PENDIENTE)
+        self.assertIn('sin disco', job.ultimo_error)
+        self.assertGreaterEqual(job.ejecutar_despues, before + timedelta(seconds=30))
+        self.assertEqual(claim_jobs(1), [])
+
+    def test_last_attempt_moves_the_job_to_failed(self):
+        Tarea.objects.create(tipo='build_cliente_sprite', intentos=2, max_intentos=3)
+        job = claim_jobs(1)[0]
+        mark_failed(job, RuntimeError('sin disco'))
+
+        job.refresh_from_db()
+        self.assertEqual((job.estado, job.intentos), (Tarea.FALLIDA, 3))
+        self.assertIsNotNone(job.fecha_finalizacion)
+        self.assertEqual(claim_jobs(1), [])
+
+    def test_types_at_their_concurrency_limit_are_saturated(self):
+        # build_cliente_sprite admite 1 a la vez; build_image_derivatives, 2; optimize_svg, sin límite.
+        self.assertEqual(saturated_types({'build_image_derivatives': 1, 'optimize_svg': 9}), [])
+        self.assertEqual(
+            sorted(saturated_types({'build_cliente_sprite': 1, 'build_image_derivatives': 2})),
+            ['build_cliente_sprite', 'build_image_derivatives'],
+        )
+
+    def test_workers_drop_inherited_connections(self):
+        # La base de pruebas está en memoria y Django ignora su close(): se comprueba la llamada.
+        with mock.patch('empresa.management.commands.run_jobs.connections') as connections:
+            _init_process()
+        connections.close_all.assert_called_once_with()
+
+    def test_normalized_logo_bumps_every_site(self):
+        with tempfile.TemporaryDirectory() as media, self.settings(MEDIA_ROOT=media):
+            Path(media, 'clientes').mkdir()
+            Image.new('RGB', (300, 200), 'red').save(Path(media, 'clientes', 'logo.png'))
+            cliente = Cliente.objects.create(nombre='Cliente Logo', logo='clientes/logo.png')
+            before = get_content_version(settings.SITE_ID)
+
+            run_task('normalize_cliente_logo', {'pk': cliente.pk})
+
+        cliente.refresh_from_db()
+        self.assertTrue(cliente.logo.name.endswith('.webp'))
+        self.assertGreater(get_content_version(settings.SITE_ID), before)
+
+
+class NormalizeLogosTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.input = Path(directory.name, 'logos')
+        self.output = Path(directory.name, 'webp')
+        self.input.mkdir()
+
+    def run_command(self):
+        stdout = StringIO()
+        call_command(
+            'normalize_clientes_logos', input=str(self.input), output=str(self.output), height=60,
+            workers=1, stdout=stdout,
+        )
+        return sorted(line.split(' -> ')[0] for line in stdout.getvalue().splitlines() if ' -> ' in line)
+
+    def test_only_new_or_changed_logos_are_processed(self):
+        Image.new('RGB', (200, 100), 'red').save(self.input / 'a.png')
+        Image.new('RGB', (300, 100), 'blue').save(self.input / 'b.png')
+        self.assertEqual(self.run_command(), ['a.png', 'b.png'])
+        self.assertEqual(Image.open(self.output / 'a.webp').size, (120, 60))
+
+        self.assertEqual(self.run_command(), [])
+
+        # Mismo contenido con otra fecha: se compara el hash y no se reprocesa.
+        os.utime(self.input / 'b.png', ns=(0, 0))
+        self.assertEqual(self.run_command(), [])
+
+        Image.new('RGB', (400, 100), 'red').save(self.input / 'a.png')
+        self.assertEqual(self.run_command(), ['a.png'])
+        self.assertEqual(Image.open(self.output / 'a.webp').size, (240, 60))
+
+    def test_outputs_of_removed_logos_are_deleted(self):
+        Image.new('RGB', (200, 100), 'red').save(self.input / 'a.png')
+        Image.new('RGB', (300, 100), 'blue').save(self.input / 'b.png')
+        self.run_command()
+
+        (self.input / 'b.png').unlink()
+        self.assertEqual(self.run_command(), [])
+        self.assertTrue((self.output / 'a.webp').exists())
+        self.assertFalse((self.output / 'b.webp').exists())
+        manifest = json.loads((self.output / '.manifest.json').read_text(encoding='utf-8'))
+        self.assertEqual(sorted(manifest['files']), ['a.png'])
+
+class GenerateContentTests(TestCase):
+    SIZES = dict(clientes=20, proyectos=20, servicios=3, equipo=3, contactos=5, sites=1)
+
+    def generate(self):
+        call_command('generate_content', seed=7, clear=True, stdout=StringIO(), **self.SIZES)
+        return {
+            model: list(model.objects.order_by('pk').values_list(*fields))
+            for model, fields in (
+                (Cliente, ('nombre', 'tipo_cliente', 'logo', 'activo', 'orden')),
+                (Proyecto, ('nombre', 'cliente', 'fecha_inicio', 'fecha_fin')),
+                (Contacto, ('nombre', 'email', 'mensaje')),
+            )
+        }
+
+    def test_same_seed_generates_the_same_rows(self):
+        # La segunda ejecución encuentra la media ya escrita y no debe cambiar las filas.
+        with tempfile.TemporaryDirectory() as media, self.settings(MEDIA_ROOT=media):
+            first = self.generate()
+            second = self.generate()
+        for model, rows in first.items():
+            with self.subTest(model=model.__name__):
+                self.assertTrue(rows)
+                self.assertEqual(second[model], rows)
+
+class OutboxTests(PublicPagesTestCase):
+    def create_notification(self, **kwargs):
+        contacto = Contacto.objects.create(
+            nombre='Cliente', email='cliente@example.com', asunto='Consulta', mensaje='Hola',
+        )
+        return queue_contact_notification(contacto, **kwargs)
+
+    def failing_connection(self, error):
+        connection = mock.Mock()
+        connection.send_messages.side_effect = error
+        return connection
+
+    def test_contact_form_stores_message_and_notification_together(self):
+        site = Site.objects.order_by('pk').first()
+        data = {'nombre': 'Cliente', 'email': 'cliente@example.com', 'asunto': 'Consulta', 'mensaje': 'Hola'}
+        self.client.post(reverse('empresa:contacto'), data, HTTP_HOST=site.domain)
+
+        contacto = Contacto.objects.get()
+        notificacion = contacto.notificaciones.get()
+        self.assertEqual(notificacion.destinatario, Empresa.objects.get(site=site).email_principal)
+        self.assertEqual(notificacion.estado, NotificacionContacto.PENDIENTE)
+        # El email sale después, desde send_notifications.
+        self.assertEqual(mail.outbox, [])
+
+    def test_failed_notification_rolls_back_the_message(self):
+        site = Site.objects.order_by('pk').first()
+        data = {'nombre': 'Cliente', 'email': 'cliente@example.com', 'asunto': 'Consulta', 'mensaje': 'Hola'}
+        with mock.patch.object(NotificacionContacto.objects, 'create', side_effect=DatabaseError('lleno')):
+            with self.assertRaises(DatabaseError):
+                self.client.post(reverse('empresa:contacto'), data, HTTP_HOST=site.domain)
+        self.assertFalse(Contacto.objects.exists())
+
+    def test_a_notification_is_claimed_once(self):
+        notificacion = self.create_notification()
+        self.assertEqual([claimed.pk for claimed in claim_notifications(5)], [notificacion.pk])
+        self.assertEqual(claim_notifications(5), [])
+
+        notificacion.refresh_from_db()
+        self.assertEqual((notificacion.estado, notificacion.intentos), (NotificacionContacto.ENVIANDO, 1))
+
+    def test_send_notifications_delivers_pending_rows(self):
+        notificacion = self.create_notification()
+        call_command('send_notifications', once=True, stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [notificacion.destinatario])
+        self.assertEqual(mail.outbox[0].reply_to, ['cliente@example.com'])
+        notificacion.refresh_from_db()
+        self.assertEqual(notificacion.estado, NotificacionContacto.ENVIADA)
+        self.assertIsNotNone(notificacion.fecha_entrega)
+
+    def test_send_errors_are_retried_later(self):
+        notificacion = self.create_notification()
+        before = timezone.now()
+        sent = deliver(claim_notifications(5), self.failing_connection(smtplib.SMTPDataError(451, 'ocupado')))
+
+        self.assertEqual(sent, 0)
+        notificacion.refresh_from_db()
+        self.assertEqual(notificacion.estado, NotificacionContacto.PENDIENTE)
+        self.assertIn('ocupado', notificacion.ultimo_error)
+        self.assertGreater(notificacion.ejecutar_despues, before)
+        self.assertEqual(claim_notifications(5), [])
+
+    def test_last_attempt_marks_the_notification_failed(self):
+        notificacion = self.create_notification()
+        NotificacionContacto.objects.filter(pk=notificacion.pk).update(intentos=notificacion.max_intentos - 1)
+        deliver(claim_notifications(5), self.failing_connection(smtplib.SMTPDataError(550, 'rechazado')))
+
+        notificacion.refresh_from_db()
+        self.assertEqual(notificacion.estado, NotificacionContacto.FALLIDA)
+        self.assertEqual(notificacion.intentos, notificacion.max_intentos)
+
+    def test_unreachable_server_fails_the_whole_batch(self):
+        first, second = self.create_notification(), self.create_notification()
+        connection = mock.Mock()
+        connection.open.side_effect = ConnectionRefusedError()
+        self.assertEqual(deliver(claim_notifications(5), connection), 0)
+
+        estados = NotificacionContacto.objects.filter(pk__in=[first.pk, second.pk]).values_list('estado', flat=True)
+        self.assertEqual(set(estados), {NotificacionContacto.PENDIENTE})
+        connection.send_messages.assert_not_called()
+
+
+class BenchmarkTests(SimpleTestCase):
+    def test_percentile_uses_the_nearest_rank(self):
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile([1, 2], 25), 1)
+        self.assertEqual(percentile([1, 2], 50), 1)
+        self.assertEqual(percentile([1, 2, 3], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 75), 3)
+        self.assertEqual(percentile(list(range(1, 11)), 95), 10)
+        self.assertEqual(percentile(list(range(1, 101)), 99), 99)
+        self.assertEqual(percentile([1, 2, 3], 100), 3)
+        self.assertEqual(percentile(list(range(1, 101)), 7), 7)
+
+class StaticAssetsTests(SimpleTestCase):
+    def setUp(self):
+        self.static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.static_root.cleanup)
+        self.storage = CompressedManifestStaticFilesStorage(location=self.static_root.name)
+        self.css = b'body { color: red; }\n' * 100
+        Path(self.static_root.name, 'site.css').write_bytes(self.css)
+
+    def get(self, path, accept_encoding=''):
+        request = RequestFactory().get(f'/static/{path}', HTTP_ACCEPT_ENCODING=accept_encoding)
+        with override_settings(STATIC_ROOT=self.static_root.name):
+            return serve_static(request, path)
+
+    def test_compressed_siblings_are_written_once(self):
+        self.assertIn('site.css.gz', self.storage.compress('site.css'))
+        self.assertEqual(gzip.decompress(Path(self.static_root.name, 'site.css.gz').read_bytes()), self.css)
+        self.assertEqual(self.storage.compress('site.css'), [])
+
+    def test_serving_negotiates_encoding_and_caches_hashed_names(self):
+        self.storage.compress('site.css')
+        Path(self.static_root.name, 'site.0123456789ab.css').write_bytes(self.css)
+
+        response = self.get('site.css', 'gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.css)
+        self.assertEqual(response['Cache-Control'], 'public, no-cache')
+
+        response = self.get('site.css', 'gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.get('site.0123456789ab.css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+
+class MediaServingTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.data = bytes(range(256)) * 4
+        Path(media_root.name, 'empresa').mkdir()
+        Path(media_root.name, 'empresa', 'hero.jpg').write_bytes(self.data)
+        Path(media_root.name, '.manifest.json').write_text('{}')
+        override = override_settings(MEDIA_ROOT=media_root.name, EMPRESA_MEDIA_ACCEL=None)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def get(self, path, **headers):
+        return serve_media(RequestFactory().get(f'/media/{path}', **headers), path)
+
+    def test_full_file_with_validators(self):
+        response = self.get('empresa/hero.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('max-age=', response['Cache-Control'])
+
+        self.assertEqual(self.get('empresa/hero.jpg', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_byte_ranges(self):
+        response = self.get('empresa/hero.jpg', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.data)}')
+        self.assertEqual(b''.join(response.streaming_content), self.data[10:20])
+
+        response = self.get('empresa/hero.jpg', HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), self.data[-5:])
+
+        response = self.get('empresa/hero.jpg', HTTP_RANGE=f'bytes={len(self.data)}-')
+        self.assertEqual(response.status_code, 416)
+
+        response = self.get('empresa/hero.jpg', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"otro"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_hidden_and_outside_paths_are_not_served(self):
+        for path in ('.manifest.json', '../etc/passwd', 'empresa', 'empresa/nada.jpg'):
+            with self.subTest(path=path), self.assertRaises(Http404):
+                self.get(path)
+
+    @override_settings(EMPRESA_MEDIA_ACCEL='x-accel-redirect', EMPRESA_MEDIA_ACCEL_PREFIX='/protected-media/')
+    def test_accel_redirect_hands_off_the_transfer(self):
+        response = self.get('empresa/hero.jpg')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/empresa/hero.jpg')
+        self.assertEqual(response.content, b'')
+
+
+@override_settings(EMPRESA_IMAGE_FORMATS=('webp',), EMPRESA_IMAGE_WIDTHS=(320, 640))
+class ImageDerivativeTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        override = override_settings(MEDIA_ROOT=media_root.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(images._manifests.clear)
+        Path(media_root.name, 'proyectos').mkdir()
+        for name, color in (('obra.jpg', 'red'), ('obra.png', 'blue')):
+            Image.new('RGB', (800, 500), color).save(Path(media_root.name, 'proyectos', name))
+
+    def field(self, name):
+        return Proyecto(imagen=f'proyectos/{name}').imagen
+
+    def test_picture_lists_every_derivative(self):
+        manifest, written = images.generate_derivatives(self.field('obra.jpg'))
+        self.assertTrue(written)
+        self.assertEqual(manifest['formats'], {'webp': [320, 640]})
+
+        html = responsive_image(self.field('obra.jpg'), alt='Obra', sizes='50vw')
+        self.assertInHTML(
+            '<picture><source type="image/webp" sizes="50vw" srcset="'
+            '/media/derivatives/proyectos/obra.jpg-320w.webp 320w, '
+            '/media/derivatives/proyectos/obra.jpg-640w.webp 640w">'
+            '<img src="/media/proyectos/obra.jpg" alt="Obra" decoding="async"></picture>',
+            html,
+        )
+
+    def test_sources_with_the_same_stem_keep_their_own_derivatives(self):
+        images.generate_derivatives(self.field('obra.jpg'))
+        images.generate_derivatives(self.field('obra.png'))
+        storage = self.field('obra.jpg').storage
+        for name, channel in (('obra.jpg', 0), ('obra.png', 2)):
+            with self.subTest(name=name):
+                with storage.open(images.derivative_name(f'proyectos/{name}', 320, 'webp')) as derivative:
+                    color = Image.open(derivative).convert('RGB').getpixel((0, 0))
+                self.assertGreater(color[channel], 200)
+
+    def test_current_manifest_skips_encoding(self):
+        images.generate_derivatives(self.field('obra.jpg'))
+        with mock.patch.object(Image.Image, 'save') as save:
+            manifest, written = images.generate_derivatives(self.field('obra.jpg'))
+        save.assert_not_called()
+        self.assertFalse(written)
+        self.assertEqual(manifest['formats'], {'webp': [320, 640]})
+
+class SvgTests(TestCase):
+    def test_arc_flags_survive_rounding(self):
+        self.assertEqual(round_path_data('M10 10a5 5 0 01 10 10', 3), 'M10 10a5 5 0 0 1 10 10')
+        self.assertEqual(round_path_data('A5 5 30 1110.12345 2z', 3), 'A5 5 30 1 1 10.123 2z')
+        self.assertEqual(round_path_data('M0.12345,-0.5L.5.5', 3), 'M.123-.5L.5.5')
+
+        svg = '<svg xmlns="http://www.w3.org/2000/svg"><path d="M2 2a5 5 0 01 10 10"/></svg>'
+        self.assertIn('d="M2 2a5 5 0 0 1 10 10"', optimize_svg(svg))
+
+    def test_render_switches_to_the_minified_copy_without_stat_on_hits(self):
+        with tempfile.TemporaryDirectory() as media, self.settings(MEDIA_ROOT=media):
+            Path(media, 'icons').mkdir()
+            Path(media, 'icons', 'icono.svg').write_text('<svg><path d="M0 0"/></svg>')
+            icono = Servicio(icono='icons/icono.svg').icono
+            self.assertEqual(render_svg(icono, 'w-6'), '<svg class="w-6"><path d="M0 0"/></svg>')
+
+            with mock.patch.object(icono.storage, 'get_modified_time', side_effect=AssertionError('stat')):
+                self.assertEqual(render_svg(icono), '<svg><path d="M0 0"/></svg>')
+
+            # optimize_svg escribe la copia y avanza la versión de media.
+            Path(media, 'icons', 'icono.min.svg').write_text('<svg><path d="M0 0z"/></svg>')
+            bump_media_version()
+            get_request_version(RequestFactory().get('/'), SITE_MAP_KEY, create=False)
+            self.assertEqual(render_svg(icono), '<svg><path d="M0 0z"/></svg>')
+
+
+    def test_minified_copy_is_replaced_in_place(self):
+        with tempfile.TemporaryDirectory() as media, self.settings(MEDIA_ROOT=media):
+            Path(media, 'icons').mkdir()
+            source = Path(media, 'icons', 'icono.svg')
+            source.write_text('<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0L1.23456 1"/></svg>')
+            icono = Servicio(icono='icons/icono.svg').icono
+            self.assertEqual(ensure_minified_svg(icono), ('icons/icono.min.svg', True))
+
+            # Mismo contenido: no se escribe nada (ni se invalidan las páginas).
+            self.assertEqual(ensure_minified_svg(icono, force=True), ('icons/icono.min.svg', False))
+
+            source.write_text('<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0L2 2"/></svg>')
+            with mock.patch.object(icono.storage, 'delete', side_effect=AssertionError('delete')):
+                self.assertEqual(ensure_minified_svg(icono, force=True), ('icons/icono.min.svg', True))
+            self.assertIn('d="M0 0L2 2"', Path(media, 'icons', 'icono.min.svg').read_text())
+
+
+class FontTests(SimpleTestCase):
+    def test_icon_usage_keeps_the_style_of_each_class(self):
+        usage = scan_icon_usage([
+            '<i class="fas fa-check me-2"></i><i class="fab fa-linkedin"></i>',
+            '<i class="far fa-star"></i><i class="fa-solid fa-star"></i>',
+            "icon.classList.add('fa-sun');",
+        ])
+        self.assertEqual(usage, {
+            'fa-check': {'solid'},
+            'fa-linkedin': {'brands'},
+            'fa-star': {'regular', 'solid'},
+            'fa-sun': {'solid'},
+        })
+
+    def test_icon_css_includes_aliases(self):
+        css = '.fa-a::before,\n.fa-b::before {\n  content: "\\f519"; }\n.fa-c:before { content: "\\2b"; }'
+        self.assertEqual(parse_icon_css(css), {'fa-a': 0xf519, 'fa-b': 0xf519, 'fa-c': 0x2b})
+
+    def test_fonts_css_covers_every_icon_used(self):
+        # Falla si se añade un icono a una plantilla sin volver a ejecutar build_fonts.
+        fonts_css = (Path(settings.STATICFILES_DIRS[0]) / 'css' / 'fonts.css').read_text(encoding='utf-8')
+        available = set(parse_icon_css(fonts_css))
+        used = scan_icon_usage(path.read_text(encoding='utf-8') for path in scanned_files())
+        self.assertEqual(set(used) - available - set(UTILITY_CSS), set())
+
+
+    def test_inter_comes_from_google_fonts_until_it_is_subset(self):
+        template = Template('{% load css_tags %}{% text_font_link %}')
+        _text_font_link.cache_clear()
+        self.addCleanup(_text_font_link.cache_clear)
+        self.assertIn('fonts.googleapis.com/css2?family=Inter', template.render(Context()))
+
+        with tempfile.TemporaryDirectory() as static_dir:
+            css_dir = Path(static_dir) / 'css'
+            css_dir.mkdir()
+            (css_dir / 'fonts.css').write_text(
+                "@font-face{font-family:'Inter';font-weight:400;src:url(\"../fonts/inter.woff2\")}",
+                encoding='utf-8',
+            )
+            with override_settings(STATICFILES_DIRS=[static_dir]):
+                # Se resuelve una vez por proceso; un despliegue lo reinicia.
+                self.assertIn('fonts.googleapis.com', template.render(Context()))
+                _text_font_link.cache_clear()
+                self.assertEqual(template.render(Context()), '')
+                with mock.patch('empresa.templatetags.css_tags.finders.find') as find:
+                    self.assertEqual(template.render(Context()), '')
+                find.assert_not_called()
+
+class CriticalCssTests(PublicPagesTestCase):
+    CSS = (
+        '@layer base,utilities;'
+        '@layer utilities{.hero{color:red}.footer-only{color:blue}.btn:hover{color:green}'
+        ':where(.hero,.nunca) h1{margin:0}@media (min-width:48rem){.md\\:py-20{padding:5rem}}}'
+        '.fade{animation:fade 1s}@keyframes fade{to{opacity:1}}@keyframes nunca{to{opacity:0}}'
+        '@property --usada{syntax:"*";inherits:false}@property --nunca{syntax:"*";inherits:false}'
+        '.hero{--usada:1;--sin-leer:2;color:var(--usada)}.bg{background:url(../img/fondo.webp)}'
+        '[data-theme=dark] .hero{color:black}:root:has(.theme-controller:checked){color:gray}'
+        ':root:has(.drawer-toggle){overflow:hidden}.menu-movil{display:grid}.md\\:flex{display:flex}'
+        '::placeholder{opacity:1}::-webkit-datetime-edit{padding:0}.hidden{display:none}'
+    )
+    HTML = (
+        '<body data-theme="light"><nav class="btn"><input class="theme-controller" type="checkbox">'
+        '<div class="hidden md:flex"></div><div class="hidden"><div class="menu-movil"></div></div></nav>'
+        '<section class="hero md:py-20 fade bg"><h1>Hola</h1></section>'
+        '<section class="footer-only"></section>'
+    )
+
+    def test_keeps_only_rules_used_above_the_fold(self):
+        result = critical_css(self.CSS, self.HTML, sections=1, base_url='/static/css/tailwind.css')
+        self.assertIn('@layer base,utilities;', result)
+        self.assertIn('.hero{color:red}', result)
+        self.assertIn(':where(.hero,.nunca) h1{margin:0}', result)
+        self.assertIn('@media (min-width:48rem){.md\\:py-20{padding:5rem}}', result)
+        self.assertIn('@keyframes fade', result)
+        self.assertIn('@property --usada', result)
+        self.assertIn('url(/static/img/fondo.webp)', result)
+        self.assertIn('.md\\:flex{display:flex}', result)
+        self.assertIn('.hidden{display:none}', result)
+        excluded = (
+            'footer-only', ':hover', '@keyframes nunca', '--nunca', '--sin-leer', 'data-theme=dark',
+            ':checked', 'drawer-toggle', 'menu-movil', 'placeholder', 'datetime',
+        )
+        for rule in excluded:
+            self.assertNotIn(rule, result)
+
+    def test_covers_every_document(self):
+        result = critical_css(self.CSS, [self.HTML, '<section><input type="date" placeholder="Fecha"></section>'])
+        self.assertIn('::placeholder{opacity:1}', result)
+        self.assertIn('::-webkit-datetime-edit{padding:0}', result)
+        self.assertIn('.hero{', result)
+
+    def test_stored_critical_css_fits_the_budget(self):
+        # Lo que se incrusta en cada página debe seguir siendo solo la primera pantalla.
+        for path in sorted((Path(settings.BASE_DIR) / 'empresa' / 'critical_css').glob('*.css')):
+            with self.subTest(page=path.stem):
+                self.assertLessEqual(path.stat().st_size, CRITICAL_CSS_BUDGET)
+
+    def test_pages_inline_their_critical_css(self):
+        site = Site.objects.order_by('pk').first()
+        with tempfile.TemporaryDirectory() as critical_dir, override_settings(EMPRESA_CRITICAL_CSS_DIR=critical_dir):
+            Path(critical_dir, 'servicios.css').write_text('.hero{color:red}', encoding='utf-8')
+
+            html = self.client.get(reverse('empresa:servicios'), HTTP_HOST=site.domain).content.decode('utf-8')
+            self.assertIn('<style>.hero{color:red}</style>', html)
+            self.assertRegex(html, r'<link rel="preload" href="[^"]*tailwind[.0-9a-f]*css" as="style"')
+
+            # Sin archivo la hoja completa se carga de forma bloqueante, como antes.
+            html = self.client.get(reverse('empresa:equipo'), HTTP_HOST=site.domain).content.decode('utf-8')
+            self.assertNotIn('<style>.hero', html)
+            self.assertRegex(html, r'<link rel="stylesheet" type="text/css" href="[^"]*tailwind[.0-9a-f]*css')
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class SiteResolverTests(PublicPagesTestCase):
+    def resolve(self, host):
+        return resolve_site(RequestFactory().get('/', HTTP_HOST=host))
+
+    def test_host_is_normalized(self):
+        site = Site.objects.exclude(pk=settings.SITE_ID).first()
+        self.assertEqual(self.resolve(f'WWW.{site.domain}:8000'), site)
+
+    def test_unknown_host_falls_back_to_site_id(self):
+        self.assertEqual(self.resolve('desconocido.example').pk, settings.SITE_ID)
+
+    def test_domain_changes_from_other_processes_are_seen(self):
+        site = Site.objects.exclude(pk=settings.SITE_ID).first()
+        self.assertEqual(self.resolve(site.domain), site)
+
+        # Lo que haría el signal de Site en otro worker: sin tocar la caché local.
+        Site.objects.filter(pk=site.pk).update(domain='nuevo.example')
+        bump_versions([SITE_MAP_KEY])
+        self.assertEqual(self.resolve('nuevo.example').pk, site.pk)
+        self.assertEqual(self.resolve(site.domain).pk, settings.SITE_ID)
+
+
+class SiteSnapshotTests(PublicPagesTestCase):
+    def snapshot(self, site):
+        return get_site_snapshot(RequestFactory().get('/', HTTP_HOST=site.domain))
+
+    def test_snapshot_is_reused_between_requests(self):
+        site = Site.objects.order_by('pk').first()
+        snapshot = self.snapshot(site)
+        self.assertEqual(snapshot.empresa.site_id, site.pk)
+
+        # Solo se leen las versiones; Empresa y ConfiguracionSitio salen del snapshot.
+        with self.assertNumQueries(1):
+            self.assertIs(self.snapshot(site), snapshot)
+
+    def test_saving_empresa_reloads_the_snapshot(self):
+        site = Site.objects.order_by('pk').first()
+        empresa = self.snapshot(site).empresa
+        empresa.nombre = 'Nombre nuevo'
+        empresa.save()
+        self.assertEqual(self.snapshot(site).empresa.nombre, 'Nombre nuevo')
+
+    def test_changes_from_other_processes_reload_the_snapshot(self):
+        # Otro worker guardó: solo cambian las filas, no la caché de este proceso.
+        site = Site.objects.order_by('pk').first()
+        self.snapshot(site)
+        Empresa.objects.filter(site=site).update(nombre='Nombre nuevo')
+        VersionContenido.objects.filter(clave=f'site:{site.pk}').update(version=F('version') + 1)
+        self.assertEqual(self.snapshot(site).empresa.nombre, 'Nombre nuevo')
+
+
+@override_settings(EMPRESA_PAGE_CACHE_TIMEOUT=60)
+class PageCacheTests(PublicPagesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.site = Site.objects.order_by('pk').first()
+        self.renders = 0
+
+    def request(self, method='get'):
+        return getattr(RequestFactory(), method)('/pagina/', HTTP_HOST=self.site.domain)
+
+    def view(self, prepare=None):
+        @cache_public_page
+        def view(request):
+            self.renders += 1
+            response = HttpResponse(f'render {self.renders}')
+            if prepare:
+                prepare(request, response)
+            return response
+        return view
+
+    def test_second_get_is_served_from_the_cache(self):
+        view = self.view()
+        self.assertEqual(view(self.request()).content, b'render 1')
+        self.assertEqual(view(self.request()).content, b'render 1')
+        self.assertEqual(self.renders, 1)
+
+    def test_post_bypasses_the_cache(self):
+        view = self.view()
+        view(self.request())
+        self.assertEqual(view(self.request('post')).content, b'render 2')
+        self.assertEqual(view(self.request('post')).content, b'render 3')
+
+    def test_personal_responses_are_not_stored(self):
+        def with_message(request, response):
+            request._messages = CookieStorage(request)
+            messages.info(request, 'Hola')
+
+        preparations = {
+            'messages': with_message,
+            'cookies': lambda request, response: response.set_cookie('visto', '1'),
+            'csrf': lambda request, response: get_token(request),
+        }
+        for name, prepare in preparations.items():
+            with self.subTest(name):
+                reset_caches()
+                self.renders = 0
+                view = self.view(prepare)
+                view(self.request())
+                self.assertEqual(view(self.request()).content, b'render 2')
+
+    def test_content_version_bump_invalidates_cached_pages(self):
+        path = reverse('empresa:servicios')
+        servicio = Servicio.objects.filter(activo=True).first()
+        self.assertContains(self.client.get(path, HTTP_HOST=self.site.domain), servicio.nombre)
+
+        # update() no emite signals: la página sigue saliendo de la caché.
+        Servicio.objects.filter(pk=servicio.pk).update(nombre='Servicio renombrado')
+        self.assertNotContains(self.client.get(path, HTTP_HOST=self.site.domain), 'Servicio renombrado')
+
+        bump_content_version(self.site.pk)
+        self.assertContains(self.client.get(path, HTTP_HOST=self.site.domain), 'Servicio renombrado')
+
+class FragmentCacheTests(PublicPagesTestCase):
+    TEMPLATE = Template(
+        "{% load fragment_tags %}{% site_fragment 'nav' activo %}{{ activo }}:{{ valor }}{% endsite_fragment %}"
+    )
+
+    def render(self, site, activo, valor):
+        request = RequestFactory().get('/', HTTP_HOST=site.domain)
+        return self.TEMPLATE.render(Context({'request': request, 'activo': activo, 'valor': valor}))
+
+    @override_settings(EMPRESA_FRAGMENT_CACHE_TIMEOUT=60)
+    def test_fragment_is_cached_per_site_item_and_version(self):
+        site, otro_site = Site.objects.order_by('pk')[:2]
+        self.assertEqual(self.render(site, 'home', 1), 'home:1')
+        self.assertEqual(self.render(site, 'home', 2), 'home:1')
+        self.assertEqual(self.render(site, 'equipo', 2), 'equipo:2')
+        self.assertEqual(self.render(otro_site, 'home', 2), 'home:2')
+
+        # Guardar Empresa (o ConfiguracionSitio) avanza la versión del sitio.
+        Empresa.objects.filter(site=site).first().save()
+        self.assertEqual(self.render(site, 'home', 3), 'home:3')
+        self.assertEqual(self.render(otro_site, 'home', 3), 'home:2')
+
+    @override_settings(EMPRESA_FRAGMENT_CACHE_TIMEOUT=60)
+    def test_versions_bumped_by_other_processes_render_again(self):
+        site = Site.objects.order_by('pk').first()
+        self.assertEqual(self.render(site, 'home', 1), 'home:1')
+        VersionContenido.objects.filter(clave=f'site:{site.pk}').update(version=F('version') + 1)
+        self.assertEqual(self.render(site, 'home', 2), 'home:2')
+
+    @override_settings(EMPRESA_FRAGMENT_CACHE_TIMEOUT=0)
+    def test_disabled_cache_always_renders(self):
+        site = Site.objects.order_by('pk').first()
+        self.render(site, 'home', 1)
+        self.assertEqual(self.render(site, 'home', 2), 'home:2')
+
+
+class ClienteTests(PublicPagesTestCase):
+    def test_puntos_importantes_are_parsed_on_save(self):
+        cliente = Cliente.objects.create(nombre='Cliente', puntos_importantes='Uno\r\n\n  Dos  ')
+        self.assertEqual(cliente.puntos_importantes_list, ['Uno', 'Dos'])
+
+        cliente.puntos_importantes = 'Tres'
+        cliente.save(update_fields=['puntos_importantes'])
+        cliente.refresh_from_db()
+        self.assertEqual(cliente.lista_puntos_importantes, ['Tres'])
+
+    def test_featured_or_all_falls_back_to_every_client(self):
+        destacados = list(Cliente.objects.published().featured_or_all())
+        self.assertTrue(destacados)
+        self.assertTrue(all(cliente.destacado for cliente in destacados))
+
+        Cliente.objects.update(destacado=False)
+        with self.assertNumQueries(1):
+            clientes = list(Cliente.objects.published().featured_or_all())
+        self.assertEqual(clientes, list(Cliente.objects.published()))
+
+    @override_settings(EMPRESA_CLIENTES_PAGE_SIZE=3)
+    def test_single_query_sections_match_per_section_pages(self):
+        with self.assertNumQueries(1):
+            secciones = _clientes_primeras_paginas()
+
+        for seccion in CLIENTES_SECCIONES:
+            with self.subTest(seccion=seccion):
+                esperado = _clientes_page(seccion)
+                self.assertEqual([cliente.pk for cliente in secciones[seccion]], [cliente.pk for cliente in esperado])
+                self.assertEqual(secciones[seccion].next_url, esperado.next_url)
+
+    def test_sprite_logo_has_its_own_box(self):
+        cliente = Cliente.objects.exclude(logo='').first()
+        sprite_map = {
+            'image': 'sprites/clientes.png', 'width': 200, 'height': 60,
+            'logos': {str(cliente.pk): {'logo': cliente.logo.name, 'x': 100, 'y': 0, 'width': 100, 'height': 60}},
+        }
+        with mock.patch('empresa.templatetags.image_tags.get_sprite_map', return_value=sprite_map):
+            html = cliente_logo(cliente)
+        # La hoja compilada no lleva reglas de .logo-sprite: sin esto el span mediría 0x0.
+        self.assertIn('display:inline-block;', html)
+        self.assertIn('aspect-ratio:100/60', html)
+        self.assertIn('background-position:100% 0%', html)
+
+
+class KeysetPaginationTests(PublicPagesTestCase):
+    def walk(self, queryset, ordering, per_page):
+        pages, cursor = [], None
+        while True:
+            page = paginate_keyset(queryset, ordering, cursor, per_page)
+            pages.append([item.pk for item in page])
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once(self):
+        queryset = Cliente.objects.published()
+        pages = self.walk(queryset, CLIENTES_ORDERING, 2)
+        self.assertTrue(len(pages) > 1)
+        self.assertTrue(all(len(page) == 2 for page in pages[:-1]))
+        self.assertEqual(sum(pages, []), [cliente.pk for cliente in queryset.order_by(*CLIENTES_ORDERING)])
+
+    def test_keyset_page_uses_the_extra_row_only_as_a_signal(self):
+        clientes = list(Cliente.objects.published().order_by(*CLIENTES_ORDERING)[:3])
+        page = keyset_page(clientes, CLIENTES_ORDERING, 2)
+        self.assertEqual(page.items, clientes[:2])
+        self.assertEqual(decode_cursor(page.next_cursor, Cliente, CLIENTES_ORDERING)[-1], clientes[1].pk)
+
+        self.assertFalse(keyset_page(clientes[:2], CLIENTES_ORDERING, 2).has_next)
+
+    def test_cursor_is_stable(self):
+        cliente = Cliente.objects.published().first()
+        self.assertEqual(encode_cursor(cliente, CLIENTES_ORDERING), encode_cursor(cliente, CLIENTES_ORDERING))
+
+    def test_tampered_or_foreign_cursors_are_rejected(self):
+        cliente = Cliente.objects.published().first()
+        cursor = encode_cursor(cliente, CLIENTES_ORDERING)
+        otro_orden = signing.Signer(salt='empresa.pagination').sign_object([1, 2])
+        for invalid in (cursor[:-1] + ('A' if cursor[-1] != 'A' else 'B'), 'x' + cursor, 'basura', otro_orden):
+            with self.subTest(cursor=invalid), self.assertRaises(InvalidCursor):
+                paginate_keyset(Cliente.objects.all(), CLIENTES_ORDERING, invalid)
+
+    @override_settings(EMPRESA_PROYECTOS_PAGE_SIZE=1, EMPRESA_CLIENTES_PAGE_SIZE=1)
+    def test_load_more_endpoints(self):
+        site = Site.objects.order_by('pk').first()
+        proyectos = _proyectos_page()
+        response = self.client.get(proyectos.next_url, HTTP_HOST=site.domain)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.client.get(proyectos.next_url, HTTP_HOST=site.domain).content)
+
+        clientes = _clientes_page('directos')
+        self.assertEqual(self.client.get(clientes.next_url, HTTP_HOST=site.domain).status_code, 200)
+
+        for path in (
+            reverse('empresa:proyectos_mas') + '?cursor=basura',
+            reverse('empresa:clientes_mas') + '?seccion=directos&cursor=basura',
+            reverse('empresa:clientes_mas') + '?seccion=otra',
+        ):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path, HTTP_HOST=site.domain).status_code, 404)
+
+
+class RenderTimeTests(PublicPagesTestCase):
+    """
+    Compara el tiempo de render de cada vista con ``perf_baseline.json``.
+
+    ``EMPRESA_UPDATE_PERF_BASELINE=1 python manage.py test empresa`` regenera la línea base.
+    """
+
+    def measure(self, site, path):
+        self.client.get(path, HTTP_HOST=site.domain)
+        timings = []
+        for _ in range(PERF_RUNS):
+            start = time.perf_counter()
+            response = self.client.get(path, HTTP_HOST=site.domain)
+            timings.append((time.perf_counter() - start) * 1000)
+            self.assertEqual(response.status_code, 200)
+        return statistics.median(timings)
+
+    def test_render_time_within_baseline(self):
+        timings = {
+            f'{site.domain} {route_name}': round(self.measure(site, path), 2)
+            for site, route_name, path in self.routes()
+        }
+
+        if os.environ.get('EMPRESA_UPDATE_PERF_BASELINE'):
+            PERF_BASELINE.write_text(json.dumps(timings, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+            self.skipTest(f'Línea base actualizada en {PERF_BASELINE.name}.')
+
+        try:
+            baseline = json.loads(PERF_BASELINE.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            self.skipTest(f'Sin línea base ({PERF_BASELINE.name}).')
+
+        for key, elapsed in timings.items():
+            if key not in baseline:
+                continue
+            with self.subTest(page=key):
+                limit = baseline[key] * PERF_TOLERANCE + PERF_SLACK_MS
+                self.assertLessEqual(elapsed, limit, f'{key}: {elapsed:.1f} ms (línea base {baseline[key]:.1f} ms)')
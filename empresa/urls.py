@@ -13,5 +13,13 @@ urlpatterns = [
     path('sobre-nosotros/', views.sobre_nosotros, name='sobre_nosotros'),
 ]
 
+# Fragmentos HTML de los listados paginados ("Cargar más"); no son páginas públicas.
+fragment_urlpatterns = [
+    path('proyectos/mas/', views.proyectos_mas, name='proyectos_mas'),
+    path('clientes/mas/', views.clientes_mas, name='clientes_mas'),
+]
+
+urlpatterns += fragment_urlpatterns
+
 
 
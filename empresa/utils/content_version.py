@@ -0,0 +1,129 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import caches
+from django.db.models import BigIntegerField, F, Value
+from django.db.models.functions import Greatest
+
+from ..models import VersionContenido
+
+_REQUEST_ATTR = '_empresa_content_versions'
+
+# Versión del mapa dominio -> Site de site_resolver.
+SITE_MAP_KEY = 'sites'
+# Versión de los archivos generados por `run_jobs` (derivadas, sprite, SVG minificados).
+MEDIA_KEY = 'media'
+
+# Cachés locales de cada proceso que se vacían cuando cambia una versión.
+_local_caches: Dict[str, List[Callable[[], None]]] = {}
+_seen_versions: Dict[str, int] = {}
+_seen_lock = threading.Lock()
+
+
+def get_cache():
+    # Solo guarda contenido indexado por versión (páginas, fragmentos), así que
+    # un backend local por proceso nunca sirve algo obsoleto.
+    return caches[getattr(settings, 'EMPRESA_CACHE_ALIAS', 'default')]
+
+
+def get_shared_cache():
+    # Estado que todos los workers deben ver igual (límites del formulario de contacto).
+    return caches[getattr(settings, 'EMPRESA_SHARED_CACHE_ALIAS', 'default')]
+
+
+def _version_key(site_id: int) -> str:
+    return f'site:{site_id}'
+
+
+def _new_version(previous: int = 0) -> int:
+    # Sellos en microsegundos: una versión nueva nunca coincide con una ya usada
+    # para cachear páginas, aunque se borre la fila.
+    return max(previous + 1, time.time_ns() // 1000)
+
+
+def get_version(key: str) -> int:
+    """Return the stored version for ``key``, creating it on first use."""
+    version = VersionContenido.objects.filter(clave=key).values_list('version', flat=True).first()
+    if version is None:
+        version = VersionContenido.objects.get_or_create(clave=key, defaults={'version': _new_version()})[0].version
+    return version
+
+
+def get_content_version(site_id: Optional[int]) -> int:
+    """Return the current content version of ``site_id``."""
+    if site_id is None:
+        return 0
+    return get_version(_version_key(site_id))
+
+
+def register_local_cache(key: str, clear: Callable[[], None]) -> None:
+    """Call ``clear`` in each process the first time a request sees a new version of ``key``."""
+    _local_caches.setdefault(key, []).append(clear)
+
+
+def _sync_local_caches(versions: Dict[str, int]) -> None:
+    with _seen_lock:
+        for key, callbacks in _local_caches.items():
+            version = versions.get(key, 0)
+            if _seen_versions.get(key, 0) != version:
+                _seen_versions[key] = version
+                for clear in callbacks:
+                    clear()
+
+
+def get_request_version(request, key: str, create: bool = True) -> int:
+    """
+    Return the version for ``key`` as seen by ``request``.
+
+    Every version is read in one query the first time a request needs one, so a
+    request sees a consistent set and pays for the database at most once. With
+    ``create=False`` a key that was never bumped reads as 0 instead of being stored.
+    """
+    versions: Optional[Dict[str, int]] = getattr(request, _REQUEST_ATTR, None)
+    if versions is None:
+        versions = dict(VersionContenido.objects.values_list('clave', 'version'))
+        setattr(request, _REQUEST_ATTR, versions)
+        _sync_local_caches(versions)
+    if key not in versions:
+        versions[key] = get_version(key) if create else 0
+    return versions[key]
+
+
+def get_request_content_version(request, site) -> int:
+    """Return the content version of ``site``, memoized on the request."""
+    return get_request_version(request, _version_key(site.pk)) if site else 0
+
+
+def bump_versions(keys: Iterable[str]) -> None:
+    """Advance the versions stored under ``keys``; the change is visible to every process."""
+    keys = list(keys)
+    if not keys:
+        return
+    now = _new_version()
+    VersionContenido.objects.filter(clave__in=keys).update(
+        version=Greatest(F('version') + 1, Value(now, output_field=BigIntegerField())),
+    )
+    existing = set(VersionContenido.objects.filter(clave__in=keys).values_list('clave', flat=True))
+    VersionContenido.objects.bulk_create(
+        [VersionContenido(clave=key, version=now) for key in keys if key not in existing],
+        ignore_conflicts=True,
+    )
+
+
+def bump_content_version(site_id: Optional[int] = None) -> None:
+    """Advance the content version of ``site_id`` (or of every site when omitted)."""
+    site_ids = [site_id] if site_id is not None else Site.objects.values_list('pk', flat=True)
+    bump_versions(_version_key(pk) for pk in site_ids)
+
+
+def bump_media_version() -> None:
+    """
+    Advance the media version and every site's content version.
+
+    For tasks that rewrite generated files under unchanged names: other processes
+    drop their cached manifests and pages render again with the new files.
+    """
+    bump_versions([MEDIA_KEY, *(_version_key(pk) for pk in Site.objects.values_list('pk', flat=True))])
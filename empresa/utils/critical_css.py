@@ -0,0 +1,538 @@
+"""
+Critical CSS: the stylesheet rules a page needs to paint its first screen.
+
+``critical_css`` keeps the rules of the compiled Tailwind/DaisyUI stylesheet whose
+selectors can match the markup above the fold (everything up to the end of the first
+``sections`` ``<section>`` elements: the navigation, the page header and usually the
+start of the content). Subtrees hidden on every screen size (``hidden`` without a
+responsive display class, or the ``hidden`` attribute) don't count. Classes, ids,
+tags, attribute selectors and the arguments of ``:is()``/``:where()``/``:has()`` are
+checked against what the fold contains, without relating them to one element, so the
+match stays generous; ``:not()`` is ignored. States (hover, focus, checked...) are left
+to the full stylesheet, which loads right after, and custom properties, ``@property``
+and ``@keyframes`` are kept only when the selected rules use them.
+
+``load_critical_css`` reads the per-page files written by ``manage.py
+build_critical_css`` for the ``page_styles`` template tag.
+"""
+
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+from urllib.parse import urljoin
+
+from django.conf import settings
+
+from .cache import LRUCache
+
+GROUPING_AT_RULES = {'media', 'supports', 'layer', 'container'}
+# Reglas que solo cuentan si el CSS conservado las referencia.
+DEFERRED_AT_RULES = {'property', 'keyframes', '-webkit-keyframes'}
+SELECTOR_LIST_PSEUDO_CLASSES = {'is', 'where', 'matches', '-webkit-any', 'has'}
+STATE_PSEUDO_CLASSES = {
+    'hover', 'focus', 'focus-visible', 'focus-within', 'active', 'visited', 'checked', 'target',
+    'invalid', 'user-invalid', '-moz-ui-invalid', '-moz-focusring',
+}
+# Pseudo-elementos de controles de formulario: solo cuentan si la zona visible tiene
+# un control que los genere (atributo y valores admitidos; None acepta cualquiera).
+CONTROL_PSEUDO_ELEMENTS = {
+    'placeholder': ('placeholder', None),
+    'file-selector-button': ('type', {'file'}),
+    '-webkit-search': ('type', {'search'}),
+    '-webkit-inner-spin-button': ('type', {'number'}),
+    '-webkit-outer-spin-button': ('type', {'number'}),
+    '-webkit-date': ('type', {'date', 'datetime-local', 'month', 'week', 'time'}),
+    '-webkit-calendar-picker-indicator': ('type', {'date', 'datetime-local', 'month', 'week', 'time'}),
+}
+# Pseudoclases que equivalen a un atributo del elemento.
+ATTRIBUTE_PSEUDO_CLASSES = {'disabled': 'disabled', 'required': 'required', 'read-only': 'readonly'}
+# Clases con variante responsive que vuelven a mostrar un elemento con "hidden".
+DISPLAY_UTILITIES = {
+    'block', 'inline', 'inline-block', 'flex', 'inline-flex', 'grid', 'inline-grid',
+    'table', 'flow-root', 'contents', 'list-item',
+}
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+}
+
+HEX_ESCAPE = re.compile(r'([0-9a-fA-F]{1,6})\s?')
+VAR_REFERENCE = re.compile(r'var\(\s*(--[\w-]+)')
+ATTRIBUTE_SELECTOR = re.compile(
+    r'''\[\s*([^\s~|^$*=\]]+)\s*(?:([~|^$*]?=)\s*(?:"([^"]*)"|'([^']*)'|([^\s\]]+))\s*([iIsS])?\s*)?\]'''
+)
+ANIMATION_VALUE = re.compile(r'animation(?:-name)?\s*:([^;}]*)')
+CSS_IDENT = re.compile(r'-?[_a-zA-Z][\w-]*')
+CSS_URL = re.compile(r'''url\(\s*(["']?)([^"')]+)\1\s*\)''')
+
+Node = Tuple[str, Optional[str]]
+
+_critical_cache = LRUCache(maxsize=32)
+
+
+class Fold:
+    """Classes, ids, tags and attribute values used above the fold of one or more pages."""
+
+    def __init__(self):
+        self.classes, self.ids, self.tags = set(), set(), set()
+        self.attributes: Dict[str, Set[str]] = {}
+
+    def has_attribute(self, name: str, operator: Optional[str] = None, value: str = '', ignore_case=False) -> bool:
+        values = self.attributes.get(name.lower())
+        if values is None:
+            return False
+        if not operator:
+            return True
+        if ignore_case:
+            value = value.lower()
+            values = {actual.lower() for actual in values}
+        return any(_attribute_value_matches(operator, actual, value) for actual in values)
+
+
+def _attribute_value_matches(operator: str, actual: str, value: str) -> bool:
+    if operator == '=':
+        return actual == value
+    if operator == '~=':
+        return value in actual.split()
+    if operator == '|=':
+        return actual == value or actual.startswith(value + '-')
+    if not value:
+        return False
+    if operator == '^=':
+        return actual.startswith(value)
+    if operator == '$=':
+        return actual.endswith(value)
+    return value in actual
+
+
+def _is_hidden(attrs: Dict[str, Optional[str]]) -> bool:
+    if 'hidden' in attrs:
+        return True
+    classes = (attrs.get('class') or '').split()
+    return 'hidden' in classes and not any(
+        name.rpartition(':')[2] in DISPLAY_UTILITIES for name in classes if ':' in name
+    )
+
+
+class _FoldScanner(HTMLParser):
+    """Fills a :class:`Fold` with the markup before the end of the Nth ``<section>``."""
+
+    def __init__(self, sections: int, fold: Fold):
+        super().__init__(convert_charrefs=True)
+        self.sections = sections
+        self.fold = fold
+        self._section_depth = 0
+        self._sections_seen = 0
+        # Elemento oculto abierto y cuántos del mismo tipo hay anidados dentro.
+        self._hidden_tag = None
+        self._hidden_depth = 0
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._hidden_tag:
+            if tag == self._hidden_tag:
+                self._hidden_depth += 1
+            return
+        attrs = dict(attrs)
+        # El elemento oculto sí cuenta: sin la regla que lo oculta se vería hasta
+        # que cargue la hoja completa. Su contenido no.
+        self.fold.tags.add(tag)
+        for name, value in attrs.items():
+            self.fold.attributes.setdefault(name, set()).add(value or '')
+            if name == 'class' and value:
+                self.fold.classes.update(value.split())
+            elif name == 'id' and value:
+                self.fold.ids.add(value)
+        if _is_hidden(attrs):
+            if tag not in VOID_ELEMENTS:
+                self._hidden_tag, self._hidden_depth = tag, 1
+        elif tag == 'section':
+            self._section_depth += 1
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if self._hidden_tag:
+            if tag == self._hidden_tag:
+                self._hidden_depth -= 1
+                if not self._hidden_depth:
+                    self._hidden_tag = None
+            return
+        if tag != 'section' or not self._section_depth:
+            return
+        self._section_depth -= 1
+        if self._section_depth == 0:
+            self._sections_seen += 1
+            self.done = self._sections_seen >= self.sections
+
+
+def scan_fold(documents: Iterable[str], sections: int = 2) -> Fold:
+    """Collect what the first ``sections`` sections of every HTML document use."""
+    fold = Fold()
+    for html in documents:
+        scanner = _FoldScanner(sections, fold)
+        scanner.feed(html)
+        scanner.close()
+    return fold
+
+
+def _skip_string(text: str, i: int) -> int:
+    quote = text[i]
+    i += 1
+    while i < len(text):
+        if text[i] == '\\':
+            i += 2
+            continue
+        if text[i] == quote:
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_block(text: str, i: int, opening: str, closing: str) -> int:
+    """Index just after the ``closing`` that balances the ``opening`` at ``text[i]``."""
+    depth = 0
+    while i < len(text):
+        char = text[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char in '"\'':
+            i = _skip_string(text, i)
+            continue
+        if text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = len(text) if end == -1 else end + 2
+            continue
+        if char == opening:
+            depth += 1
+        elif char == closing:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def parse_css(css: str) -> List[Node]:
+    """Split ``css`` into top-level ``(prelude, body)`` pairs; ``body`` is None for ``@x ...;``."""
+    nodes: List[Node] = []
+    i = start = 0
+    while i < len(css):
+        char = css[i]
+        if css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            end = len(css) if end == -1 else end + 2
+            if not css[start:i].strip():
+                start = end
+            i = end
+        elif char == '\\':
+            i += 2
+        elif char in '"\'':
+            i = _skip_string(css, i)
+        elif char == ';':
+            prelude = css[start:i].strip()
+            if prelude:
+                nodes.append((prelude, None))
+            i = start = i + 1
+        elif char == '{':
+            end = _skip_block(css, i, '{', '}')
+            nodes.append((css[start:i].strip(), css[i + 1:end - 1]))
+            i = start = end
+        elif char == '}':
+            i = start = i + 1
+        else:
+            i += 1
+    return nodes
+
+
+def split_selectors(prelude: str) -> List[str]:
+    selectors = []
+    depth = start = i = 0
+    while i < len(prelude):
+        char = prelude[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char in '"\'':
+            i = _skip_string(prelude, i)
+            continue
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+        i += 1
+    selectors.append(prelude[start:].strip())
+    return [selector for selector in selectors if selector]
+
+
+def _read_ident(text: str, i: int) -> Tuple[str, int]:
+    chars = []
+    while i < len(text):
+        char = text[i]
+        if char == '\\':
+            escape = HEX_ESCAPE.match(text, i + 1)
+            if escape:
+                chars.append(chr(int(escape.group(1), 16)))
+                i = escape.end()
+            else:
+                chars.append(text[i + 1:i + 2])
+                i += 2
+        elif char.isalnum() or char in '-_' or ord(char) > 127:
+            chars.append(char)
+            i += 1
+        else:
+            break
+    return ''.join(chars), i
+
+
+class Requirements(NamedTuple):
+    classes: Set[str]
+    ids: Set[str]
+    tags: Set[str]
+    # (nombre, operador, valor, sin mayúsculas) de cada [atributo].
+    attributes: List[Tuple[str, Optional[str], str, bool]]
+    pseudos: Set[str]
+    # Listas de selectores de :is()/:where()/:has(); de cada una debe cumplirse alguno.
+    alternatives: List[List[str]]
+
+
+def selector_requirements(selector: str) -> Requirements:
+    """
+    What the fold must contain for ``selector`` to match somewhere in it.
+
+    The arguments of ``:not()`` are ignored; those of ``:has()`` count like the ones of
+    ``:is()``, since the element they describe has to be in the page as well.
+    """
+    requirements = Requirements(set(), set(), set(), [], set(), [])
+    i = 0
+    while i < len(selector):
+        char = selector[i]
+        if char == '.':
+            name, i = _read_ident(selector, i + 1)
+            requirements.classes.add(name)
+        elif char == '#':
+            name, i = _read_ident(selector, i + 1)
+            requirements.ids.add(name)
+        elif char == '[':
+            attribute = ATTRIBUTE_SELECTOR.match(selector, i)
+            if attribute:
+                name, operator, double, single, bare, flag = attribute.groups()
+                value = next((part for part in (double, single, bare) if part is not None), '')
+                requirements.attributes.append((name, operator, value, (flag or '').lower() == 'i'))
+            i = _skip_block(selector, i, '[', ']')
+        elif char == ':':
+            i += 2 if selector.startswith('::', i) else 1
+            name, i = _read_ident(selector, i)
+            name = name.lower()
+            requirements.pseudos.add(name)
+            if selector.startswith('(', i):
+                end = _skip_block(selector, i, '(', ')')
+                if name in SELECTOR_LIST_PSEUDO_CLASSES:
+                    requirements.alternatives.append(split_selectors(selector[i + 1:end - 1]))
+                i = end
+        elif char.isalpha() or char == '\\':
+            name, i = _read_ident(selector, i)
+            requirements.tags.add(name.lower())
+        else:
+            i += 1
+    return requirements
+
+
+def _control_exists(pseudo: str, fold: Fold) -> bool:
+    for prefix, (attribute, values) in CONTROL_PSEUDO_ELEMENTS.items():
+        if pseudo.startswith(prefix):
+            if values is None:
+                return fold.has_attribute(attribute)
+            return any(fold.has_attribute(attribute, '=', value, ignore_case=True) for value in values)
+    return True
+
+
+def _matches(selector: str, fold: Fold) -> bool:
+    requirements = selector_requirements(selector)
+    return (
+        not requirements.pseudos & STATE_PSEUDO_CLASSES
+        and requirements.classes <= fold.classes
+        and requirements.ids <= fold.ids
+        and requirements.tags <= fold.tags
+        and all(fold.has_attribute(*attribute) for attribute in requirements.attributes)
+        and all(_control_exists(pseudo, fold) for pseudo in requirements.pseudos)
+        and all(
+            fold.has_attribute(ATTRIBUTE_PSEUDO_CLASSES[pseudo])
+            for pseudo in requirements.pseudos & ATTRIBUTE_PSEUDO_CLASSES.keys()
+        )
+        and all(
+            any(_matches(option, fold) for option in options) for options in requirements.alternatives
+        )
+    )
+
+
+def _filter(nodes: List[Node], fold: Fold, keep_deferred: Callable[[str, str], bool]) -> List[str]:
+    kept = []
+    for prelude, body in nodes:
+        if not prelude.startswith('@'):
+            selectors = [selector for selector in split_selectors(prelude) if _matches(selector, fold)]
+            if selectors:
+                kept.append(','.join(selectors) + '{' + body + '}')
+            continue
+
+        name = CSS_IDENT.match(prelude, 1)
+        name = name.group(0).lower() if name else ''
+        if body is None:
+            # @layer a, b; fija el orden de las capas; @import y @charset se conservan igual.
+            kept.append(prelude + ';')
+        elif name in GROUPING_AT_RULES:
+            inner = _filter(parse_css(body), fold, keep_deferred)
+            if inner:
+                kept.append(prelude + '{' + ''.join(inner) + '}')
+        elif name == 'font-face' or (name in DEFERRED_AT_RULES and keep_deferred(name, prelude)):
+            kept.append(prelude + '{' + body + '}')
+    return kept
+
+
+def _custom_declarations(css: str):
+    """``(start, end, name, value)`` of every ``--name: value`` declaration in ``css``."""
+    declarations = []
+    i = 0
+    while i < len(css):
+        char = css[i]
+        if char in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if char not in '{;':
+            i += 1
+            continue
+        start = i + 1
+        while start < len(css) and css[start].isspace():
+            start += 1
+        if not css.startswith('--', start):
+            i += 1
+            continue
+        colon = css.find(':', start)
+        # El valor termina en el primer ; o } fuera de paréntesis y comillas.
+        end = colon + 1
+        depth = 0
+        while end < len(css) and not (css[end] in ';}' and depth == 0):
+            if css[end] in '"\'':
+                end = _skip_string(css, end)
+                continue
+            if css[end] in '([{':
+                depth += 1
+            elif css[end] in ')]}':
+                depth -= 1
+            end += 1
+        declarations.append((start, end, css[start:colon].strip(), css[colon + 1:end]))
+        i = end
+    return declarations
+
+
+def _used_properties(css: str, declarations) -> Set[str]:
+    """Custom properties read through ``var()``, following the ones other properties read."""
+    rest, last = [], 0
+    values: Dict[str, List[str]] = {}
+    for start, end, name, value in declarations:
+        rest.append(css[last:start])
+        last = end
+        values.setdefault(name, []).append(value)
+    rest.append(css[last:])
+
+    used = set(VAR_REFERENCE.findall(''.join(rest)))
+    pending = list(used)
+    while pending:
+        for value in values.get(pending.pop(), ()):
+            for name in VAR_REFERENCE.findall(value):
+                if name not in used:
+                    used.add(name)
+                    pending.append(name)
+    return used
+
+
+EMPTY_BLOCK = re.compile(r'(?<=[{};])[^{};]*\{\s*\}|^[^{};]*\{\s*\}')
+
+
+def _drop_unused_properties(css: str, declarations, used: Set[str]) -> str:
+    parts, last = [], 0
+    for start, end, name, value in declarations:
+        if name in used:
+            continue
+        parts.append(css[last:start])
+        # También el ; que cierra la declaración.
+        last = end + 1 if css.startswith(';', end) else end
+    parts.append(css[last:])
+    css = ''.join(parts).replace(';}', '}')
+    # Reglas (y bloques @layer/@media) que se quedaron vacíos.
+    previous = None
+    while previous != css:
+        previous, css = css, EMPTY_BLOCK.sub('', css)
+    return css
+
+
+def critical_css(
+    css: str, html: Union[str, Iterable[str]], sections: int = 2, base_url: Optional[str] = None,
+) -> str:
+    """
+    Return the rules of ``css`` needed by the first ``sections`` sections of ``html``.
+
+    ``html`` may be several documents (the same page on every site); the result covers
+    all of them. Custom property declarations, ``@property`` and ``@keyframes`` are kept
+    only when the selected rules use them. Relative ``url()`` references are resolved
+    against ``base_url`` (the stylesheet's URL) because the result is inlined into pages
+    at other paths.
+    """
+    fold = scan_fold([html] if isinstance(html, str) else html, sections)
+
+    nodes = parse_css(css)
+    selected = ''.join(_filter(nodes, fold, lambda name, prelude: False))
+    properties = _used_properties(selected, _custom_declarations(selected))
+    animations = {
+        ident for value in ANIMATION_VALUE.findall(selected) for ident in CSS_IDENT.findall(value)
+    }
+
+    def keep_deferred(name, prelude):
+        target = prelude.split(None, 1)[1].strip() if ' ' in prelude else ''
+        return target in (properties if name == 'property' else animations)
+
+    result = ''.join(_filter(nodes, fold, keep_deferred))
+    declarations = _custom_declarations(result)
+    result = _drop_unused_properties(result, declarations, _used_properties(result, declarations))
+    if base_url:
+        result = CSS_URL.sub(lambda match: _absolute_url(match, base_url), result)
+    return result
+
+
+def _absolute_url(match, base_url: str) -> str:
+    quote, url = match.groups()
+    if url.startswith(('data:', '#', '/')) or '://' in url:
+        return match.group(0)
+    return f'url({quote}{urljoin(base_url, url)}{quote})'
+
+
+def critical_css_dir() -> Path:
+    return Path(getattr(settings, 'EMPRESA_CRITICAL_CSS_DIR', Path(settings.BASE_DIR) / 'empresa' / 'critical_css'))
+
+
+def critical_css_path(page: str) -> Path:
+    return critical_css_dir() / f'{page}.css'
+
+
+def load_critical_css(page: str) -> Optional[str]:
+    """Critical CSS stored for ``page`` (an ``empresa`` URL name), cached until the file changes."""
+    path = critical_css_path(page)
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        return None
+
+    css = _critical_cache.get(key)
+    if css is None:
+        try:
+            css = path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+        _critical_cache.set(key, css)
+    return css or None
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Union
+
+from django.core.files.base import ContentFile
+
+PathLike = Union[str, Path]
+
+
+def atomic_write(path: PathLike, data: bytes) -> None:
+    """Write ``data`` to ``path`` through a temporary file and an atomic rename."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def storage_replace(storage, name: str, data: bytes) -> str:
+    """
+    Store ``data`` under exactly ``name``, replacing any previous file.
+
+    Local storages get an atomic rename, so readers never see the name missing and a
+    concurrent writer cannot push the file to a suffixed name. Storages without local
+    paths fall back to delete and save.
+    """
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        if storage.exists(name):
+            storage.delete(name)
+        return storage.save(name, ContentFile(data))
+    atomic_write(path, data)
+    return name
+
+
+def atomic_copy(source: PathLike, destination: PathLike) -> bool:
+    """
+    Copy ``source`` to ``destination`` atomically unless it already has the same size and mtime.
+
+    Returns ``True`` when the file was copied.
+    """
+    source, destination = Path(source), Path(destination)
+    source_stat = source.stat()
+    try:
+        destination_stat = destination.stat()
+    except FileNotFoundError:
+        destination_stat = None
+    if (
+        destination_stat is not None
+        and destination_stat.st_size == source_stat.st_size
+        and int(destination_stat.st_mtime) == int(source_stat.st_mtime)
+    ):
+        return False
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=destination.parent, prefix=f'.{destination.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file, source.open('rb') as source_file:
+            shutil.copyfileobj(source_file, tmp_file)
+        shutil.copystat(source, tmp_name)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, destination)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return True
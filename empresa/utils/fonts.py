@@ -0,0 +1,278 @@
+"""
+Self-hosted, subsetted web fonts: the Font Awesome icons the site uses and Inter.
+
+``scan_icon_usage`` finds the ``fa-*`` classes in the templates and scripts,
+``icon_codepoints`` reads their code points from the Font Awesome CSS and
+``build_fonts`` writes WOFF2 subsets to ``static/fonts`` plus ``static/css/fonts.css``
+with the ``@font-face`` rules and only the icon classes found. Subsetting needs
+``fonttools`` (and ``brotli`` for WOFF2); the icon sources come from the
+``fontawesomefree`` package unless another Font Awesome 6 directory is given.
+"""
+
+import importlib.util
+import re
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .files import atomic_write
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+except ImportError:  # pragma: no cover - depende del entorno
+    ft_subset = TTFont = instancer = None
+
+ICON_FAMILY_FREE = 'Font Awesome 6 Free'
+ICON_FAMILY_BRANDS = 'Font Awesome 6 Brands'
+
+# Estilo -> (archivo de origen en webfonts/, familia, peso).
+ICON_STYLES = {
+    'solid': ('fa-solid-900.ttf', ICON_FAMILY_FREE, 900),
+    'regular': ('fa-regular-400.ttf', ICON_FAMILY_FREE, 400),
+    'brands': ('fa-brands-400.ttf', ICON_FAMILY_BRANDS, 400),
+}
+STYLE_CLASSES = {
+    'fas': 'solid', 'fa-solid': 'solid',
+    'far': 'regular', 'fa-regular': 'regular',
+    'fab': 'brands', 'fa-brands': 'brands',
+}
+
+# Clases auxiliares de Font Awesome que se copian tal cual si aparecen en las plantillas.
+UTILITY_CSS = {
+    'fa-fw': '.fa-fw{text-align:center;width:1.25em}',
+    'fa-lg': '.fa-lg{font-size:1.25em;line-height:.05em;vertical-align:-.075em}',
+    'fa-2x': '.fa-2x{font-size:2em}',
+    'fa-3x': '.fa-3x{font-size:3em}',
+    'fa-spin': (
+        '.fa-spin{animation:fa-spin 2s linear infinite}'
+        '@keyframes fa-spin{0%{transform:rotate(0deg)}100%{transform:rotate(360deg)}}'
+        '@media (prefers-reduced-motion:reduce){.fa-spin{animation:none}}'
+    ),
+}
+
+# Rango "latin" de Google Fonts: cubre el español y la puntuación tipográfica.
+LATIN_UNICODE_RANGE = (
+    'U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,U+0308,U+0329,'
+    'U+2000-206F,U+2074,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD'
+)
+TEXT_FONT_FAMILY = 'Inter'
+TEXT_FONT_WEIGHTS = (300, 700)
+TEXT_FONT_PATTERNS = ('Inter*.ttf', 'Inter*.otf', 'Inter*.woff2', 'Inter*.woff')
+# Hoja que base.html enlaza mientras fonts.css no traiga Inter propio.
+TEXT_FONT_FALLBACK_URL = 'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap'
+
+CLASS_ATTRIBUTE = re.compile(r'''class(?:Name)?\s*=\s*(["'])(.*?)\1''', re.S)
+FA_TOKEN = re.compile(r'(?<![\w-])(?:fa[srb]|fa-[a-z0-9]+(?:-[a-z0-9]+)*)(?![\w-])')
+ICON_RULE = re.compile(
+    r'((?:\.fa-[a-z0-9-]+::?before\s*,\s*)*\.fa-[a-z0-9-]+::?before)\s*\{\s*content:\s*"\\([0-9a-f]+)"'
+)
+ICON_SELECTOR = re.compile(r'\.(fa-[a-z0-9-]+)::?before')
+
+
+@dataclass
+class FontBuild:
+    css_name: str
+    icons: Dict[str, Set[str]] = field(default_factory=dict)
+    fonts: List[str] = field(default_factory=list)
+    unknown: List[str] = field(default_factory=list)
+
+
+def fontawesome_dir() -> Optional[Path]:
+    """Directory of the ``fontawesomefree`` package (``css/`` and ``webfonts/``), if installed."""
+    spec = importlib.util.find_spec('fontawesomefree')
+    if spec is None or not spec.origin:
+        return None
+    return Path(spec.origin).parent / 'static' / 'fontawesomefree'
+
+
+def scan_icon_usage(texts: Iterable[str]) -> Dict[str, Set[str]]:
+    """
+    Map every ``fa-*`` class found in ``texts`` to the styles it is used with.
+
+    The style comes from ``fas``/``far``/``fab`` in the same ``class`` attribute;
+    classes outside one (``classList.add('fa-sun')``) count as solid, the default.
+    """
+    usage: Dict[str, Set[str]] = {}
+    for text in texts:
+        for match in CLASS_ATTRIBUTE.finditer(text):
+            tokens = FA_TOKEN.findall(match.group(2))
+            styles = {STYLE_CLASSES[token] for token in tokens if token in STYLE_CLASSES} or {'solid'}
+            for token in tokens:
+                if token not in STYLE_CLASSES:
+                    usage.setdefault(token, set()).update(styles)
+        for token in FA_TOKEN.findall(text):
+            if token not in STYLE_CLASSES and token not in usage:
+                usage[token] = {'solid'}
+    return usage
+
+
+def parse_icon_css(css: str) -> Dict[str, int]:
+    """Return ``{class name: code point}`` for the ``.fa-name::before`` rules in ``css``."""
+    codepoints = {}
+    for selectors, codepoint in ICON_RULE.findall(css):
+        for name in ICON_SELECTOR.findall(selectors):
+            codepoints[name] = int(codepoint, 16)
+    return codepoints
+
+
+def icon_codepoints(source_dir: Path) -> Dict[str, Dict[str, int]]:
+    """Icon code points per style: brands from ``brands.css``, the rest from ``fontawesome.css``."""
+    css_dir = Path(source_dir) / 'css'
+    free = parse_icon_css((css_dir / 'fontawesome.css').read_text(encoding='utf-8'))
+    brands = parse_icon_css((css_dir / 'brands.css').read_text(encoding='utf-8'))
+    return {'solid': free, 'regular': free, 'brands': brands}
+
+
+def _subset_woff2(font, codepoints: Iterable[int]) -> bytes:
+    options = ft_subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['kern', 'liga', 'calt', 'ccmp', 'locl', 'mark', 'mkmk']
+    options.name_IDs = [0, 1, 2, 3, 4, 5, 6]
+    options.notdef_outline = True
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    output = BytesIO()
+    font.flavor = 'woff2'
+    font.save(output)
+    return output.getvalue()
+
+
+def _latin_codepoints() -> List[int]:
+    codepoints = []
+    for part in LATIN_UNICODE_RANGE.split(','):
+        first, _, last = part[2:].partition('-')
+        codepoints.extend(range(int(first, 16), int(last or first, 16) + 1))
+    return codepoints
+
+
+def _font_face(family, url, weight, style='normal', display='block', unicode_range=None) -> str:
+    rules = [
+        f"font-family:'{family}'",
+        f'font-style:{style}',
+        f'font-weight:{weight}',
+        f'font-display:{display}',
+        f'src:url("{url}") format("woff2")',
+    ]
+    if unicode_range:
+        rules.append(f'unicode-range:{unicode_range}')
+    return '@font-face{' + ';'.join(rules) + '}'
+
+
+def _build_icons(source_dir, used, fonts_dir, fonts_url, result):
+    codepoints = icon_codepoints(source_dir)
+    glyphs: Dict[str, Dict[str, int]] = {style: {} for style in ICON_STYLES}
+    for name, styles in sorted(used.items()):
+        if name in UTILITY_CSS:
+            continue
+        if name in codepoints['brands']:
+            styles = {'brands'}
+        elif name in codepoints['solid']:
+            styles = (styles - {'brands'}) or {'solid'}
+        else:
+            result.unknown.append(name)
+            continue
+        for style in styles:
+            glyphs[style][name] = codepoints[style][name]
+        result.icons[name] = styles
+
+    css = []
+    for style, (source_name, family, weight) in ICON_STYLES.items():
+        if not glyphs[style]:
+            continue
+        font_name = f'fa-{style}.woff2'
+        font = TTFont(Path(source_dir) / 'webfonts' / source_name, recalcTimestamp=False)
+        atomic_write(fonts_dir / font_name, _subset_woff2(font, set(glyphs[style].values())))
+        result.fonts.append(font_name)
+        css.append(_font_face(family, f'{fonts_url}{font_name}', weight))
+
+    css.append(
+        '.fa,.fas,.fa-solid,.far,.fa-regular,.fab,.fa-brands{-moz-osx-font-smoothing:grayscale;'
+        '-webkit-font-smoothing:antialiased;display:inline-block;font-style:normal;'
+        'font-variant:normal;line-height:1;text-rendering:auto}'
+    )
+    css.append(f".fa,.fas,.fa-solid{{font-family:'{ICON_FAMILY_FREE}';font-weight:900}}")
+    css.append(f".far,.fa-regular{{font-family:'{ICON_FAMILY_FREE}';font-weight:400}}")
+    css.append(f".fab,.fa-brands{{font-family:'{ICON_FAMILY_BRANDS}';font-weight:400}}")
+    css.extend(UTILITY_CSS[name] for name in sorted(used) if name in UTILITY_CSS)
+
+    # Los alias (fa-external-link-alt) comparten glifo y regla con el nombre actual.
+    by_codepoint: Dict[int, List[str]] = {}
+    for name in sorted(result.icons):
+        style = next(iter(result.icons[name]))
+        by_codepoint.setdefault(codepoints[style][name], []).append(name)
+    for codepoint, names in sorted(by_codepoint.items()):
+        selectors = ','.join(f'.{name}::before' for name in names)
+        css.append(f'{selectors}{{content:"\\{codepoint:x}"}}')
+    return css
+
+
+def _text_font_faces(sources, fonts_dir, fonts_url, result):
+    css = []
+    latin = _latin_codepoints()
+    for source in sources:
+        font = TTFont(source, recalcTimestamp=False)
+        if 'fvar' in font:
+            # Fuente variable: se limita el eje de peso a los que usa el sitio y se fijan los demás.
+            limits = {
+                axis.axisTag: TEXT_FONT_WEIGHTS if axis.axisTag == 'wght' else None
+                for axis in font['fvar'].axes
+            }
+            font = instancer.instantiateVariableFont(font, limits)
+            weight = '{} {}'.format(*TEXT_FONT_WEIGHTS)
+        else:
+            weight = font['OS/2'].usWeightClass
+        style = 'italic' if font['OS/2'].fsSelection & 1 else 'normal'
+        font_name = f"inter-{style}-{str(weight).replace(' ', '-')}.woff2"
+        atomic_write(fonts_dir / font_name, _subset_woff2(font, latin))
+        result.fonts.append(font_name)
+        css.append(_font_face(
+            TEXT_FONT_FAMILY, f'{fonts_url}{font_name}', weight,
+            style=style, display='swap', unicode_range=LATIN_UNICODE_RANGE,
+        ))
+    return css
+
+
+def declares_text_font(css: str) -> bool:
+    """Whether a ``fonts.css`` written by ``build_fonts`` has ``@font-face`` rules for Inter."""
+    return f"font-family:'{TEXT_FONT_FAMILY}'" in css
+
+
+def find_text_fonts(source_dir: Path) -> List[Path]:
+    source_dir = Path(source_dir)
+    found = set()
+    for pattern in TEXT_FONT_PATTERNS:
+        found.update(source_dir.glob(pattern))
+    return sorted(found)
+
+
+def build_fonts(scan_texts, static_dir, fontawesome_source, text_fonts=()) -> FontBuild:
+    """
+    Write the icon and text font subsets to ``static_dir/fonts`` and ``static_dir/css/fonts.css``.
+
+    ``text_fonts`` are Inter files (a variable font or one file per weight); without
+    them ``fonts.css`` only carries the icons and text falls back to the system font.
+    """
+    if ft_subset is None:
+        raise ImportError('fonttools is required to subset fonts')
+
+    static_dir = Path(static_dir)
+    fonts_dir = static_dir / 'fonts'
+    result = FontBuild(css_name='css/fonts.css')
+    # Ruta relativa a css/: ManifestStaticFilesStorage la reescribe con el nombre con hash.
+    fonts_url = '../fonts/'
+
+    css = _text_font_faces(text_fonts, fonts_dir, fonts_url, result)
+    css += _build_icons(fontawesome_source, scan_icon_usage(scan_texts), fonts_dir, fonts_url, result)
+
+    header = '/* Generado por "manage.py build_fonts"; no editar. Font Awesome Free: fontawesome.com/license/free */\n'
+    atomic_write(static_dir / result.css_name, (header + '\n'.join(css) + '\n').encode('utf-8'))
+
+    # Subconjuntos de una pasada anterior que ya no se usan (un estilo o un peso eliminado).
+    for stale in set(fonts_dir.glob('fa-*.woff2')) | set(fonts_dir.glob('inter-*.woff2')):
+        if stale.name not in result.fonts:
+            stale.unlink()
+    return result
@@ -0,0 +1,151 @@
+import json
+import posixpath
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .cache import LRUCache
+from .content_version import MEDIA_KEY, register_local_cache
+from .files import storage_replace
+
+DERIVATIVES_DIR = 'derivatives'
+CLIENTE_LOGO_HEIGHT = 120
+CLIENTE_LOGO_WEBP_OPTIONS = {'quality': 90, 'method': 6}
+
+# Campos de imagen que se publican con derivados responsivos, por modelo.
+RESPONSIVE_IMAGE_FIELDS = {
+    'Empresa': ('imagen_principal', 'imagen_fondo_hero'),
+    'Proyecto': ('imagen',),
+    'Equipo': ('foto',),
+    'ConfiguracionSitio': ('fondo_global',),
+}
+
+# Orden de preferencia dentro de <picture>: el navegador usa el primero que soporte.
+FORMAT_OPTIONS = {
+    'avif': {'mime_type': 'image/avif', 'pillow_format': 'AVIF', 'save_kwargs': {'quality': 55}},
+    'webp': {'mime_type': 'image/webp', 'pillow_format': 'WEBP', 'save_kwargs': {'quality': 80, 'method': 6}},
+}
+
+_manifests = LRUCache(
+    maxsize=getattr(settings, 'EMPRESA_IMAGE_MANIFEST_MAXSIZE', 256),
+    timeout=getattr(settings, 'EMPRESA_IMAGE_MANIFEST_TIMEOUT', 300),
+)
+# build_image_derivatives avanza la versión de media al terminar.
+register_local_cache(MEDIA_KEY, _manifests.clear)
+
+
+def derivative_widths() -> List[int]:
+    return sorted(getattr(settings, 'EMPRESA_IMAGE_WIDTHS', (320, 640, 960, 1280, 1920)))
+
+
+def derivative_formats() -> List[str]:
+    formats = getattr(settings, 'EMPRESA_IMAGE_FORMATS', ('avif', 'webp'))
+    return [fmt for fmt in formats if fmt in FORMAT_OPTIONS and features.check(fmt)]
+
+
+def _derivative_stem(name: str) -> str:
+    # Con la extensión: foo.jpg y foo.png en la misma carpeta no comparten derivados.
+    return posixpath.join(DERIVATIVES_DIR, name)
+
+
+def derivative_name(name: str, width: int, fmt: str) -> str:
+    """Deterministic storage name of the ``width`` pixels wide ``fmt`` version of ``name``."""
+    return f'{_derivative_stem(name)}-{width}w.{fmt}'
+
+
+def manifest_name(name: str) -> str:
+    return f'{_derivative_stem(name)}.json'
+
+
+def normalize_to_height(image: Image.Image, height: int = CLIENTE_LOGO_HEIGHT) -> Image.Image:
+    """Resize ``image`` to exactly ``height`` pixels tall in a single resample, as RGB/RGBA."""
+    image = ImageOps.exif_transpose(image)
+    if image.height != height:
+        width = max(1, round(image.width * height / image.height))
+        image = image.resize((width, height), Image.LANCZOS)
+    if image.mode not in {'RGB', 'RGBA'}:
+        image = image.convert('RGBA')
+    return image
+
+
+def _target_widths(original_width: int) -> List[int]:
+    widths = derivative_widths()
+    targets = {width for width in widths if width < original_width}
+    targets.add(min(original_width, widths[-1]))
+    return sorted(targets)
+
+
+def _source_signature(storage, name: str) -> Optional[str]:
+    try:
+        return f'{storage.size(name)}:{storage.get_modified_time(name).timestamp()}'
+    except (NotImplementedError, OSError):
+        return None
+
+
+def _read_manifest(storage, name: str) -> Optional[dict]:
+    try:
+        with storage.open(manifest_name(name), 'rb') as manifest_file:
+            return json.loads(manifest_file.read().decode('utf-8'))
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+
+def generate_derivatives(file_field, force: bool = False) -> Tuple[Optional[dict], bool]:
+    """
+    Build the resized WebP/AVIF versions of an image FileField and their manifest.
+
+    Derivatives are skipped when the manifest already matches the current source file,
+    unless ``force``. Returns ``(manifest, written)``: the manifest is ``None`` if the
+    field is empty or unreadable, and ``written`` tells whether any file was stored.
+    """
+    if not file_field:
+        return None, False
+
+    storage = file_field.storage
+    name = file_field.name
+    signature = _source_signature(storage, name)
+    manifest = _read_manifest(storage, name)
+    if not force and manifest and signature and manifest.get('source') == signature:
+        return manifest, False
+
+    try:
+        with storage.open(name, 'rb') as image_file:
+            with Image.open(image_file) as original:
+                image = ImageOps.exif_transpose(original)
+                image.load()
+    except (FileNotFoundError, OSError, UnidentifiedImageError):
+        return None, False
+
+    if image.mode not in {'RGB', 'RGBA'}:
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+    manifest = {'source': signature, 'width': image.width, 'height': image.height, 'formats': {}}
+    for width in _target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in derivative_formats():
+            options = FORMAT_OPTIONS[fmt]
+            buffer = BytesIO()
+            resized.save(buffer, format=options['pillow_format'], **options['save_kwargs'])
+            storage_replace(storage, derivative_name(name, width, fmt), buffer.getvalue())
+            manifest['formats'].setdefault(fmt, []).append(width)
+
+    storage_replace(storage, manifest_name(name), json.dumps(manifest).encode('utf-8'))
+    _manifests.pop(name)
+    return manifest, True
+
+
+def get_derivatives(file_field) -> Dict[str, List[int]]:
+    """Return ``{format: [widths]}`` of the derivatives available for ``file_field``."""
+    if not file_field:
+        return {}
+
+    name = file_field.name
+    formats = _manifests.get(name)
+    if formats is None:
+        manifest = _read_manifest(file_field.storage, name) or {}
+        formats = manifest.get('formats', {})
+        _manifests.set(name, formats)
+    return formats
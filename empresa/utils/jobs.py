@@ -0,0 +1,147 @@
+"""
+Minimal database-backed job queue.
+
+Tasks are plain functions registered with ``@task('name')``. ``enqueue`` stores a
+``Tarea`` row once the surrounding transaction commits, and ``manage.py run_jobs``
+claims pending rows and runs them in a process pool.
+"""
+
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Dict, List, Mapping, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import Tarea
+
+
+@dataclass(frozen=True)
+class RegisteredTask:
+    name: str
+    func: Callable
+    max_attempts: int
+    max_concurrency: Optional[int]
+
+
+_registry: Dict[str, RegisteredTask] = {}
+
+
+def task(name: str, max_attempts: int = 3, max_concurrency: Optional[int] = None):
+    """Register ``func`` as the handler of jobs of type ``name``."""
+    def decorator(func):
+        _registry[name] = RegisteredTask(name, func, max_attempts, max_concurrency)
+        return func
+    return decorator
+
+
+def get_task(name: str) -> RegisteredTask:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"Tarea no registrada: {name}") from None
+
+
+def registered_tasks() -> Dict[str, RegisteredTask]:
+    return dict(_registry)
+
+
+def saturated_types(running_types: Mapping[str, int]) -> List[str]:
+    """Task types whose ``max_concurrency`` is reached by the ``{type: running jobs}`` counts."""
+    return [
+        name for name, registered in _registry.items()
+        if registered.max_concurrency and running_types.get(name, 0) >= registered.max_concurrency
+    ]
+
+
+def run_task(name: str, params: dict) -> None:
+    get_task(name).func(**params)
+
+
+def enqueue(name: str, **params) -> None:
+    """
+    Queue a job after the current transaction commits.
+
+    A pending job with the same type and parameters is not duplicated. With
+    ``EMPRESA_JOBS_EAGER`` the task runs immediately instead (development/tests).
+    """
+    registered = get_task(name)
+
+    def _create():
+        if getattr(settings, 'EMPRESA_JOBS_EAGER', False):
+            run_task(name, params)
+            return
+        if Tarea.objects.filter(tipo=name, parametros=params, estado=Tarea.PENDIENTE).exists():
+            return
+        Tarea.objects.create(tipo=name, parametros=params, max_intentos=registered.max_attempts)
+
+    transaction.on_commit(_create)
+
+
+def retry_delay(attempt: int) -> timedelta:
+    base = getattr(settings, 'EMPRESA_JOBS_RETRY_DELAY', 30)
+    return timedelta(seconds=min(base * 2 ** max(attempt - 1, 0), 3600))
+
+
+def claim_jobs(limit: int, exclude_types=()) -> list:
+    """Atomically mark up to ``limit`` runnable jobs as in progress and return them."""
+    if limit <= 0:
+        return []
+
+    now = timezone.now()
+    lock_timeout = timedelta(seconds=getattr(settings, 'EMPRESA_JOBS_LOCK_TIMEOUT', 600))
+    candidates = (
+        Tarea.objects
+        .filter(
+            Q(estado=Tarea.PENDIENTE, ejecutar_despues__lte=now)
+            # Trabajos de un worker que murió sin terminarlos.
+            | Q(estado=Tarea.EN_PROCESO, bloqueado_hasta__lt=now)
+        )
+        .exclude(tipo__in=list(exclude_types))
+        .order_by('ejecutar_despues', 'pk')[:limit * 2]
+    )
+
+    claimed = []
+    for job in candidates:
+        updated = Tarea.objects.filter(pk=job.pk, estado=job.estado, intentos=job.intentos).update(
+            estado=Tarea.EN_PROCESO,
+            bloqueado_hasta=now + lock_timeout,
+            intentos=F('intentos') + 1,
+        )
+        if updated:
+            job.refresh_from_db()
+            claimed.append(job)
+            if len(claimed) >= limit:
+                break
+    return claimed
+
+
+def mark_completed(job) -> None:
+    Tarea.objects.filter(pk=job.pk).update(
+        estado=Tarea.COMPLETADA,
+        bloqueado_hasta=None,
+        ultimo_error='',
+        fecha_finalizacion=timezone.now(),
+    )
+
+
+def mark_failed(job, error: BaseException) -> None:
+    """Reschedule ``job`` with exponential backoff, or give up after ``max_intentos``."""
+    message = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+    if job.intentos >= job.max_intentos:
+        Tarea.objects.filter(pk=job.pk).update(
+            estado=Tarea.FALLIDA,
+            bloqueado_hasta=None,
+            ultimo_error=message,
+            fecha_finalizacion=timezone.now(),
+        )
+    else:
+        Tarea.objects.filter(pk=job.pk).update(
+            estado=Tarea.PENDIENTE,
+            bloqueado_hasta=None,
+            ultimo_error=message,
+            ejecutar_despues=timezone.now() + retry_delay(job.intentos),
+        )
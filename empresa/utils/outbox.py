@@ -0,0 +1,131 @@
+"""
+Outbox for contact form notifications.
+
+The view stores the ``Contacto`` and its ``NotificacionContacto`` in the same
+transaction; ``manage.py send_notifications`` delivers them afterwards over a
+single SMTP connection, so the response never waits for the mail server.
+"""
+
+import smtplib
+import traceback
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import NotificacionContacto
+from .jobs import retry_delay
+
+DEFAULT_RECIPIENT = 'mlujan@tekon-rl.cl'
+
+
+def queue_contact_notification(contacto, empresa=None) -> NotificacionContacto:
+    """Create the outbox row announcing ``contacto``. Call it inside the transaction that saved it."""
+    return NotificacionContacto.objects.create(
+        contacto=contacto,
+        destinatario=empresa.email_principal if empresa and empresa.email_principal else DEFAULT_RECIPIENT,
+        asunto=f'Nuevo mensaje de contacto: {contacto.asunto}',
+        cuerpo=(
+            f'Nombre: {contacto.nombre}\nEmail: {contacto.email}\nTeléfono: {contacto.telefono}\n'
+            f'Empresa: {contacto.empresa}\n\nMensaje:\n{contacto.mensaje}'
+        ),
+    )
+
+
+def claim_notifications(limit: int) -> List[NotificacionContacto]:
+    """Atomically mark up to ``limit`` due notifications as being sent and return them."""
+    now = timezone.now()
+    lock_timeout = timedelta(seconds=getattr(settings, 'EMPRESA_OUTBOX_LOCK_TIMEOUT', 300))
+    candidates = (
+        NotificacionContacto.objects
+        .filter(
+            Q(estado=NotificacionContacto.PENDIENTE, ejecutar_despues__lte=now)
+            # Envíos de un worker que murió a mitad de camino.
+            | Q(estado=NotificacionContacto.ENVIANDO, bloqueado_hasta__lt=now)
+        )
+        .select_related('contacto')
+        .order_by('ejecutar_despues', 'pk')[:limit]
+    )
+
+    claimed = []
+    for notificacion in candidates:
+        updated = NotificacionContacto.objects.filter(
+            pk=notificacion.pk, estado=notificacion.estado, intentos=notificacion.intentos,
+        ).update(
+            estado=NotificacionContacto.ENVIANDO,
+            bloqueado_hasta=now + lock_timeout,
+            intentos=F('intentos') + 1,
+        )
+        if updated:
+            notificacion.estado = NotificacionContacto.ENVIANDO
+            notificacion.intentos += 1
+            claimed.append(notificacion)
+    return claimed
+
+
+def build_message(notificacion: NotificacionContacto, connection=None) -> EmailMessage:
+    return EmailMessage(
+        subject=notificacion.asunto,
+        body=notificacion.cuerpo,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[notificacion.destinatario],
+        reply_to=[notificacion.contacto.email],
+        connection=connection,
+    )
+
+
+def deliver(notificaciones, connection) -> int:
+    """
+    Send ``notificaciones`` through ``connection``, which is opened if needed and left open.
+
+    Each result is recorded on its row; failures are retried with exponential
+    backoff until ``max_intentos``. Returns the number of emails sent.
+    """
+    sent = 0
+    pending = list(notificaciones)
+    while pending:
+        try:
+            connection.open()
+        except Exception as error:
+            # Sin servidor SMTP no tiene sentido seguir intentando con el resto del lote.
+            for notificacion in pending:
+                mark_failed(notificacion, error)
+            break
+
+        notificacion = pending.pop(0)
+        try:
+            connection.send_messages([build_message(notificacion, connection)])
+        except Exception as error:
+            mark_failed(notificacion, error)
+            if isinstance(error, (smtplib.SMTPServerDisconnected, OSError)):
+                # La conexión quedó inutilizable: se reabre para el resto del lote.
+                connection.close()
+            continue
+        NotificacionContacto.objects.filter(pk=notificacion.pk).update(
+            estado=NotificacionContacto.ENVIADA,
+            bloqueado_hasta=None,
+            ultimo_error='',
+            fecha_entrega=timezone.now(),
+        )
+        sent += 1
+    return sent
+
+
+def mark_failed(notificacion: NotificacionContacto, error: BaseException) -> None:
+    message = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+    if notificacion.intentos >= notificacion.max_intentos:
+        NotificacionContacto.objects.filter(pk=notificacion.pk).update(
+            estado=NotificacionContacto.FALLIDA,
+            bloqueado_hasta=None,
+            ultimo_error=message,
+        )
+    else:
+        NotificacionContacto.objects.filter(pk=notificacion.pk).update(
+            estado=NotificacionContacto.PENDIENTE,
+            bloqueado_hasta=None,
+            ultimo_error=message,
+            ejecutar_despues=timezone.now() + retry_delay(notificacion.intentos),
+        )
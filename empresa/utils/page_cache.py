@@ -0,0 +1,147 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .content_version import get_cache, get_request_content_version
+from .critical_css import critical_css_dir
+from .site_resolver import normalize_host, resolve_site
+
+
+def _build_files():
+    manifest_name = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest_name and getattr(settings, 'STATIC_ROOT', None):
+        yield Path(settings.STATIC_ROOT) / manifest_name
+    yield from sorted(critical_css_dir().glob('*.css'))
+    yield from sorted((Path(apps.get_app_config('empresa').path) / 'templates').rglob('*.html'))
+
+
+@lru_cache(maxsize=1)
+def get_build() -> Tuple[str, float]:
+    """
+    Return ``(identifier, timestamp)`` of the deployed templates and static files.
+
+    The identifier is ``EMPRESA_BUILD_ID`` or a digest of the staticfiles manifest,
+    the critical CSS and the empresa templates; the timestamp is their newest mtime.
+    Computed once per process: a deploy restarts the workers.
+    """
+    digest = hashlib.md5()
+    newest = 0.0
+    for path in _build_files():
+        try:
+            digest.update(path.read_bytes())
+            newest = max(newest, path.stat().st_mtime)
+        except OSError:
+            continue
+    build_id = getattr(settings, 'EMPRESA_BUILD_ID', None) or digest.hexdigest()[:12]
+    return build_id, newest
+
+
+def _has_messages(request) -> bool:
+    if not hasattr(request, '_messages'):
+        return False
+    return len(get_messages(request)) > 0
+
+
+def page_cache_key(request, site) -> str:
+    domain = normalize_host(site.domain) if site else normalize_host(request.get_host())
+    version = get_request_content_version(request, site)
+    path = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+    return f'empresa:page:{domain}:{version}:{get_build()[0]}:{path}'
+
+
+def fragment_cache_key(request, site, name: str, vary_on=()) -> str:
+    domain = normalize_host(site.domain) if site else normalize_host(request.get_host())
+    version = get_request_content_version(request, site)
+    vary = hashlib.md5(':'.join(str(value) for value in vary_on).encode('utf-8')).hexdigest()
+    return f'empresa:fragment:{domain}:{version}:{get_build()[0]}:{name}:{vary}'
+
+
+def _is_cacheable(request, response) -> bool:
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+        and 'private' not in response.get('Cache-Control', '')
+        and not _has_messages(request)
+    )
+
+
+def cache_public_page(view_func):
+    """
+    Caches the full response of a public view per site domain, content version, build and path.
+
+    Disabled unless ``EMPRESA_PAGE_CACHE_TIMEOUT`` is set. Non-GET requests, requests with
+    pending flash messages and responses that set cookies or use the CSRF token are never
+    served from or stored in the cache.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        timeout = getattr(settings, 'EMPRESA_PAGE_CACHE_TIMEOUT', 0)
+        if not timeout or request.method not in ('GET', 'HEAD') or _has_messages(request):
+            return view_func(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = page_cache_key(request, resolve_site(request))
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view_func(request, *args, **kwargs)
+        if _is_cacheable(request, response):
+            cache.set(key, (response.content, response['Content-Type']), timeout)
+        return response
+
+    return wrapper
+
+
+def _validator_version(request):
+    if request.method not in ('GET', 'HEAD') or _has_messages(request):
+        return None
+    return get_request_content_version(request, resolve_site(request))
+
+
+def public_page_etag(request, *args, **kwargs):
+    version = _validator_version(request)
+    return None if version is None else f'v{version}-{get_build()[0]}'
+
+
+def public_page_last_modified(request, *args, **kwargs):
+    # Las versiones de contenido son sellos en microsegundos del último cambio; un
+    # despliegue más reciente que el contenido también cuenta como modificación.
+    version = _validator_version(request)
+    if version is None:
+        return None
+    return datetime.fromtimestamp(max(version / 1_000_000, get_build()[1]), tz=timezone.utc)
+
+
+def conditional_public_page(view_func):
+    """
+    Answers ``If-None-Match``/``If-Modified-Since`` with 304 from the site's content version
+    and the build (see ``get_build``).
+
+    The validators are checked before the view runs, so a 304 costs no page queries or
+    rendering. Responses carry ``Cache-Control: no-cache`` so browsers revalidate instead
+    of reusing the page heuristically. Not for views whose HTML embeds a CSRF token.
+    """
+    conditional_view = condition(etag_func=public_page_etag, last_modified_func=public_page_last_modified)(view_func)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = conditional_view(request, *args, **kwargs)
+        if response.has_header('ETag'):
+            patch_cache_control(response, no_cache=True)
+        return response
+
+    return wrapper
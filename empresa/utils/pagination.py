@@ -0,0 +1,105 @@
+"""
+Keyset (cursor) pagination.
+
+Each page is fetched with a WHERE clause on the ordering values of the last row
+of the previous page instead of an OFFSET, so a page costs the same no matter
+how deep it is. The cursor is that list of values, signed so it cannot be
+tampered with; it carries no timestamp, so the same row always yields the same
+cursor (and the same cacheable URL). Ordering fields must be non-nullable and end
+in a unique one.
+"""
+
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+from typing import List, Optional, Sequence
+
+from django.core import signing
+from django.db.models import Q
+
+_SALT = 'empresa.pagination'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    items: List = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    # URL del fragmento con la página siguiente; lo completa la vista.
+    next_url: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+def _field_name(ordering_field: str) -> str:
+    return ordering_field.lstrip('-')
+
+
+def encode_cursor(obj, ordering: Sequence[str]) -> str:
+    values = []
+    for ordering_field in ordering:
+        value = getattr(obj, _field_name(ordering_field))
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+    return signing.Signer(salt=_SALT).sign_object(values, compress=True)
+
+
+def decode_cursor(cursor: str, model, ordering: Sequence[str]) -> list:
+    try:
+        values = signing.Signer(salt=_SALT).unsign_object(cursor)
+    except signing.BadSignature:
+        raise InvalidCursor(cursor) from None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor(cursor)
+    return [
+        model._meta.get_field(_field_name(ordering_field)).to_python(value)
+        for ordering_field, value in zip(ordering, values)
+    ]
+
+
+def _after(ordering: Sequence[str], values: Sequence) -> Q:
+    """Rows strictly after ``values`` in ``ordering``: (a > x) OR (a = x AND b > y) OR ..."""
+    conditions = []
+    for index, ordering_field in enumerate(ordering):
+        lookup = 'lt' if ordering_field.startswith('-') else 'gt'
+        condition = Q(**{f'{_field_name(ordering_field)}__{lookup}': values[index]})
+        for previous_field, previous_value in zip(ordering[:index], values[:index]):
+            condition &= Q(**{_field_name(previous_field): previous_value})
+        conditions.append(condition)
+    return reduce(or_, conditions)
+
+
+def paginate_keyset(queryset, ordering: Sequence[str], cursor: Optional[str] = None, per_page: int = 12) -> KeysetPage:
+    """
+    Return the page of ``queryset`` that follows ``cursor`` (the first page when empty).
+
+    Raises ``InvalidCursor`` if the cursor was not produced for this ordering.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        queryset = queryset.filter(_after(ordering, decode_cursor(cursor, queryset.model, ordering)))
+
+    return keyset_page(list(queryset[:per_page + 1]), ordering, per_page)
+
+
+def keyset_page(items: Sequence, ordering: Sequence[str], per_page: int) -> KeysetPage:
+    """
+    Build a page from up to ``per_page + 1`` rows already sorted by ``ordering``.
+
+    The extra row only signals that a next page exists; it is not returned.
+    """
+    next_cursor = encode_cursor(items[per_page - 1], ordering) if len(items) > per_page else None
+    return KeysetPage(list(items[:per_page]), next_cursor)
@@ -1,16 +1,62 @@
+import threading
+from typing import Dict, Optional, Tuple
+
 from django.contrib.sites.models import Site
 from django.contrib.sites.shortcuts import get_current_site
 
+from .content_version import SITE_MAP_KEY, bump_versions, get_request_version
+
+_REQUEST_ATTR = '_empresa_resolved_site'
+
+# (versión SITE_MAP_KEY, dominio -> Site). Guardar o borrar un Site avanza la
+# versión en la base de datos y todos los procesos reconstruyen el mapa.
+_site_map: Optional[Tuple[int, Dict[str, Site]]] = None
+_site_map_lock = threading.Lock()
+
+
+def normalize_host(host: str) -> str:
+    """Lowercase ``host`` and drop the port and a leading ``www.``."""
+    host = host.split(':')[0].strip().lower().rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+def _get_site_map(version: int) -> Dict[str, Site]:
+    global _site_map
+
+    cached = _site_map
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _site_map_lock:
+        if _site_map is None or _site_map[0] != version:
+            _site_map = (version, {normalize_host(site.domain): site for site in Site.objects.all()})
+        return _site_map[1]
+
+
+def clear_site_map() -> None:
+    """Force this process to rebuild the host map on the next lookup."""
+    global _site_map
+    with _site_map_lock:
+        _site_map = None
+
+
+def invalidate_site_map() -> None:
+    """Make every process rebuild the host map on its next lookup."""
+    bump_versions([SITE_MAP_KEY])
+
 
 def resolve_site(request):
-    """Return the Site matching the current request, ignoring port numbers."""
-    host = request.get_host().split(':')[0].lower()
+    """Return the Site matching the current request, ignoring port numbers and ``www.``."""
+    site = getattr(request, _REQUEST_ATTR, None)
+    if site is not None:
+        return site
 
-    current_site = getattr(request, 'site', None)
-    if current_site and current_site.domain.split(':')[0].lower() == host:
-        return current_site
+    site_map = _get_site_map(get_request_version(request, SITE_MAP_KEY, create=False))
+    site = site_map.get(normalize_host(request.get_host()))
+    if site is None:
+        site = get_current_site(request)
 
-    try:
-        return Site.objects.get(domain__iexact=host)
-    except Site.DoesNotExist:
-        return get_current_site(request)
+    setattr(request, _REQUEST_ATTR, site)
+    return site
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+
+from ..models import ConfiguracionSitio, Empresa
+from .cache import LRUCache
+from .content_version import get_content_version, get_request_content_version
+from .site_resolver import resolve_site
+
+_REQUEST_ATTR = '_empresa_site_snapshot'
+
+# site_id -> (versión de contenido, snapshot). Guardar Empresa o ConfiguracionSitio
+# avanza la versión compartida en la base de datos, así que todos los workers
+# descartan su copia en la siguiente petición.
+_snapshots = LRUCache(maxsize=getattr(settings, 'EMPRESA_SITE_SNAPSHOT_MAXSIZE', 32))
+
+
+@dataclass(frozen=True)
+class SiteSnapshot:
+    """Empresa y ConfiguracionSitio activas de un Site, cargadas juntas."""
+
+    site: Optional[Site]
+    empresa: Optional[Empresa]
+    configuracion: Optional[ConfiguracionSitio]
+
+
+def load_site_snapshot(site: Optional[Site], version: Optional[int] = None) -> SiteSnapshot:
+    """
+    Return the cached snapshot for ``site``, loading it when missing or older than
+    ``version`` (the site's current content version by default).
+    """
+    if site is None:
+        return SiteSnapshot(site=None, empresa=None, configuracion=None)
+
+    if version is None:
+        version = get_content_version(site.pk)
+    cached = _snapshots.get(site.pk)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    snapshot = SiteSnapshot(
+        site=site,
+        empresa=Empresa.objects.filter(site=site, activo=True).first(),
+        configuracion=ConfiguracionSitio.objects.filter(site=site, activo=True).first(),
+    )
+    _snapshots.set(site.pk, (version, snapshot))
+    return snapshot
+
+
+def get_site_snapshot(request) -> SiteSnapshot:
+    """Return the snapshot for the request's site, memoized on the request."""
+    snapshot = getattr(request, _REQUEST_ATTR, None)
+    if snapshot is None:
+        site = resolve_site(request)
+        snapshot = load_site_snapshot(site, get_request_content_version(request, site))
+        setattr(request, _REQUEST_ATTR, snapshot)
+    return snapshot
@@ -0,0 +1,151 @@
+"""
+Sprite sheet with the logos of every active client.
+
+``build_cliente_sprite`` packs the logos into rows of a single WebP and writes
+``sprites/clientes.json`` with the coordinates of each client. The image name
+includes a hash of the logo list, so a new set or order gets a new URL.
+"""
+
+import hashlib
+import json
+from io import BytesIO
+from typing import Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, UnidentifiedImageError
+
+from .cache import LRUCache
+from .content_version import MEDIA_KEY, bump_media_version, register_local_cache
+from .images import CLIENTE_LOGO_HEIGHT, normalize_to_height
+
+SPRITE_DIR = 'sprites'
+SPRITE_MAP_NAME = f'{SPRITE_DIR}/clientes.json'
+# Separación entre logos para que el escalado no mezcle píxeles vecinos.
+SPRITE_PADDING = 2
+
+_sprite_maps = LRUCache(maxsize=1, timeout=getattr(settings, 'EMPRESA_SPRITE_MAP_TIMEOUT', 60))
+register_local_cache(MEDIA_KEY, _sprite_maps.clear)
+
+
+def _sprite_clientes():
+    from ..models import Cliente
+
+    return list(
+        Cliente.objects.published()
+        .with_logo()
+        .order_by('orden', 'nombre', 'pk')
+        .only('pk', 'logo')
+    )
+
+
+def _signature(clientes) -> str:
+    digest = hashlib.sha256()
+    for cliente in clientes:
+        storage = cliente.logo.storage
+        try:
+            modified = storage.get_modified_time(cliente.logo.name).timestamp()
+        except (NotImplementedError, OSError):
+            modified = ''
+        digest.update(f'{cliente.pk}:{cliente.logo.name}:{modified}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def read_sprite_map(storage=default_storage) -> Optional[dict]:
+    try:
+        with storage.open(SPRITE_MAP_NAME, 'rb') as map_file:
+            return json.loads(map_file.read().decode('utf-8'))
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+
+def get_sprite_map() -> dict:
+    """Return the current sprite map (``{}`` while no sprite has been built)."""
+    sprite_map = _sprite_maps.get(SPRITE_MAP_NAME)
+    if sprite_map is None:
+        sprite_map = read_sprite_map() or {}
+        _sprite_maps.set(SPRITE_MAP_NAME, sprite_map)
+    return sprite_map
+
+
+def build_cliente_sprite(force: bool = False, storage=default_storage) -> Optional[dict]:
+    """
+    Rebuild the client logo sprite when the set, order or files of the logos changed.
+
+    Returns the sprite map, or ``None`` when no active client has a logo.
+    """
+    clientes = _sprite_clientes()
+    signature = _signature(clientes)
+    previous = read_sprite_map(storage)
+    if not force and previous and previous.get('signature') == signature and storage.exists(previous['image']):
+        return previous
+
+    height = getattr(settings, 'EMPRESA_SPRITE_LOGO_HEIGHT', CLIENTE_LOGO_HEIGHT)
+    max_width = getattr(settings, 'EMPRESA_SPRITE_MAX_WIDTH', 4096)
+
+    logos = []
+    for cliente in clientes:
+        try:
+            with cliente.logo.open('rb') as logo_file:
+                with Image.open(logo_file) as original:
+                    image = normalize_to_height(original, height)
+        except (FileNotFoundError, OSError, UnidentifiedImageError):
+            continue
+        logos.append((cliente, image))
+
+    if not logos:
+        stale = [name for name in (SPRITE_MAP_NAME, previous and previous.get('image')) if name and storage.exists(name)]
+        for name in stale:
+            storage.delete(name)
+        if stale:
+            _sprite_maps.clear()
+            bump_media_version()
+        return None
+
+    # Empaquetado por filas: el ancho de WebP está limitado a 16383 px.
+    positions = []
+    x = y = sheet_width = 0
+    for cliente, image in logos:
+        if x and x + image.width > max_width:
+            x, y = 0, y + height + SPRITE_PADDING
+        positions.append((cliente, image, x, y))
+        sheet_width = max(sheet_width, x + image.width)
+        x += image.width + SPRITE_PADDING
+    sheet_height = y + height
+
+    sheet = Image.new('RGBA', (sheet_width, sheet_height), (0, 0, 0, 0))
+    sprite_map = {
+        'signature': signature,
+        'image': f'{SPRITE_DIR}/clientes-{signature[:12]}.webp',
+        'width': sheet_width,
+        'height': sheet_height,
+        # Se conserva la imagen anterior para las páginas que aún la referencian.
+        'previous_image': previous.get('image') if previous else None,
+        'logos': {},
+    }
+    for cliente, image, x, y in positions:
+        sheet.paste(image.convert('RGBA'), (x, y))
+        sprite_map['logos'][str(cliente.pk)] = {
+            'logo': cliente.logo.name,
+            'x': x,
+            'y': y,
+            'width': image.width,
+            'height': image.height,
+        }
+
+    buffer = BytesIO()
+    sheet.save(buffer, format='WEBP', quality=90, method=6)
+    if storage.exists(sprite_map['image']):
+        storage.delete(sprite_map['image'])
+    storage.save(sprite_map['image'], ContentFile(buffer.getvalue()))
+    if storage.exists(SPRITE_MAP_NAME):
+        storage.delete(SPRITE_MAP_NAME)
+    storage.save(SPRITE_MAP_NAME, ContentFile(json.dumps(sprite_map).encode('utf-8')))
+
+    stale = previous.get('previous_image') if previous else None
+    if stale and stale not in {sprite_map['image'], sprite_map['previous_image']} and storage.exists(stale):
+        storage.delete(stale)
+    _sprite_maps.clear()
+    bump_media_version()
+    return sprite_map
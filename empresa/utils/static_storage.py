@@ -0,0 +1,98 @@
+"""
+Static files storage that writes content-hashed names plus ``.gz`` and ``.br`` siblings.
+
+``collectstatic`` hashes every file (``css/tailwind.css`` -> ``css/tailwind.3f9c2a1b7e4d.css``)
+and then compresses the text assets next to both names, so nginx (``gzip_static`` /
+``brotli_static``) or ``empresa.asset_views.serve_static`` can send them as-is. Brotli
+output needs the ``brotli`` package; without it only ``.gz`` files are written.
+"""
+
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from .files import atomic_write
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.mjs', '.map', '.svg', '.json', '.txt', '.xml', '.html', '.ico'}
+# Por debajo de este tamaño la cabecera Content-Encoding cuesta más de lo que ahorra.
+MIN_COMPRESS_SIZE = 256
+
+# Codificaciones en orden de preferencia y la extensión de su copia precomprimida.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _compress_gzip(data: bytes) -> bytes:
+    # mtime=0: la misma entrada produce siempre los mismos bytes.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _compress_brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ``ManifestStaticFilesStorage`` that also precompresses the collected files.
+
+    Until ``collectstatic`` has written a manifest (development, tests) ``url()`` keeps
+    the plain file names instead of failing on the missing entries.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        hashed_names = set(self.hashed_files.values())
+        for name in sorted(set(paths) | hashed_names):
+            for compressed_name in self.compress(name, hashed=name in hashed_names):
+                yield name, compressed_name, True
+
+    def compressors(self):
+        compressors = [('.gz', _compress_gzip)]
+        if brotli is not None:
+            compressors.append(('.br', _compress_brotli))
+        return compressors
+
+    def compress(self, name, hashed=False):
+        """Write the compressed siblings of ``name`` that are missing or stale; return their names."""
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS or not self.exists(name):
+            return []
+
+        path = self.path(name)
+        # Un nombre con hash fija su contenido (aunque collectstatic lo reescriba en
+        # cada pasada); los demás se comparan por fecha de modificación.
+        source_mtime = os.path.getmtime(path)
+        pending = [
+            (suffix, compressor)
+            for suffix, compressor in self.compressors()
+            if not os.path.exists(path + suffix)
+            or (not hashed and os.path.getmtime(path + suffix) < source_mtime)
+        ]
+        if not pending:
+            return []
+
+        with open(path, 'rb') as source:
+            data = source.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return []
+
+        written = []
+        for suffix, compressor in pending:
+            compressed = compressor(data)
+            if len(compressed) >= len(data):
+                continue
+            atomic_write(path + suffix, compressed)
+            written.append(name + suffix)
+        return written
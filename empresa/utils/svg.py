@@ -0,0 +1,256 @@
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+from .files import storage_replace
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+MINIFIED_SUFFIX = '.min.svg'
+
+# Namespaces que agregan los editores (Inkscape, Illustrator, Sketch, ...).
+EDITOR_NAMESPACES = {
+    'http://www.inkscape.org/namespaces/inkscape',
+    'http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd',
+    'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'http://creativecommons.org/ns#',
+    'http://purl.org/dc/elements/1.1/',
+    'http://ns.adobe.com/AdobeIllustrator/10.0/',
+    'http://ns.adobe.com/Extensibility/1.0/',
+    'http://ns.adobe.com/Graphs/1.0/',
+    'http://ns.adobe.com/SaveForWeb/1.0/',
+    'http://ns.adobe.com/Variables/1.0/',
+    'http://ns.adobe.com/xap/1.0/',
+    'http://www.bohemiancoding.com/sketch/ns',
+    'http://www.serif.com/',
+}
+
+# Atributos numéricos en los que se reduce la precisión (nunca colores ni estilos).
+NUMERIC_ATTRIBUTES = {
+    'd', 'points', 'transform', 'x', 'y', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'rx', 'ry',
+    'dx', 'dy', 'stroke-width', 'font-size', 'letter-spacing', 'offset',
+}
+LIST_ATTRIBUTES = {'d', 'points', 'transform'}
+PATH_COMMANDS = set('MmZzLlHhVvCcSsQqTtAa')
+TEXT_ELEMENTS = {'text', 'tspan', 'textPath', 'style', 'title', 'desc'}
+
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_REFERENCE_RE = re.compile(r'#([A-Za-z_][\w.:-]*)')
+
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', XLINK_NS)
+
+
+def _split_tag(tag: str):
+    if tag.startswith('{'):
+        namespace, _, local = tag[1:].partition('}')
+        return namespace, local
+    return '', tag
+
+
+def _format_number(token: str, precision: int) -> str:
+    if 'e' in token or 'E' in token:
+        return token
+    text = f'{round(float(token), precision):.{precision}f}'.rstrip('0').rstrip('.')
+    if text in ('', '-0'):
+        return '0'
+    if text.startswith('0.'):
+        return text[1:]
+    if text.startswith('-0.'):
+        return '-' + text[2:]
+    return text
+
+
+def round_numbers(value: str, precision: int) -> str:
+    """Round every number in ``value``, keeping tokens that touch each other separate."""
+    parts = []
+    position = 0
+    previous_has_dot = None  # None: el texto anterior no terminó en número
+    for match in _NUMBER_RE.finditer(value):
+        gap = value[position:match.start()]
+        number = _format_number(match.group(0), precision)
+        if gap:
+            parts.append(gap)
+        elif previous_has_dot is not None:
+            if number[0].isdigit() or (number[0] == '.' and not previous_has_dot):
+                parts.append(' ')
+        parts.append(number)
+        previous_has_dot = '.' in number
+        position = match.end()
+    parts.append(value[position:])
+    return ''.join(parts)
+
+
+def round_path_data(value: str, precision: int) -> str:
+    """
+    ``round_numbers`` for path data. The arc flags of ``A``/``a`` are single
+    characters that may touch the next value (``a5 5 0 01 10 10``), so they are
+    read one digit at a time and never rounded. Unknown syntax is left untouched.
+    """
+    parts = []
+    previous_has_dot = None
+    command = ''
+    argument = 0
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char in PATH_COMMANDS:
+            parts.append(char)
+            command, argument, previous_has_dot = char, 0, None
+            i += 1
+            continue
+        if char in ' \t\r\n,':
+            i += 1
+            continue
+        if command in ('A', 'a') and argument % 7 in (3, 4) and char in '01':
+            number = char
+            i += 1
+        else:
+            match = _NUMBER_RE.match(value, i)
+            if not match:
+                return value
+            number = _format_number(match.group(0), precision)
+            i = match.end()
+        if previous_has_dot is not None and (
+            number[0].isdigit() or (number[0] == '.' and not previous_has_dot)
+        ):
+            parts.append(' ')
+        parts.append(number)
+        previous_has_dot = '.' in number
+        argument += 1
+    return ''.join(parts)
+
+
+def _compact_list(value: str) -> str:
+    value = re.sub(r'\s*,\s*', ',', value.strip())
+    return re.sub(r'\s+', ' ', value)
+
+
+def _is_editor_name(name: str) -> bool:
+    namespace, _ = _split_tag(name)
+    return namespace in EDITOR_NAMESPACES
+
+
+def _collect_references(root) -> set:
+    references = set()
+    for element in root.iter():
+        for value in element.attrib.values():
+            references.update(_REFERENCE_RE.findall(value))
+        if _split_tag(element.tag)[1] == 'style' and element.text:
+            references.update(_REFERENCE_RE.findall(element.text))
+    return references
+
+
+def _clean(element, references: set, precision: int, in_text: bool = False) -> None:
+    _, local = _split_tag(element.tag)
+    in_text = in_text or local in TEXT_ELEMENTS
+
+    for child in list(element):
+        if not isinstance(child.tag, str):
+            element.remove(child)
+            continue
+        _, child_local = _split_tag(child.tag)
+        if _is_editor_name(child.tag) or child_local == 'metadata':
+            element.remove(child)
+            continue
+        if (
+            local == 'defs'
+            and child_local != 'style'
+            and child.get('id')
+            and child.get('id') not in references
+        ):
+            element.remove(child)
+            continue
+        _clean(child, references, precision, in_text)
+        if child_local == 'defs' and len(child) == 0:
+            element.remove(child)
+
+    for name in list(element.attrib):
+        value = element.attrib[name]
+        if _is_editor_name(name):
+            del element.attrib[name]
+        elif name == 'id' and value not in references:
+            del element.attrib[name]
+        elif name == 'style':
+            declarations = [
+                declaration.strip() for declaration in value.split(';')
+                if declaration.strip() and not declaration.strip().startswith('-inkscape')
+            ]
+            element.attrib[name] = ';'.join(declarations)
+        elif name in NUMERIC_ATTRIBUTES:
+            if name in LIST_ATTRIBUTES:
+                value = _compact_list(value)
+            rounding = round_path_data if name == 'd' else round_numbers
+            element.attrib[name] = rounding(value, precision)
+
+    if local == 'style' and element.text:
+        css = re.sub(r'/\*.*?\*/', '', element.text, flags=re.S)
+        element.text = re.sub(r'\s+', ' ', css).strip()
+
+    if not in_text:
+        if element.text and not element.text.strip():
+            element.text = None
+        for child in element:
+            if child.tail and not child.tail.strip():
+                child.tail = None
+
+
+def optimize_svg(content: str, precision: Optional[int] = None) -> str:
+    """
+    Return a minified version of ``content``: without editor metadata, comments,
+    unused defs or ids and with numeric attributes rounded to ``precision`` decimals.
+
+    Raises ``ET.ParseError`` when ``content`` is not valid XML.
+    """
+    if precision is None:
+        precision = getattr(settings, 'EMPRESA_SVG_PRECISION', 3)
+    root = ET.fromstring(content.lstrip('\ufeff \t\r\n').encode('utf-8'))
+    _clean(root, _collect_references(root), precision)
+    return ET.tostring(root, encoding='unicode')
+
+
+def minified_name(name: str) -> str:
+    """Storage name of the minified sibling of ``name``."""
+    stem, _ = posixpath.splitext(name)
+    return f'{stem}{MINIFIED_SUFFIX}'
+
+
+def ensure_minified_svg(file_field, force: bool = False) -> Tuple[Optional[str], bool]:
+    """
+    Store the optimized copy of an SVG FileField next to the original.
+
+    Returns ``(name, written)``: the minified name, or ``None`` if the field is empty, is
+    itself a minified file or could not be parsed, and whether a file was stored.
+    Up-to-date copies are left untouched unless ``force``.
+    """
+    if not file_field or file_field.name.endswith(MINIFIED_SUFFIX):
+        return None, False
+
+    storage = file_field.storage
+    name = file_field.name
+    target = minified_name(name)
+
+    if not force and storage.exists(target):
+        try:
+            if storage.get_modified_time(target) >= storage.get_modified_time(name):
+                return target, False
+        except (NotImplementedError, OSError):
+            return target, False
+
+    try:
+        with storage.open(name, 'rb') as svg_file:
+            content = svg_file.read().decode('utf-8', errors='ignore')
+        optimized = optimize_svg(content)
+    except (FileNotFoundError, OSError, ET.ParseError):
+        return None, False
+
+    data = optimized.encode('utf-8')
+    if storage.exists(target):
+        with storage.open(target, 'rb') as current:
+            if current.read() == data:
+                return target, False
+    # render_svg prefiere la copia: se reemplaza sin que el nombre llegue a faltar.
+    return storage_replace(storage, target, data), True
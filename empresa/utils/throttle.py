@@ -0,0 +1,70 @@
+"""
+Throttling for public form submissions.
+
+Token buckets and duplicate markers live in the cache returned by
+``content_version.get_shared_cache()`` (``EMPRESA_SHARED_CACHE_ALIAS``, a database
+table by default), so every worker counts against the same limits. Updates are
+read-modify-write: concurrent requests may occasionally both get the last token,
+which is acceptable for spam control.
+"""
+
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+
+from .content_version import get_shared_cache
+
+
+def client_ip(request) -> str:
+    """
+    IP of the client. ``EMPRESA_CLIENT_IP_HEADER`` (e.g. ``'HTTP_X_FORWARDED_FOR'``)
+    should only be set when a trusted proxy overwrites that header.
+    """
+    header = getattr(settings, 'EMPRESA_CLIENT_IP_HEADER', None)
+    if header and request.META.get(header):
+        return request.META[header].split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def consume_token(key: str, capacity: int, period: float) -> bool:
+    """
+    Take one token from the bucket ``key``, which holds up to ``capacity`` tokens
+    and refills completely every ``period`` seconds. Returns ``False`` when empty.
+    """
+    cache = get_shared_cache()
+    cache_key = f'empresa:throttle:{key}'
+    now = time.time()
+    tokens, updated = cache.get(cache_key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens < 1:
+        return False
+    cache.set(cache_key, (tokens - 1, now), int(period) + 1)
+    return True
+
+
+def allow_contact_submission(request, email: str) -> bool:
+    """Consume the per-IP and per-email tokens of a contact form submission."""
+    ip_capacity, ip_period = getattr(settings, 'EMPRESA_CONTACT_RATE_PER_IP', (5, 3600))
+    email_capacity, email_period = getattr(settings, 'EMPRESA_CONTACT_RATE_PER_EMAIL', (3, 3600))
+    if not consume_token(f'contacto:ip:{client_ip(request)}', ip_capacity, ip_period):
+        return False
+    email_key = hashlib.sha256((email or '').strip().lower().encode('utf-8')).hexdigest()
+    return consume_token(f'contacto:email:{email_key}', email_capacity, email_period)
+
+
+def submission_hash(*parts: str) -> str:
+    normalized = '\n'.join(' '.join((part or '').split()).lower() for part in parts)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def mark_submission(digest: str, window: Optional[int] = None) -> bool:
+    """Record ``digest`` for ``window`` seconds. Returns ``False`` if it was already recorded."""
+    if window is None:
+        window = getattr(settings, 'EMPRESA_CONTACT_DUPLICATE_WINDOW', 900)
+    return get_shared_cache().add(f'empresa:submission:{digest}', 1, window)
+
+
+def forget_submission(digest: str) -> None:
+    get_shared_cache().delete(f'empresa:submission:{digest}')
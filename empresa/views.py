@@ -1,33 +1,104 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.conf import settings
-from django.http import JsonResponse
-from .models import (
-    Empresa, Servicio, Proyecto, Cliente, Equipo, 
-    Contacto, ConfiguracionSitio
-)
-from .utils.site_resolver import resolve_site
+from django.db import transaction
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from .models import Servicio, Proyecto, Cliente, Equipo, Contacto
+from .utils.outbox import queue_contact_notification
+from .utils.page_cache import cache_public_page, conditional_public_page
+from .utils.pagination import InvalidCursor, keyset_page, paginate_keyset
+from .utils.site_settings import get_site_snapshot
+from .utils.throttle import allow_contact_submission, forget_submission, mark_submission, submission_hash
+
+# Orden de los listados paginados; terminan en `id` para que el cursor sea único.
+PROYECTOS_ORDERING = ('orden', '-fecha_creacion', 'id')
+CLIENTES_ORDERING = ('orden', 'nombre', 'id')
+
+# Secciones de la página de clientes: filtro y plantilla de cada tarjeta.
+CLIENTES_SECCIONES = {
+    'directos': ({'tipo_cliente': 'directo'}, 'empresa/partials/cliente_directo.html'),
+    'finales': ({'tipo_cliente': 'final'}, 'empresa/partials/cliente_final.html'),
+    'destacados': ({'destacado': True}, 'empresa/partials/cliente_destacado.html'),
+}
+
+
+def _proyectos_page(cursor=None):
+    page = paginate_keyset(
+        Proyecto.objects.published(),
+        PROYECTOS_ORDERING,
+        cursor,
+        per_page=getattr(settings, 'EMPRESA_PROYECTOS_PAGE_SIZE', 12),
+    )
+    if page.has_next:
+        page.next_url = f"{reverse('empresa:proyectos_mas')}?{urlencode({'cursor': page.next_cursor})}"
+    return page
+
+
+def _with_clientes_next_url(page, seccion):
+    if page.has_next:
+        query = urlencode({'seccion': seccion, 'cursor': page.next_cursor})
+        page.next_url = f"{reverse('empresa:clientes_mas')}?{query}"
+    return page
+
+
+def _clientes_page(seccion, cursor=None):
+    filtros, _ = CLIENTES_SECCIONES[seccion]
+    page = paginate_keyset(
+        Cliente.objects.published().filter(**filtros),
+        CLIENTES_ORDERING,
+        cursor,
+        per_page=getattr(settings, 'EMPRESA_CLIENTES_PAGE_SIZE', 24),
+    )
+    return _with_clientes_next_url(page, seccion)
+
+
+def _clientes_primeras_paginas():
+    """
+    Primera página de cada sección de clientes con una sola consulta.
+
+    Las secciones se solapan (un destacado también es directo o final), así que
+    cada fila lleva su posición dentro de su tipo y dentro de los destacados y
+    se traen solo las que caben en alguna primera página; el reparto es en memoria.
+    """
+    per_page = getattr(settings, 'EMPRESA_CLIENTES_PAGE_SIZE', 24)
+    orden = [F(campo).asc() for campo in CLIENTES_ORDERING]
+    clientes = Cliente.objects.published().annotate(
+        posicion_tipo=Window(RowNumber(), partition_by=[F('tipo_cliente')], order_by=orden),
+        posicion_destacado=Window(RowNumber(), partition_by=[F('destacado')], order_by=orden),
+    ).filter(
+        Q(posicion_tipo__lte=per_page + 1) | Q(destacado=True, posicion_destacado__lte=per_page + 1)
+    ).order_by(*CLIENTES_ORDERING)
+
+    secciones = {seccion: [] for seccion in CLIENTES_SECCIONES}
+    for cliente in clientes:
+        if cliente.posicion_tipo <= per_page + 1:
+            secciones['directos' if cliente.tipo_cliente == 'directo' else 'finales'].append(cliente)
+        if cliente.destacado and cliente.posicion_destacado <= per_page + 1:
+            secciones['destacados'].append(cliente)
+
+    return {
+        seccion: _with_clientes_next_url(keyset_page(items, CLIENTES_ORDERING, per_page), seccion)
+        for seccion, items in secciones.items()
+    }
+
 
+@conditional_public_page
+@cache_public_page
 def home(request):
     """Vista principal de la página de inicio"""
-    current_site = resolve_site(request)
-    empresa = Empresa.objects.filter(site=current_site, activo=True).first()
-    servicios = Servicio.objects.filter(activo=True).order_by('orden')[:6]
-    proyectos_destacados = Proyecto.objects.filter(activo=True, destacado=True).order_by('orden', '-fecha_creacion')[:3]
-    clientes_queryset = Cliente.objects.filter(
-        activo=True,
-        destacado=True,
-        logo__isnull=False,
-    ).exclude(logo='').order_by('orden', 'nombre')
-    if not clientes_queryset.exists():
-        clientes_queryset = Cliente.objects.filter(
-            activo=True,
-            logo__isnull=False,
-        ).exclude(logo='').order_by('orden', 'nombre')
-    clientes = list(clientes_queryset)
-    equipo = Equipo.objects.filter(activo=True, socio=True).order_by('orden')[:4]
-    configuracion = ConfiguracionSitio.objects.filter(site=current_site, activo=True).first()
+    snapshot = get_site_snapshot(request)
+    empresa = snapshot.empresa
+    servicios = Servicio.objects.published()[:6]
+    proyectos_destacados = Proyecto.objects.featured()[:3]
+    # Clientes destacados con logo o, si no hay ninguno, todos los que tienen logo.
+    clientes = list(Cliente.objects.published().with_logo().featured_or_all())
+    equipo = Equipo.objects.featured()[:4]
+    configuracion = snapshot.configuracion
     
     context = {
         'empresa': empresa,
@@ -39,12 +110,14 @@ def home(request):
     }
     return render(request, 'empresa/home.html', context)
 
+@conditional_public_page
+@cache_public_page
 def servicios(request):
     """Vista de la página de servicios"""
-    servicios = Servicio.objects.filter(activo=True).order_by('orden')
-    current_site = resolve_site(request)
-    empresa = Empresa.objects.filter(site=current_site, activo=True).first()
-    configuracion = ConfiguracionSitio.objects.filter(site=current_site, activo=True).first()
+    servicios = Servicio.objects.published()
+    snapshot = get_site_snapshot(request)
+    empresa = snapshot.empresa
+    configuracion = snapshot.configuracion
     
     context = {
         'servicios': servicios,
@@ -53,12 +126,14 @@ def servicios(request):
     }
     return render(request, 'empresa/servicios.html', context)
 
+@conditional_public_page
+@cache_public_page
 def proyectos(request):
     """Vista de la página de proyectos"""
-    proyectos = Proyecto.objects.filter(activo=True).order_by('orden', '-fecha_creacion')
-    current_site = resolve_site(request)
-    empresa = Empresa.objects.filter(site=current_site, activo=True).first()
-    configuracion = ConfiguracionSitio.objects.filter(site=current_site, activo=True).first()
+    proyectos = _proyectos_page()
+    snapshot = get_site_snapshot(request)
+    empresa = snapshot.empresa
+    configuracion = snapshot.configuracion
     
     context = {
         'proyectos': proyectos,
@@ -67,14 +142,17 @@ def proyectos(request):
     }
     return render(request, 'empresa/proyectos.html', context)
 
+@conditional_public_page
+@cache_public_page
 def clientes(request):
     """Vista de la página de clientes"""
-    clientes_directos = Cliente.objects.filter(activo=True, tipo_cliente='directo').order_by('orden', 'nombre')
-    clientes_finales = Cliente.objects.filter(activo=True, tipo_cliente='final').order_by('orden', 'nombre')
-    clientes_destacados = Cliente.objects.filter(activo=True, destacado=True).order_by('orden', 'nombre')
-    current_site = resolve_site(request)
-    empresa = Empresa.objects.filter(site=current_site, activo=True).first()
-    configuracion = ConfiguracionSitio.objects.filter(site=current_site, activo=True).first()
+    secciones = _clientes_primeras_paginas()
+    clientes_directos = secciones['directos']
+    clientes_finales = secciones['finales']
+    clientes_destacados = secciones['destacados']
+    snapshot = get_site_snapshot(request)
+    empresa = snapshot.empresa
+    configuracion = snapshot.configuracion
     
     context = {
         'clientes_directos': clientes_directos,
@@ -85,12 +163,47 @@ def clientes(request):
     }
     return render(request, 'empresa/clientes.html', context)
 
+@conditional_public_page
+@cache_public_page
+def proyectos_mas(request):
+    """Fragmento HTML con la siguiente página de proyectos (botón "Cargar más")"""
+    try:
+        proyectos = _proyectos_page(request.GET.get('cursor'))
+    except InvalidCursor:
+        raise Http404('Cursor inválido')
+
+    context = {
+        'proyectos': proyectos,
+    }
+    return render(request, 'empresa/partials/proyectos_pagina.html', context)
+
+@conditional_public_page
+@cache_public_page
+def clientes_mas(request):
+    """Fragmento HTML con la siguiente página de una sección de clientes"""
+    seccion = request.GET.get('seccion')
+    if seccion not in CLIENTES_SECCIONES:
+        raise Http404('Sección desconocida')
+    try:
+        clientes = _clientes_page(seccion, request.GET.get('cursor'))
+    except InvalidCursor:
+        raise Http404('Cursor inválido')
+
+    context = {
+        'clientes': clientes,
+        'tarjeta': CLIENTES_SECCIONES[seccion][1],
+        'target': f'#clientes-{seccion}-grid',
+    }
+    return render(request, 'empresa/partials/clientes_pagina.html', context)
+
+@conditional_public_page
+@cache_public_page
 def equipo(request):
     """Vista de la página del equipo"""
-    equipo = Equipo.objects.filter(activo=True).order_by('orden')
-    current_site = resolve_site(request)
-    empresa = Empresa.objects.filter(site=current_site, activo=True).first()
-    configuracion = ConfiguracionSitio.objects.filter(site=current_site, activo=True).first()
+    equipo = Equipo.objects.published()
+    snapshot = get_site_snapshot(request)
+    empresa = snapshot.empresa
+    configuracion = snapshot.configuracion
     
     context = {
         'equipo': equipo,
@@ -99,11 +212,13 @@ def equipo(request):
     }
     return render(request, 'empresa/equipo.html', context)
 
+# Sin validadores condicionales: el formulario lleva un token CSRF.
+@cache_public_page
 def contacto(request):
     """Vista de la página de contacto"""
-    current_site = resolve_site(request)
-    empresa = Empresa.objects.filter(site=current_site, activo=True).first()
-    configuracion = ConfiguracionSitio.objects.filter(site=current_site, activo=True).first()
+    snapshot = get_site_snapshot(request)
+    empresa = snapshot.empresa
+    configuracion = snapshot.configuracion
     
     if request.method == 'POST':
         nombre = request.POST.get('nombre')
@@ -113,30 +228,40 @@ def contacto(request):
         asunto = request.POST.get('asunto')
         mensaje = request.POST.get('mensaje')
         
-        # Crear el mensaje de contacto
-        contacto_obj = Contacto.objects.create(
-            nombre=nombre,
-            email=email,
-            telefono=telefono,
-            empresa=empresa_cliente,
-            asunto=asunto,
-            mensaje=mensaje
-        )
-        
-        # Enviar email de notificación
-        try:
-            send_mail(
-                f'Nuevo mensaje de contacto: {asunto}',
-                f'Nombre: {nombre}\nEmail: {email}\nTeléfono: {telefono}\nEmpresa: {empresa_cliente}\n\nMensaje:\n{mensaje}',
-                settings.DEFAULT_FROM_EMAIL,
-                [empresa.email_principal if empresa else 'mlujan@tekon-rl.cl'],
-                fail_silently=False,
-            )
+        # Los rechazos se resuelven antes de tocar la base de datos.
+        if not allow_contact_submission(request, email):
+            messages.error(request, 'Has enviado demasiados mensajes. Por favor, inténtalo más tarde.')
+            context = {
+                'empresa': empresa,
+                'configuracion': configuracion,
+            }
+            return render(request, 'empresa/contacto.html', context, status=429)
+
+        digest = submission_hash(email, asunto, mensaje)
+        if not mark_submission(digest):
+            # Reenvío del mismo mensaje (doble clic, recarga): ya está registrado.
             messages.success(request, '¡Mensaje enviado correctamente! Nos pondremos en contacto contigo pronto.')
-        except Exception as e:
-            messages.warning(request, 'El mensaje se guardó correctamente, pero hubo un problema al enviar el email.')
-        
-        return redirect('contacto')
+            return redirect('empresa:contacto')
+
+        # El mensaje y su notificación se guardan juntos; el email lo envía
+        # `manage.py send_notifications`, sin bloquear esta respuesta.
+        try:
+            with transaction.atomic():
+                contacto_obj = Contacto.objects.create(
+                    nombre=nombre,
+                    email=email,
+                    telefono=telefono,
+                    empresa=empresa_cliente,
+                    asunto=asunto,
+                    mensaje=mensaje
+                )
+                queue_contact_notification(contacto_obj, empresa)
+        except Exception:
+            forget_submission(digest)
+            raise
+
+        messages.success(request, '¡Mensaje enviado correctamente! Nos pondremos en contacto contigo pronto.')
+        return redirect('empresa:contacto')
     
     context = {
         'empresa': empresa,
@@ -144,12 +269,14 @@ def contacto(request):
     }
     return render(request, 'empresa/contacto.html', context)
 
+@conditional_public_page
+@cache_public_page
 def sobre_nosotros(request):
     """Vista de la página sobre nosotros"""
-    current_site = resolve_site(request)
-    empresa = Empresa.objects.filter(site=current_site, activo=True).first()
-    equipo = Equipo.objects.filter(activo=True, socio=True).order_by('orden')
-    configuracion = ConfiguracionSitio.objects.filter(site=current_site, activo=True).first()
+    snapshot = get_site_snapshot(request)
+    empresa = snapshot.empresa
+    equipo = Equipo.objects.featured()
+    configuracion = snapshot.configuracion
     
     context = {
         'empresa': empresa,
@@ -2,8 +2,9 @@
 """
 Load client logos into the `Cliente` model.
 
-For every image contained in `source/clientes_webp` (or `source/clientes` as
-fallback) the script will:
+For every image contained in `source/clientes_webp` (generated with
+`python manage.py normalize_clientes_logos`, or `source/clientes` as fallback)
+the script will:
   * Resize the image so that its height is at most 120px (keeping aspect ratio)
   * Convert it to WEBP
   * Store the resulting file inside `media/clientes`
@@ -8,6 +8,7 @@ document.addEventListener('DOMContentLoaded', function() {
     initAnimations();
     initNavbarScroll();
     initCounterAnimation();
+    initLoadMore();
 });
 
 // Scroll to top functionality
@@ -173,6 +174,48 @@ function initNavbarScroll() {
     }
 }
 
+// "Load more" buttons of the paginated listings (proyectos, clientes)
+function initLoadMore() {
+    document.addEventListener('click', function(e) {
+        const button = e.target.closest('[data-load-more-url]');
+        if (!button) {
+            return;
+        }
+
+        const container = button.closest('[data-load-more]');
+        const grid = document.querySelector(button.dataset.loadMoreTarget);
+        if (!grid || button.disabled) {
+            return;
+        }
+
+        button.disabled = true;
+        fetch(button.dataset.loadMoreUrl, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            })
+            .then(html => {
+                const fragment = document.createElement('template');
+                fragment.innerHTML = html;
+                const next = fragment.content.querySelector('[data-load-more]');
+                if (next) {
+                    next.remove();
+                }
+                grid.append(fragment.content);
+                if (next) {
+                    container.replaceWith(next);
+                } else {
+                    container.remove();
+                }
+            })
+            .catch(() => {
+                button.disabled = false;
+            });
+    });
+}
+
 // Utility functions
 function debounce(func, wait) {
     let timeout;
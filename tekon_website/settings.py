@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -100,13 +101,31 @@ WSGI_APPLICATION = 'tekon_website.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# The web, run_jobs and send_notifications processes share this database (job
+# queue, notification outbox, content versions); docker-compose mounts it from ./data.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DJANGO_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
     }
 }
 
+# "default" only holds pages and fragments keyed by the content version stored in
+# the database, so a per-process cache is safe. Contact-form throttling must be
+# shared by every worker: EMPRESA_SHARED_CACHE_ALIAS points at a table in the
+# database ("manage.py createcachetable"); Redis works as well.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'empresa': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'empresa_cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+EMPRESA_SHARED_CACHE_ALIAS = 'empresa'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -146,6 +165,34 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
+# collectstatic writes content-hashed copies plus .gz/.br siblings; hashed names
+# can be cached forever (see tekon_redline.conf). Set EMPRESA_SERVE_STATIC when
+# no web server serves STATIC_ROOT and Django must do it.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'empresa.utils.static_storage.CompressedManifestStaticFilesStorage'},
+}
+EMPRESA_SERVE_STATIC = False
+
+# "manage.py build_fonts" subsets Font Awesome and Inter into static/fonts and
+# static/css/fonts.css. Inter's source files (OFL, github.com/rsms/inter) go here.
+EMPRESA_FONT_SOURCES_DIR = BASE_DIR / 'theme' / 'static_src' / 'fonts'
+
+# "manage.py build_critical_css" stores, per public page, the Tailwind rules used by
+# its first EMPRESA_CRITICAL_CSS_SECTIONS <section> elements on any of the sites;
+# base.html inlines them and loads the full stylesheet asynchronously.
+EMPRESA_CRITICAL_CSS_DIR = BASE_DIR / 'empresa' / 'critical_css'
+EMPRESA_CRITICAL_CSS_SECTIONS = 2
+
+# Set EMPRESA_SERVE_MEDIA when no web server aliases MEDIA_ROOT. Django then
+# validates each path and, with EMPRESA_MEDIA_ACCEL = 'x-accel-redirect' (nginx,
+# internal location at EMPRESA_MEDIA_ACCEL_PREFIX) or 'x-sendfile', lets the web
+# server stream the file; otherwise it streams it itself with byte-range support.
+EMPRESA_SERVE_MEDIA = False
+EMPRESA_MEDIA_ACCEL = None
+EMPRESA_MEDIA_ACCEL_PREFIX = '/protected-media/'
+EMPRESA_MEDIA_MAX_AGE = 7 * 24 * 3600
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -160,6 +207,41 @@ SITE_ID = 1
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'noreply@tekon-rl.cl'
 
+# Full-page cache for the public empresa views (seconds, 0 disables it).
+# Pages are keyed by a per-site content version stored in the database
+# (VersionContenido), so every worker and `run_jobs` see the same version and a
+# per-process cache never serves a page older than the last change.
+EMPRESA_PAGE_CACHE_TIMEOUT = 0
+
+# Navigation and footer fragments of base.html ({% site_fragment %}), keyed by
+# site, content version and active menu item (seconds, 0 disables them). Saving
+# Empresa or ConfiguracionSitio bumps the version stored in the database, which
+# renders them again in every worker; the fragments themselves may stay in a
+# per-process cache.
+EMPRESA_FRAGMENT_CACHE_TIMEOUT = 24 * 3600
+
+# Identifier of the deployed templates and static files (e.g. the git commit),
+# part of the page/fragment cache keys and of the ETags so a deploy never gets
+# 304s or cached HTML pointing at old static names. When unset, a digest of the
+# staticfiles manifest, the critical CSS and the empresa templates is used.
+EMPRESA_BUILD_ID = os.environ.get('EMPRESA_BUILD_ID') or None
+
+# Background jobs (image derivatives, SVG optimization) are stored in the
+# database and processed by `manage.py run_jobs`. Eager mode runs them inline.
+EMPRESA_JOBS_EAGER = False
+
+# Contact form limits: (submissions, seconds) token buckets per client IP and
+# per email, plus the window in which identical messages are ignored. Behind a
+# reverse proxy set EMPRESA_CLIENT_IP_HEADER = 'HTTP_X_FORWARDED_FOR'.
+EMPRESA_CONTACT_RATE_PER_IP = (5, 3600)
+EMPRESA_CONTACT_RATE_PER_EMAIL = (3, 3600)
+EMPRESA_CONTACT_DUPLICATE_WINDOW = 900
+
+# Page sizes of the keyset-paginated listings; further pages are loaded as
+# HTML fragments from /proyectos/mas/ and /clientes/mas/.
+EMPRESA_PROYECTOS_PAGE_SIZE = 12
+EMPRESA_CLIENTES_PAGE_SIZE = 24
+
 # Tailwind CSS configuration
 TAILWIND_APP_NAME = 'theme'
 INTERNAL_IPS = [